@@ -0,0 +1,107 @@
+"""
+Задержка и пропускная способность клиентских путей на локальных заглушках бэкендов.
+
+Измеряются поиск (search_fsa), детальная информация (get_document_details),
+генерация и скачивание документов (DocumentConstructor) и маппинг сертификата
+(process_complex_json). Кэши отключены, чтобы каждый вызов доходил до заглушки.
+
+Запуск из корня проекта:
+    python -m benchmarks.api_latency [--requests 200] [--concurrency 8] [--latency 0.02]
+    python -m benchmarks.api_latency --save baseline.json
+    python -m benchmarks.api_latency --baseline baseline.json --tolerance 0.2   # код 1 при регрессии
+"""
+import argparse
+import json
+import logging
+import sys
+import tempfile
+from typing import List
+
+from benchmarks.harness import BenchmarkResult, compare_with_baseline, format_table, run_benchmark
+from benchmarks.sample_data import make_registry_document
+from benchmarks.stub_server import StubBackend, StubOptions
+from src.api.client import FSAClient
+from src.api.document_constructor import DocumentConstructor
+from src.api.response_cache import ResponseCache
+from src.bootstrap import bootstrap
+from src.utils.certificate_generator import process_complex_json
+from src.utils.document_cache import DocumentCache
+
+
+def run_all(args: argparse.Namespace) -> List[BenchmarkResult]:
+    options = StubOptions(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        search_items=args.search_items, details_items=args.details_items, file_size=args.file_size
+    )
+    results = []
+    with StubBackend(options) as backend, tempfile.TemporaryDirectory() as cache_dir:
+        # Кэш ответов с нулевым TTL ничего не хранит: замеряется путь до бэкенда
+        client = FSAClient(base_url=backend.url, cache=ResponseCache(ttl=0, max_bytes=0))
+        constructor = DocumentConstructor(
+            document_cache=DocumentCache(cache_dir, max_bytes=1 << 30, ttl=3600, memory_max_bytes=0)
+        )
+        constructor.base_url = backend.url
+        document = make_registry_document(extra_items=args.details_items)
+
+        # Уникальные параметры, чтобы одинаковые запросы не объединялись в один
+        results.append(run_benchmark(
+            'search_fsa', lambda i: client.search({'q': f'bench-{i}'}, i % 50, args.search_items),
+            args.requests, args.concurrency, warmup=args.warmup
+        ))
+        results.append(run_benchmark(
+            'get_document_details', lambda i: client.get_document_details(100000 + i, 'certificate'),
+            args.requests, args.concurrency, warmup=args.warmup
+        ))
+        results.append(run_benchmark(
+            'generate_documents', lambda i: constructor.generate_documents({**document, 'ID': i}),
+            args.requests, args.concurrency, warmup=args.warmup
+        ))
+        results.append(run_benchmark(
+            'download_document',
+            # Новая версия на каждый вызов: файл каждый раз скачивается, а не берётся из кэша
+            lambda i: constructor.download_document_file(f'/files/{i}/0.docx', str(i), version=f'bench-{i}'),
+            args.requests, args.concurrency, warmup=args.warmup
+        ))
+        results.append(run_benchmark(
+            'process_complex_json', lambda i: process_complex_json(document),
+            args.requests, concurrency=1, warmup=args.warmup
+        ))
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=200, help='вызовов на каждый бенчмарк')
+    parser.add_argument('--concurrency', type=int, default=8, help='параллельных вызовов')
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--latency', type=float, default=0.02, help='средняя задержка заглушки, с')
+    parser.add_argument('--jitter', type=float, default=0.005, help='разброс задержки, с')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='доля ответов 500')
+    parser.add_argument('--search-items', type=int, default=20, help='элементов в странице поиска')
+    parser.add_argument('--details-items', type=int, default=200, help='размер документа (см. sample_data)')
+    parser.add_argument('--file-size', type=int, default=256 * 1024, help='размер скачиваемого файла, байт')
+    parser.add_argument('--save', help='сохранить результаты в JSON (базовая линия)')
+    parser.add_argument('--baseline', help='сравнить с сохранённой базовой линией')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='допустимое ухудшение (доля)')
+    args = parser.parse_args()
+
+    # Журнал каждого запроса искажает замеры и засоряет вывод
+    bootstrap(level=logging.WARNING)
+    results = run_all(args)
+    print(format_table(results))
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump({result.name: result.summary() for result in results}, file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            regressions = compare_with_baseline(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
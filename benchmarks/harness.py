@@ -0,0 +1,110 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple
+
+
+class BenchmarkResult(NamedTuple):
+    name: str
+    latencies: List[float]
+    errors: int
+    wall_time: float
+    concurrency: int
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies)
+
+    def percentile(self, q: float) -> float:
+        """Перцентиль задержки (nearest-rank), секунды"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+    @property
+    def throughput(self) -> float:
+        """Завершённых вызовов в секунду"""
+        return self.count / self.wall_time if self.wall_time else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'count': self.count,
+            'errors': self.errors,
+            'concurrency': self.concurrency,
+            'p50_ms': self.percentile(50) * 1000,
+            'p90_ms': self.percentile(90) * 1000,
+            'p99_ms': self.percentile(99) * 1000,
+            'max_ms': max(self.latencies, default=0.0) * 1000,
+            'throughput_rps': self.throughput,
+        }
+
+
+def run_benchmark(name: str, call: Callable[[int], Any], requests: int,
+                  concurrency: int = 1, warmup: int = 0) -> BenchmarkResult:
+    """
+    Выполнить call(i) requests раз в concurrency потоках и измерить задержку каждого вызова.
+
+    Ошибкой считается исключение или результат None (так фасады сообщают об ошибке).
+    Первые warmup вызовов выполняются до замера.
+    """
+    for i in range(warmup):
+        try:
+            call(-1 - i)
+        except Exception:
+            pass
+
+    latencies: List[float] = []
+    errors = 0
+
+    def timed(i: int) -> bool:
+        started = time.perf_counter()
+        try:
+            ok = call(i) is not None
+        except Exception:
+            ok = False
+        latencies.append(time.perf_counter() - started)
+        return ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for ok in executor.map(timed, range(requests)):
+            errors += not ok
+    return BenchmarkResult(name, latencies, errors, time.perf_counter() - started, concurrency)
+
+
+def format_table(results: List[BenchmarkResult]) -> str:
+    header = f"{'benchmark':<34}{'n':>6}{'err':>6}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}{'req/s':>10}"
+    lines = [header, '-' * len(header)]
+    for result in results:
+        row = result.summary()
+        lines.append(
+            f"{row['name']:<34}{row['count']:>6}{row['errors']:>6}{row['p50_ms']:>10.1f}"
+            f"{row['p90_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}{row['throughput_rps']:>10.1f}"
+        )
+    return '\n'.join(lines)
+
+
+def compare_with_baseline(results: List[BenchmarkResult], baseline: Dict[str, Dict[str, Any]],
+                          tolerance: float) -> List[str]:
+    """
+    Регрессии относительно сохранённых результатов: p50/p99 выросли больше чем на tolerance,
+    либо пропускная способность упала больше чем на tolerance.
+    """
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.name)
+        if previous is None:
+            continue
+        current = result.summary()
+        for metric in ('p50_ms', 'p99_ms'):
+            if previous[metric] and current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{result.name}: {metric} {previous[metric]:.1f} -> {current[metric]:.1f}"
+                )
+        if previous['throughput_rps'] and current['throughput_rps'] < previous['throughput_rps'] * (1 - tolerance):
+            regressions.append(
+                f"{result.name}: throughput {previous['throughput_rps']:.1f} -> {current['throughput_rps']:.1f}"
+            )
+    return regressions
@@ -0,0 +1,120 @@
+"""
+Время холодного импорта модулей и проверка побочных эффектов импорта.
+
+Каждый замер выполняется в отдельном интерпретаторе, поэтому кэш sys.modules
+не влияет на результат. Кроме времени проверяется, что импорт не подменяет
+sys.stdout, не настраивает логирование, не читает config.json и не загружает
+тяжёлые зависимости, которые модулю при импорте не нужны (это ошибки бенчмарка).
+Те же проверки без замера времени выполняет tests/test_import_time.py.
+
+Запуск из корня проекта:
+    python -m benchmarks.import_time [--repeat 5]
+    python -m benchmarks.import_time --save import_baseline.json
+    python -m benchmarks.import_time --baseline import_baseline.json --tolerance 0.2   # код 1 при регрессии
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.harness import BenchmarkResult, compare_with_baseline, format_table
+
+HEAVY_MODULES = ('pandas', 'numpy', 'requests', 'httpx', 'streamlit', 'pyarrow')
+
+# Модуль -> тяжёлые зависимости, которые он не должен загружать при импорте
+MODULES: Dict[str, Tuple[str, ...]] = {
+    # Маппинг сертификата для пакетных обработчиков
+    'src.utils.certificate_generator': ('pandas', 'numpy', 'requests', 'streamlit'),
+    'src.utils.results_table': ('pandas', 'numpy'),
+    'src.api.client': ('pandas', 'streamlit'),
+    'src.api.export': ('pandas', 'streamlit'),
+    'src.api.document_constructor': ('pandas',),
+    # Генерация для fsa_cli.py и рабочих потоков без Streamlit
+    'src.api.generation': ('pandas', 'streamlit'),
+    'src.ui.ui_components': (),
+    'src.ui.document_constructor_ui': ('pandas',),
+    'src.api.api': (),
+}
+
+_PROBE = """
+import importlib, json, logging, sys, time
+stdout, handlers = sys.stdout, list(logging.getLogger().handlers)
+started = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - started
+from config.config import Config
+side_effects = []
+if sys.stdout is not stdout:
+    side_effects.append('sys.stdout replaced')
+if logging.getLogger().handlers != handlers:
+    side_effects.append('root logging configured')
+print(json.dumps({
+    'seconds': elapsed,
+    'side_effects': side_effects,
+    'config_loaded': Config._instance is not None,
+    'heavy': [name for name in sys.argv[2:] if name in sys.modules],
+}))
+"""
+
+
+def probe_import(module: str) -> Dict[str, Any]:
+    """Импортировать модуль в новом интерпретаторе и вернуть результат замера"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    completed = subprocess.run(
+        [sys.executable, '-c', _PROBE, module, *HEAVY_MODULES],
+        cwd=root, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_all(repeat: int) -> Tuple[List[BenchmarkResult], List[str]]:
+    results, violations = [], []
+    for module, forbidden in MODULES.items():
+        probes = [probe_import(module) for _ in range(repeat)]
+        latencies = [probe['seconds'] for probe in probes]
+        last = probes[-1]
+        problems = list(last['side_effects'])
+        if last['config_loaded']:
+            problems.append('reads config.json')
+        problems.extend(f'loads {name}' for name in last['heavy'] if name in forbidden)
+        violations.extend(f"{module}: {problem}" for problem in problems)
+        results.append(BenchmarkResult(module, latencies, len(problems), sum(latencies), 1))
+        print(
+            f"{module}: heavy={','.join(last['heavy']) or '-'} "
+            f"config_loaded={last['config_loaded']}", file=sys.stderr
+        )
+    return results, violations
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='замеров на каждый модуль')
+    parser.add_argument('--save', help='сохранить результаты в JSON (базовая линия)')
+    parser.add_argument('--baseline', help='сравнить с сохранённой базовой линией')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='допустимое ухудшение (доля)')
+    args = parser.parse_args()
+
+    results, violations = run_all(args.repeat)
+    # Колонка err — число нарушений (побочные эффекты и лишние тяжёлые зависимости)
+    print(format_table(results))
+    for violation in violations:
+        print(f"SIDE EFFECT {violation}", file=sys.stderr)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump({result.name: result.summary() for result in results}, file, indent=2)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as file:
+            regressions = compare_with_baseline(results, json.load(file), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if violations or regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
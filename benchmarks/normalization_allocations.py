@@ -0,0 +1,59 @@
+"""
+Сравнение аллокаций при подготовке документа: полные копии дерева
+(utf8_encode_dict, stringify_values) против ленивого представления.
+
+Запуск из корня проекта:
+    python -m benchmarks.normalization_allocations [--items 200] [--docs 20]
+"""
+import argparse
+import gc
+import tracemalloc
+from typing import Any, Callable, Dict
+
+from benchmarks.sample_data import make_registry_document
+from src.utils.certificate_generator import (
+    CERTIFICATE_MAPPING, StringifiedView, stringify_values, utf8_encode_dict
+)
+
+
+def _old_pipeline(document: Dict[str, Any]) -> Any:
+    payload = {"data": utf8_encode_dict(document)}
+    fields = CERTIFICATE_MAPPING.evaluate(stringify_values(document))
+    return payload, fields
+
+
+def _new_pipeline(document: Dict[str, Any]) -> Any:
+    payload = {"data": document}
+    fields = CERTIFICATE_MAPPING.evaluate(StringifiedView(document))
+    return payload, fields
+
+
+def measure_peak(pipeline: Callable[[Dict[str, Any]], Any], document: Dict[str, Any], repeat: int) -> float:
+    """Пиковый объём памяти (KiB), выделяемой при подготовке одного документа"""
+    gc.collect()
+    tracemalloc.start()
+    peak = 0
+    for _ in range(repeat):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = pipeline(document)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+        del result
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=200, help='размер синтетического документа')
+    parser.add_argument('--docs', type=int, default=20, help='число повторов')
+    args = parser.parse_args()
+
+    document = make_registry_document(extra_items=args.items)
+    for name, pipeline in (('before (copies)', _old_pipeline), ('after (lazy view)', _new_pipeline)):
+        peak = measure_peak(pipeline, document, args.docs)
+        print(f"{name:<20} peak per document: {peak:10.1f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+from typing import Any, Dict
+
+
+def make_registry_document(doc_id: int = 1, extra_items: int = 200) -> Dict[str, Any]:
+    """
+    Синтетический документ реестра в формате ответа document_endpoints.
+
+    extra_items управляет размером документа: столько записей добавляется
+    в списки, которые маппинг сертификата не читает (как в реальных документах).
+    """
+    contacts = [
+        {'idContactType': 1, 'value': '+7 495 000-00-00'},
+        {'idContactType': 4, 'value': 'info@example.ru'},
+    ]
+    return {
+        'ID': doc_id,
+        'docType': 'certificate',
+        'RegistryData': {
+            'number': f'ЕАЭС RU С-RU.АБ12.В.{doc_id:05d}/24',
+            'blankNumber': 1000000 + doc_id,
+            'certRegDate': '2024-01-15',
+            'certEndDate': '2029-01-14',
+            'surname': 'Иванов',
+            'firstName': 'Иван',
+            'patronymic': 'Иванович',
+            'idTechnicalReglaments': ['ТР ТС 017/2011'],
+            'certificationAuthority': {
+                'fullName': 'ООО «Орган по сертификации»',
+                'attestatRegNumber': 'RA.RU.10АБ12',
+                'attestatRegDate': '2019-05-20',
+                'addresses': [{'fullAddress': 'г. Москва, ул. Примерная, д. 1'}],
+                'contacts': contacts,
+            },
+            'applicant': {
+                'fullName': 'ООО «Заявитель»',
+                'ogrn': 1027700000000 + doc_id,
+                'addresses': [{'fullAddress': 'г. Москва, ул. Заявителя, д. 2'}],
+                'contacts': contacts,
+            },
+            'manufacturer': {
+                'fullName': 'Manufacturer Co., Ltd.',
+                'addresses': [{'fullAddress': 'China, Guangzhou'}],
+            },
+            'product': {
+                'fullName': 'Одежда верхняя трикотажная для взрослых',
+                'storageCondition': None,
+                'identifications': [
+                    {'idTnveds': ['6101200000', '6102300000'], 'name': f'Модель {i}', 'extra': None}
+                    for i in range(extra_items)
+                ],
+            },
+            'documents': {
+                'applicantOtherDocuments': [
+                    {'number': f'{doc_id}-{i}', 'name': 'Протокол испытаний', 'date': '2024-01-10'}
+                    for i in range(3)
+                ],
+                'other': [{'number': i, 'name': 'Документ', 'flag': True} for i in range(extra_items)],
+            },
+            'experts': [{'surname': 'Петров', 'firstName': 'Пётр', 'patronimyc': 'Петрович'}],
+        },
+    }
@@ -0,0 +1,175 @@
+"""
+Локальные заглушки бэкендов для бенчмарков: API поиска FSA и конструктор документов.
+
+Задержка, размер ответов и доля ошибок настраиваются, поэтому можно измерять
+накладные расходы клиента отдельно от реального бэкенда.
+"""
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from benchmarks.sample_data import make_registry_document
+from config.config import load_config
+
+config = load_config()
+
+
+class StubOptions(NamedTuple):
+    # Средняя задержка ответа и её разброс (секунды)
+    latency: float = 0.02
+    jitter: float = 0.005
+    # Доля ответов с error_status (0..1)
+    error_rate: float = 0.0
+    error_status: int = 500
+    # Размер ответов
+    search_items: int = 20
+    details_items: int = 200
+    generated_files: int = 3
+    file_size: int = 256 * 1024
+
+
+def _search_item(doc_id: int) -> Dict[str, Any]:
+    return {
+        'ID': doc_id,
+        'Type': 'C' if doc_id % 2 else 'D',
+        'Number': f'ЕАЭС RU С-RU.АБ12.В.{doc_id:05d}/24',
+        'Status': 'Действует',
+        'RegistrationDate': '2024-01-15T00:00:00Z',
+        'ValidityPeriod': '2029-01-14T00:00:00Z',
+        'Applicant': 'ООО «Заявитель»',
+        'Manufacturer': {'Name': 'Manufacturer Co., Ltd.'},
+        'Product': {'Name': 'Одежда верхняя трикотажная', 'Tnveds': ['6101200000', '6102300000']},
+        'Brand': 'Brand',
+        'Materials': ['хлопок', 'полиэстер'],
+    }
+
+
+class StubBackend:
+    """
+    HTTP-сервер заглушек в фоновом потоке.
+
+    Маршруты повторяют config.json: search_endpoint, document_endpoints,
+    а также /generate_documents и /files/... конструктора документов.
+
+    Пример:
+        with StubBackend(StubOptions(latency=0.05, error_rate=0.01)) as backend:
+            client = FSAClient(base_url=backend.url)
+    """
+
+    def __init__(self, options: StubOptions = StubOptions()):
+        self.options = options
+        self.requests = 0
+        self._counter_lock = threading.Lock()
+        self._file_content = bytes(random.getrandbits(8) for _ in range(min(options.file_size, 4096)))
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> 'StubBackend':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='stub-backend', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _delay_and_fail(self) -> Optional[int]:
+        with self._counter_lock:
+            self.requests += 1
+        options = self.options
+        time.sleep(max(0.0, random.gauss(options.latency, options.jitter)))
+        if options.error_rate and random.random() < options.error_rate:
+            return options.error_status
+        return None
+
+    def _search(self, query: str) -> Dict[str, Any]:
+        page = int(re.search(r'(?:^|&)page=(\d+)', query).group(1)) if 'page=' in query else 0
+        start = page * self.options.search_items
+        return {
+            'items': [_search_item(start + i + 1) for i in range(self.options.search_items)],
+            'total': self.options.search_items * 50,
+            'totalPages': 50,
+        }
+
+    def _generated(self, doc_id: Any) -> List[Dict[str, Any]]:
+        formats = ('docx', 'pptx', 'pdf')
+        return [
+            {'type': 'certificate', 'format': formats[i % 3], 'name': f'doc_{doc_id}_{i}',
+             'url': f'/files/{doc_id}/{i}.{formats[i % 3]}'}
+            for i in range(self.options.generated_files)
+        ]
+
+    def _make_handler(self):
+        backend = self
+        search_path = config['search_endpoint']
+        document_paths = {path: doc_type for doc_type, path in config['document_endpoints'].items()}
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _send_json(self, payload: Any) -> None:
+                body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_error(self, status: int) -> None:
+                self.send_response(status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def _send_file(self) -> None:
+                size = backend.options.file_size
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/octet-stream')
+                self.send_header('Content-Length', str(size))
+                self.end_headers()
+                chunk = backend._file_content
+                remaining = size
+                while remaining > 0:
+                    part = chunk[:remaining]
+                    self.wfile.write(part)
+                    remaining -= len(part)
+
+            def do_GET(self) -> None:
+                status = backend._delay_and_fail()
+                if status:
+                    return self._send_error(status)
+                path, _, query = self.path.partition('?')
+                if path == search_path:
+                    return self._send_json(backend._search(query))
+                prefix, _, doc_id = path.rpartition('/')
+                if prefix in document_paths:
+                    document = make_registry_document(int(doc_id), backend.options.details_items)
+                    document['docType'] = document_paths[prefix]
+                    return self._send_json(document)
+                if path.startswith('/files/'):
+                    return self._send_file()
+                self._send_error(404)
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get('Content-Length', 0))
+                body = json.loads(self.rfile.read(length) or b'{}')
+                status = backend._delay_and_fail()
+                if status:
+                    return self._send_error(status)
+                if self.path == '/generate_documents':
+                    return self._send_json(backend._generated((body.get('data') or {}).get('ID', 'unknown')))
+                self._send_error(404)
+
+        return Handler
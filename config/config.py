@@ -1,53 +1,344 @@
 import json
+import logging
 import os
-from typing import Dict, Any
+import threading
+import time
+from collections.abc import Mapping
+from typing import Dict, Any, Callable, Iterator, NamedTuple, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Переменные окружения FSA_<КЛЮЧ> переопределяют значения config.json (FSA_TIMEOUT=60, FSA_ADMIN_API_KEY=...)
+ENV_PREFIX = 'FSA_'
+
+REQUIRED_FIELDS = ['api_base_url', 'auth_url', 'search_endpoint', 'document_endpoints', 'sync_endpoints']
+
+# Типы настроек: значения config.json проверяются при загрузке, значения из окружения приводятся к типу.
+# null допустим для любой настройки и означает «не задано»
+FIELD_TYPES: Dict[str, type] = {
+    'document_endpoints': dict,
+    'sync_endpoints': dict,
+    'token_refresh_margin': float,
+    'page_size': int,
+    'max_retries': int,
+    'timeout': float,
+    'connect_timeout': float,
+    'generation_timeout': float,
+    'generation_concurrency': int,
+    'generation_jobs_retention': float,
+    'generation_job_poll_interval': float,
+    'generation_job_heartbeat_interval': float,
+    'generation_job_stale_after': float,
+    'document_cache_max_bytes': int,
+    'document_cache_ttl': float,
+    'document_cache_memory_bytes': int,
+    'lazy_downloads': bool,
+    'request_history_size': int,
+    'request_history_max_age': float,
+    'retry_backoff_factor': float,
+    'retry_backoff_max': float,
+    'circuit_breaker_failure_threshold': int,
+    'circuit_breaker_reset_timeout': float,
+    'pool_connections': int,
+    'pool_maxsize': int,
+    'pool_block': bool,
+    'details_concurrency': int,
+    'async_max_connections': int,
+    'cache_ttl': float,
+    'cache_max_bytes': int,
+    'prefetch_enabled': bool,
+    'prefetch_previous': bool,
+    'prefetch_workers': int,
+    'local_index_enabled': bool,
+    'local_index_max_age': float,
+    'export_page_size': int,
+    'export_concurrency': int,
+    'metrics_port': int,
+    'metrics_host': str,
+    'profiling_enabled': bool,
+    'profiling_cprofile': bool,
+    'profiling_top_functions': int,
+    'payload_log_max_chars': int,
+    'payload_log_sample_rate': float,
+    'config_reload_interval': float,
+}
+
+# Эндпоинты API относительно api_base_url: имя -> ключ config.json с путём
+API_ENDPOINTS = {
+    'search': 'search_endpoint',
+    'search_one': 'search_one_endpoint',
+    'create_document_file': 'create_document_file_endpoint',
+    'full_reindex': 'full_reindex_endpoint',
+    'restart_index_queue': 'restart_index_queue_endpoint',
+    'clear_queues': 'clear_queues_endpoint',
+    'load': 'load_endpoint',
+    'load_period': 'load_period_endpoint',
+    'update_dictionaries': 'update_dictionaries_endpoint',
+    'update_expired': 'update_expired_endpoint',
+}
+
+# Эндпоинты по типу документа: имя в реестре — '<префикс>:<тип>', например 'details:certificate'
+DOC_TYPE_ENDPOINTS = {
+    'details': 'document_endpoints',
+    'sync': 'sync_endpoints',
+}
+
+# Необязательные ключи без значения по умолчанию: их отсутствие отключает часть функций
+OPTIONAL_KEYS = [key for key in API_ENDPOINTS.values() if key != 'search_endpoint'] + ['admin_api_key']
+
+_TRUE_STRINGS = {'1', 'true', 'yes', 'on'}
+_FALSE_STRINGS = {'0', 'false', 'no', 'off'}
+
+
+class EndpointNotConfiguredError(LookupError):
+    """Эндпоинт не задан в config.json"""
+
+    def __init__(self, name: str, key: str):
+        super().__init__(f"Эндпоинт {name} не задан в config.json ({key})")
+        self.name = name
+        self.key = key
+
+
+class EndpointRegistry:
+    """
+    Полные URL эндпоинтов API, вычисленные один раз при загрузке конфигурации.
+
+    Клиенты с собственным адресом API (например, --api-base-url в CLI)
+    получают URL из того же пути с другим префиксом.
+    """
+
+    def __init__(self, base_url: str, paths: Dict[str, Optional[str]], keys: Dict[str, str]):
+        self.base_url = base_url
+        self._paths = paths
+        self._keys = keys
+        self._urls = {name: base_url + path for name, path in paths.items() if path}
+
+    @classmethod
+    def from_config(cls, values: Dict[str, Any]) -> 'EndpointRegistry':
+        paths: Dict[str, Optional[str]] = {}
+        keys: Dict[str, str] = {}
+        for name, key in API_ENDPOINTS.items():
+            paths[name] = values.get(key)
+            keys[name] = key
+        for prefix, key in DOC_TYPE_ENDPOINTS.items():
+            for doc_type, path in (values.get(key) or {}).items():
+                paths[f'{prefix}:{doc_type}'] = path
+                keys[f'{prefix}:{doc_type}'] = f'{key}.{doc_type}'
+        return cls(values['api_base_url'], paths, keys)
+
+    def is_configured(self, name: str) -> bool:
+        return bool(self._paths.get(name))
+
+    def path(self, name: str) -> str:
+        path = self._paths.get(name)
+        if not path:
+            raise EndpointNotConfiguredError(name, self._keys.get(name, name))
+        return path
+
+    def url(self, name: str, base_url: Optional[str] = None) -> str:
+        """
+        Полный URL эндпоинта.
+
+        Raises:
+            EndpointNotConfiguredError: путь эндпоинта не задан в config.json
+        """
+        if base_url is None or base_url == self.base_url:
+            url = self._urls.get(name)
+            if url is None:
+                raise EndpointNotConfiguredError(name, self._keys.get(name, name))
+            return url
+        return base_url + self.path(name)
+
+
+class _ConfigState(NamedTuple):
+    values: Dict[str, Any]
+    endpoints: EndpointRegistry
+    mtime: Optional[float]
+
+
+ReloadListener = Callable[[Set[str]], None]
+
+
+def _coerce_env_value(key: str, raw: str) -> Any:
+    """Значение переменной окружения в тип настройки (строка для настроек без описанного типа)"""
+    expected = FIELD_TYPES.get(key)
+    if raw.strip().lower() in ('', 'null', 'none'):
+        return None
+    if expected is bool:
+        lowered = raw.strip().lower()
+        if lowered in _TRUE_STRINGS:
+            return True
+        if lowered in _FALSE_STRINGS:
+            return False
+        raise ValueError(f"{ENV_PREFIX}{key.upper()}: ожидается логическое значение, получено {raw!r}")
+    try:
+        if expected is int:
+            return int(raw)
+        if expected is float:
+            return float(raw)
+        if expected in (dict, list):
+            return json.loads(raw)
+    except ValueError:
+        raise ValueError(f"{ENV_PREFIX}{key.upper()}: ожидается {expected.__name__}, получено {raw!r}")
+    return raw
+
+
+def _check_type(key: str, value: Any) -> None:
+    expected = FIELD_TYPES.get(key)
+    if expected is None or value is None:
+        return
+    if expected is float:
+        valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+    elif expected is int:
+        valid = isinstance(value, int) and not isinstance(value, bool)
+    else:
+        valid = isinstance(value, expected)
+    if not valid:
+        raise ValueError(f"{key} в config.json: ожидается {expected.__name__}, получено {value!r}")
 
 
 class Config:
     _instance = None
-    _config: Dict[str, Any] = {}
+    _state: Optional[_ConfigState] = None
 
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(Config, cls).__new__(cls)
-            cls._instance._load_config()
+            instance = super(Config, cls).__new__(cls)
+            instance._reload_lock = threading.Lock()
+            instance._listeners = []
+            instance._watcher = None
+            instance._load_config()
+            # Экземпляр сохраняется только после успешной загрузки
+            cls._instance = instance
         return cls._instance
 
-    def _load_config(self) -> None:
+    @staticmethod
+    def _config_path() -> str:
         # Получаем абсолютный путь к директории, где находится текущий файл (config.py)
         current_dir = os.path.dirname(os.path.abspath(__file__))
         # Перемещаемся на уровень выше, чтобы достичь корневой директории проекта
         project_root = os.path.dirname(current_dir)
         # Формируем путь к файлу config.json
-        config_path = os.path.join(project_root, 'config.json')
+        return os.path.join(project_root, 'config.json')
 
+    def _read_state(self) -> _ConfigState:
+        """Прочитать, дополнить переменными окружения и проверить config.json"""
+        config_path = self._config_path()
         try:
+            mtime = os.stat(config_path).st_mtime
             with open(config_path) as config_file:
-                self._config = json.load(config_file)
-
-            # Проверяем наличие необходимых полей
-            required_fields = ['api_base_url', 'auth_url', 'search_endpoint', 'document_endpoints', 'sync_endpoints']
-            for field in required_fields:
-                if field not in self._config:
-                    raise ValueError(f"{field} отсутствует в файле config.json")
-
-            # Проверяем наличие подполей в document_endpoints и sync_endpoints
-            for endpoint_type in ['document_endpoints', 'sync_endpoints']:
-                if 'declaration' not in self._config[endpoint_type] or 'certificate' not in self._config[endpoint_type]:
-                    raise ValueError(f"В {endpoint_type} отсутствуют поля 'declaration' или 'certificate'")
-
+                values = json.load(config_file)
         except FileNotFoundError:
             raise FileNotFoundError(f"Файл конфигурации не найден по пути: {config_path}")
         except json.JSONDecodeError:
             raise ValueError(f"Ошибка при разборе JSON в файле: {config_path}")
 
+        for key in set(values) | set(FIELD_TYPES) | set(OPTIONAL_KEYS):
+            raw = os.environ.get(ENV_PREFIX + key.upper())
+            if raw is not None:
+                values[key] = _coerce_env_value(key, raw)
+
+        # Проверяем наличие необходимых полей
+        for field in REQUIRED_FIELDS:
+            if field not in values:
+                raise ValueError(f"{field} отсутствует в файле config.json")
+
+        # Проверяем наличие подполей в document_endpoints и sync_endpoints
+        for endpoint_type in DOC_TYPE_ENDPOINTS.values():
+            _check_type(endpoint_type, values[endpoint_type])
+            if 'declaration' not in values[endpoint_type] or 'certificate' not in values[endpoint_type]:
+                raise ValueError(f"В {endpoint_type} отсутствуют поля 'declaration' или 'certificate'")
+
+        for key, value in values.items():
+            _check_type(key, value)
+
+        missing = [key for key in OPTIONAL_KEYS if not values.get(key)]
+        if missing:
+            logger.warning("Не заданы в config.json: %s — соответствующие функции недоступны", ", ".join(missing))
+
+        return _ConfigState(values, EndpointRegistry.from_config(values), mtime)
+
+    def _load_config(self) -> None:
+        self._state = self._read_state()
+
+    @property
+    def _config(self) -> Dict[str, Any]:
+        return self._state.values
+
+    @property
+    def endpoints(self) -> EndpointRegistry:
+        """Реестр URL эндпоинтов текущей конфигурации"""
+        return self._state.endpoints
+
     def get(self, key: str, default: Any = None) -> Any:
         """Получить значение по ключу"""
-        return self._config.get(key, default)
+        return self._state.values.get(key, default)
 
     def __getitem__(self, key: str) -> Any:
         """Поддержка доступа через квадратные скобки"""
-        return self._config[key]
+        return self._state.values[key]
+
+    def add_reload_listener(self, listener: ReloadListener) -> None:
+        """Подписаться на перезагрузку: listener получает множество изменившихся ключей"""
+        self._listeners.append(listener)
+
+    def reload(self) -> bool:
+        """
+        Перечитать config.json.
+
+        Новая конфигурация заменяет прежнюю целиком одним присваиванием, поэтому читатели
+        видят либо старые, либо новые значения вместе с их реестром эндпоинтов.
+        При ошибке в файле остаётся прежняя конфигурация.
+
+        Returns:
+            bool: True, если конфигурация перечитана
+        """
+        with self._reload_lock:
+            previous = self._state
+            try:
+                state = self._read_state()
+            except (FileNotFoundError, ValueError) as e:
+                # Запоминаем время изменения, чтобы не повторять ошибку при каждой проверке файла
+                self._state = previous._replace(mtime=self._current_mtime())
+                logger.error("Config reload failed, keeping previous configuration: %s", e)
+                return False
+            self._state = state
+
+        changed = {
+            key for key in set(previous.values) | set(state.values)
+            if previous.values.get(key) != state.values.get(key)
+        }
+        if changed:
+            logger.info("Configuration reloaded, changed keys: %s", ", ".join(sorted(changed)))
+            for listener in list(self._listeners):
+                try:
+                    listener(changed)
+                except Exception:
+                    logger.exception("Config reload listener failed")
+        return True
+
+    def _current_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self._config_path()).st_mtime
+        except OSError:
+            return None
+
+    def watch(self, interval: float) -> None:
+        """Проверять время изменения config.json каждые interval секунд и перезагружать его (один поток на процесс)"""
+        with self._reload_lock:
+            if self._watcher is not None:
+                return
+
+            def poll() -> None:
+                while True:
+                    time.sleep(interval)
+                    mtime = self._current_mtime()
+                    if mtime is not None and mtime != self._state.mtime:
+                        self.reload()
+
+            self._watcher = threading.Thread(target=poll, name='config-watcher', daemon=True)
+            self._watcher.start()
+        logger.info("Watching %s for changes every %s s", self._config_path(), interval)
 
     @classmethod
     def get_instance(cls):
@@ -57,10 +348,40 @@ class Config:
         return cls._instance
 
 
+class _LazyConfig(Mapping):
+    """
+    Конфигурация только для чтения, config.json читается при первом обращении.
+
+    Модули вызывают load_config() при импорте; благодаря отложенному чтению
+    импорт не выполняет файловых операций. Каждое обращение читает текущую
+    конфигурацию, поэтому значения обновляются после перезагрузки config.json.
+    """
+
+    def __getitem__(self, key: str) -> Any:
+        return Config.get_instance()._config[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(Config.get_instance()._config)
+
+    def __len__(self) -> int:
+        return len(Config.get_instance()._config)
+
+    def __repr__(self) -> str:
+        return repr(Config.get_instance()._config)
+
+
+_lazy_config = _LazyConfig()
+
+
 # Для обратной совместимости
-def load_config() -> Dict[str, Any]:
+def load_config() -> Mapping:
     """
     Функция для обратной совместимости.
-    Возвращает словарь с конфигурацией.
+    Возвращает словарь с конфигурацией (только для чтения, загружается при первом обращении).
     """
-    return Config.get_instance()._config
+    return _lazy_config
+
+
+def get_endpoints() -> EndpointRegistry:
+    """Реестр URL эндпоинтов текущей конфигурации"""
+    return Config.get_instance().endpoints
@@ -0,0 +1,310 @@
+"""
+Пакетный запуск поиска, получения детальной информации и генерации документов без Streamlit.
+
+Примеры:
+    python fsa_cli.py search -p rn=РОСС -p type=C --output results.ndjson
+    python fsa_cli.py details --ids-file ids.txt --output details.ndjson --checkpoint details.ckpt
+    python fsa_cli.py generate --ids-file ids.txt --output generated.ndjson --checkpoint gen.ckpt --shard 0/4
+    python fsa_cli.py generate --ids-file ids.txt --search-results results.ndjson --output generated.ndjson
+
+Файл с ID: по одному документу в строке, «ID» или «ID<TAB|,>тип» (declaration/certificate).
+Результаты search (--search-results) дополняют данные генерации полями search_*, как в приложении.
+Учётные данные берутся из --username и переменных окружения FSA_USERNAME/FSA_PASSWORD
+(или готовый токен из FSA_TOKEN).
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, TextIO, Tuple
+
+from config.config import load_config
+from src.api.client import FSAClient
+from src.api.exceptions import FSAApiError
+from src.auth.jwt_authenticator import JWTAuthenticator
+from src.bootstrap import bootstrap
+
+logger = logging.getLogger('fsa_cli')
+
+DOC_TYPES = ('declaration', 'certificate')
+
+
+class Checkpoint:
+    """
+    Файл обработанных ID: по одному в строке, дописывается после каждого успешного документа.
+
+    При повторном запуске с тем же файлом уже обработанные ID пропускаются.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self.done: Set[str] = set()
+        self._file: Optional[TextIO] = None
+        if path:
+            if os.path.exists(path):
+                with open(path, encoding='utf-8') as file:
+                    self.done = {line.strip() for line in file if line.strip()}
+            self._file = open(path, 'a', encoding='utf-8')
+
+    def mark(self, doc_id: str) -> None:
+        self.done.add(doc_id)
+        if self._file:
+            self._file.write(f"{doc_id}\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+
+
+class NdjsonWriter:
+    """Запись результатов по одному JSON-объекту в строке (в stdout или файл)"""
+
+    def __init__(self, path: Optional[str], append: bool):
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8') if path and path != '-' else sys.stdout
+        self._lock = threading.Lock()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + '\n')
+            self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not sys.stdout:
+            self._file.close()
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """'2/8' -> (2, 8): обрабатывается каждый восьмой ID, начиная с третьего"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError("ожидается формат i/n, например 0/4")
+    if not 0 <= index < count:
+        raise argparse.ArgumentTypeError("номер части должен быть от 0 до n-1")
+    return index, count
+
+
+def read_ids(path: str, default_type: str) -> List[Tuple[str, str]]:
+    """Пары (ID, тип документа) из файла; пустые строки и строки с # пропускаются"""
+    pairs = []
+    with open(path, encoding='utf-8') as file:
+        for line_number, line in enumerate(file, start=1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = [part.strip() for part in line.replace('\t', ',').split(',')]
+            doc_type = parts[1] if len(parts) > 1 and parts[1] else default_type
+            if doc_type not in DOC_TYPES:
+                raise ValueError(f"{path}:{line_number}: неизвестный тип документа {doc_type!r}")
+            pairs.append((parts[0], doc_type))
+    return pairs
+
+
+def read_search_results(path: str) -> Dict[str, Dict[str, Any]]:
+    """Результаты команды search (NDJSON) по ID документа"""
+    items = {}
+    with open(path, encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                item = json.loads(line)
+                items[str(item.get('ID'))] = item
+    return items
+
+
+def shard(pairs: List[Tuple[str, str]], part: Optional[Tuple[int, int]]) -> List[Tuple[str, str]]:
+    if part is None:
+        return pairs
+    index, count = part
+    return pairs[index::count]
+
+
+def parse_params(values: List[str], params_json: Optional[str]) -> Dict[str, Any]:
+    params = json.loads(params_json) if params_json else {}
+    for value in values:
+        key, sep, param = value.partition('=')
+        if not sep:
+            raise ValueError(f"параметр поиска должен иметь вид ключ=значение: {value!r}")
+        params[key] = param
+    return params
+
+
+def make_authenticator(config: Dict[str, Any], args: argparse.Namespace) -> JWTAuthenticator:
+    authenticator = JWTAuthenticator(
+        config['auth_url'],
+        refresh_url=config.get('auth_refresh_url'),
+        refresh_margin=float(config.get('token_refresh_margin', 300))
+    )
+    token = os.environ.get('FSA_TOKEN')
+    username = args.username or os.environ.get('FSA_USERNAME')
+    password = os.environ.get('FSA_PASSWORD')
+    if username and password:
+        if not authenticator.login({'username': username, 'password': password}):
+            raise SystemExit("Не удалось войти: проверьте FSA_USERNAME/FSA_PASSWORD")
+    elif token:
+        authenticator.tokens.set_tokens(token)
+    else:
+        logger.warning("Учётные данные не заданы, запросы выполняются без токена")
+    return authenticator
+
+
+def run_batch(pairs: List[Tuple[str, str]], task: Callable[[str, str], Dict[str, Any]],
+              writer: NdjsonWriter, checkpoint: Checkpoint, concurrency: int) -> int:
+    """
+    Выполнить task(ID, тип) для каждого необработанного документа.
+
+    Returns:
+        int: число документов, завершившихся ошибкой
+    """
+    pending = [(doc_id, doc_type) for doc_id, doc_type in pairs if doc_id not in checkpoint.done]
+    skipped = len(pairs) - len(pending)
+    if skipped:
+        logger.info("Пропущено %d уже обработанных документов", skipped)
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        futures = {executor.submit(task, doc_id, doc_type): doc_id for doc_id, doc_type in pending}
+        for completed, future in enumerate(as_completed(futures), start=1):
+            doc_id = futures[future]
+            try:
+                writer.write(future.result())
+                checkpoint.mark(doc_id)
+            except Exception as e:
+                # Ошибочные ID не попадают в контрольную точку и повторятся при следующем запуске
+                failed += 1
+                logger.error("Документ %s: %s", doc_id, e)
+                writer.write({'ID': doc_id, 'error': str(e)})
+            if completed % 100 == 0 or completed == len(pending):
+                logger.info("Обработано %d из %d", completed, len(pending))
+    return failed
+
+
+def command_search(args: argparse.Namespace, client: FSAClient, authenticator: JWTAuthenticator,
+                   writer: NdjsonWriter) -> int:
+    params = parse_params(args.param, args.params_json)
+
+    def fetch(page: int) -> Any:
+        return authenticator.call_with_token(
+            lambda token: client.search(params, page, args.page_size, token=token, use_cache=False)
+        )
+
+    first = fetch(0)
+    total_pages = first.get('totalPages', 1) if isinstance(first, dict) else 1
+    if args.max_pages:
+        total_pages = min(total_pages, args.max_pages)
+
+    def items(result: Any) -> Iterable[Dict[str, Any]]:
+        if isinstance(result, dict):
+            return result.get('items') or []
+        return result if isinstance(result, list) else []
+
+    rows = 0
+    for item in items(first):
+        writer.write(item)
+        rows += 1
+    # Страницы загружаются параллельно, а пишутся по порядку
+    with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as executor:
+        for result in executor.map(fetch, range(1, total_pages)):
+            for item in items(result):
+                writer.write(item)
+                rows += 1
+    logger.info("Записано %d результатов (%d страниц)", rows, total_pages)
+    return 0
+
+
+def command_details(args: argparse.Namespace, client: FSAClient, authenticator: JWTAuthenticator,
+                    writer: NdjsonWriter, checkpoint: Checkpoint) -> int:
+    def task(doc_id: str, doc_type: str) -> Dict[str, Any]:
+        return authenticator.call_with_token(
+            lambda token: client.get_document_details(doc_id, doc_type, token=token)
+        )
+
+    pairs = shard(read_ids(args.ids_file, args.type), args.shard)
+    return run_batch(pairs, task, writer, checkpoint, args.concurrency)
+
+
+def command_generate(args: argparse.Namespace, client: FSAClient, authenticator: JWTAuthenticator,
+                     writer: NdjsonWriter, checkpoint: Checkpoint) -> int:
+    from src.api.generation import request_generation
+    from src.utils.certificate_generator import merge_search_data
+
+    search_results = read_search_results(args.search_results) if args.search_results else {}
+
+    def task(doc_id: str, doc_type: str) -> Dict[str, Any]:
+        details = authenticator.call_with_token(
+            lambda token: client.get_document_details(doc_id, doc_type, token=token)
+        )
+        data = merge_search_data(details, search_results.get(doc_id))
+        result = request_generation(data, base_url=args.certificate_api_url)
+        return {'ID': doc_id, 'documents': result['documents'], 'generated_at': result['generated_at']}
+
+    pairs = shard(read_ids(args.ids_file, args.type), args.shard)
+    return run_batch(pairs, task, writer, checkpoint, args.concurrency)
+
+
+def build_parser(config: Dict[str, Any]) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Пакетная работа с API FSA без интерфейса Streamlit")
+    parser.add_argument('--username', help="имя пользователя (пароль — в FSA_PASSWORD)")
+    parser.add_argument('--api-base-url', help="адрес API FSA (по умолчанию api_base_url из config.json)")
+    parser.add_argument('--output', '-o', default='-', help="файл NDJSON (по умолчанию stdout)")
+    parser.add_argument('--concurrency', '-c', type=int, default=int(config.get('details_concurrency', 8)),
+                        help="число одновременных запросов")
+    parser.add_argument('--verbose', '-v', action='store_true')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    search = subparsers.add_parser('search', help="поиск с выгрузкой всех страниц")
+    search.add_argument('--param', '-p', action='append', default=[], metavar='КЛЮЧ=ЗНАЧЕНИЕ',
+                        help="параметр поиска (как в форме поиска), можно повторять")
+    search.add_argument('--params-json', help="параметры поиска одним JSON-объектом")
+    search.add_argument('--page-size', type=int, default=int(config.get('export_page_size', 100)))
+    search.add_argument('--max-pages', type=int, help="ограничить число страниц")
+
+    for name, help_text in (('details', "детальная информация по списку ID"),
+                            ('generate', "генерация документов по списку ID")):
+        command = subparsers.add_parser(name, help=help_text)
+        command.add_argument('--ids-file', required=True, help="файл с ID документов")
+        command.add_argument('--type', choices=DOC_TYPES, default='certificate',
+                             help="тип документа для строк без явного типа")
+        command.add_argument('--checkpoint', help="файл контрольной точки для продолжения после сбоя")
+        command.add_argument('--shard', type=parse_shard, metavar='i/n',
+                             help="обработать только i-ю из n частей списка (для нескольких машин)")
+        if name == 'generate':
+            command.add_argument('--certificate-api-url',
+                                 help="адрес API конструктора (по умолчанию LOCAL_CERTIFICATE_API_URL)")
+            command.add_argument('--search-results',
+                                 help="NDJSON команды search: поля результата поиска добавляются к данным генерации")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    config = load_config()
+    args = build_parser(config).parse_args(argv)
+    bootstrap(level=logging.DEBUG if args.verbose else logging.INFO, stream=sys.stderr)
+
+    client = FSAClient(base_url=args.api_base_url)
+    authenticator = make_authenticator(config, args)
+    checkpoint = Checkpoint(getattr(args, 'checkpoint', None))
+    # При продолжении по контрольной точке результаты дописываются к прежнему файлу
+    writer = NdjsonWriter(args.output, append=bool(checkpoint.done))
+    try:
+        if args.command == 'search':
+            failed = command_search(args, client, authenticator, writer)
+        elif args.command == 'details':
+            failed = command_details(args, client, authenticator, writer, checkpoint)
+        else:
+            failed = command_generate(args, client, authenticator, writer, checkpoint)
+    except FSAApiError as e:
+        logger.error("%s", e)
+        return 1
+    finally:
+        writer.close()
+        checkpoint.close()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,14 +1,24 @@
+import os
+from typing import Optional
 import streamlit as st
-from src.api.api import search_fsa, get_document_details, search_one_fsa
+from src.api.api import (
+    search_fsa, get_documents_details, search_one_fsa, prefetch_search_pages, export_search,
+    local_index_available, search_local
+)
+from src.api.export import EXPORT_FORMATS, EXPORT_MIME_TYPES
 from src.api.document_file_creator import create_document_file
 from src.auth import authenticator
-from src.ui.ui_components import display_search_form, display_results_table
+from src.ui.ui_components import display_search_form, display_results_table, display_pagination
 from config.config import load_config
 from src.ui.document_constructor_ui import DocumentConstructorUI
+from src.utils.metrics import start_metrics_server
+from src.utils.profiling import RerunProfiler
+from src.bootstrap import bootstrap
 
 st.set_page_config(layout="wide")
 
-# Загружаем конфигурацию
+# Конфигурация и логирование процесса (при перезапусках скрипта ничего не делает)
+bootstrap()
 config = load_config()
 
 def initialize_session_state():
@@ -34,6 +44,36 @@ def handle_search_one_document(search_params):
     else:
         st.warning("Не найдено подходящих документов.")
 
+def handle_export(search_params, total_results):
+    """Выгрузка всех страниц результатов поиска в файл"""
+    with st.expander("Выгрузка всех результатов"):
+        fmt = st.selectbox("Формат файла", EXPORT_FORMATS, format_func=str.upper, key="export_format")
+
+        if st.button(f"Выгрузить {total_results} записей", key="export_button"):
+            progress_bar = st.progress(0.0, text="Выгрузка...")
+
+            def update_progress(pages_done, total_pages, rows_written):
+                progress_bar.progress(
+                    min(pages_done / max(total_pages, 1), 1.0),
+                    text=f"Страниц: {pages_done} из {total_pages}, записей: {rows_written}"
+                )
+
+            exported = export_search(search_params, fmt, progress=update_progress)
+            if exported:
+                st.session_state.export_file = {'path': exported[0], 'format': fmt, 'rows': exported[1]}
+
+        export_file = st.session_state.get('export_file')
+        if export_file and os.path.exists(export_file['path']):
+            st.write(f"Записей в файле: {export_file['rows']}")
+            with open(export_file['path'], 'rb') as file:
+                st.download_button(
+                    label=f"Скачать {export_file['format'].upper()}",
+                    data=file,
+                    file_name=os.path.basename(export_file['path']),
+                    mime=EXPORT_MIME_TYPES[export_file['format']],
+                    key="export_download"
+                )
+
 def process_search_results(results):
     """Обработка результатов поиска"""
     if isinstance(results, dict):
@@ -55,20 +95,31 @@ def display_document_details(selected_items, items):
     selected_details = {}
     selected_search_data = {}
 
-    for index in selected_items:
-        item = items[index]
-        doc_type = "declaration" if item["Type"] == "D" else "certificate"
-        details = get_document_details(item["ID"], doc_type)
+    selected = [items[index] for index in selected_items]
+    results = get_documents_details([
+        (item["ID"], "declaration" if item["Type"] == "D" else "certificate")
+        for item in selected
+    ])
+
+    if any(result.status_code == 401 for result in results):
+        st.error("Ошибка аутентификации. Пожалуйста, войдите в систему снова.")
+        st.session_state["authentication_status"] = False
+        st.rerun()
+
+    for item, result in zip(selected, results):
+        if result.details is None:
+            st.error(f"Документ {item['ID']}: {result.error}")
+            continue
 
-        if details:
-            selected_details[item["ID"]] = details
-            selected_search_data[item["ID"]] = item
+        details = result.details
+        selected_details[item["ID"]] = details
+        selected_search_data[item["ID"]] = item
 
-            st.write(f"Документ {item['ID']}:")
-            with st.expander("Данные из поиска"):
-                st.json(item)
-            with st.expander("Детальные данные"):
-                st.json(details)
+        st.write(f"Документ {item['ID']}:")
+        with st.expander("Данные из поиска"):
+            st.json(item)
+        with st.expander("Детальные данные"):
+            st.json(details)
 
     return selected_details, selected_search_data
 
@@ -85,13 +136,17 @@ def handle_document_creation(selected_details, selected_search_data):
         else:
             st.error(f"Не удалось создать файл документа {doc_id}.")
 
-def show_search_interface():
+def show_search_interface(profiler: Optional[RerunProfiler] = None):
     """Основная функция интерфейса поиска"""
+    if profiler is None:
+        # Выключенный профилировщик: свой на каждый вызов, а не общий для всех сессий
+        profiler = RerunProfiler()
     col1, col2 = st.columns([3, 1])
     with col2:
         authenticator.logout()
 
-    search_params = display_search_form()
+    with profiler.phase("Форма поиска"):
+        search_params = display_search_form()
     initialize_session_state()
 
     if st.button("Поиск"):
@@ -102,9 +157,15 @@ def show_search_interface():
     with col1:
         if st.button("Поиск одного наиболее релевантного документа"):
             handle_search_one_document(st.session_state.search_params)
+    with col2:
+        # Офлайн-режим: только документы, уже сохранённые в локальном индексе
+        offline = local_index_available() and st.checkbox("Искать только в локальном индексе")
 
     if st.session_state.search_params:
-        results = search_fsa(st.session_state.search_params, st.session_state.current_page)
+        page_size = config.get('page_size', 20)
+        search = search_local if offline else search_fsa
+        with profiler.phase("Поиск"):
+            results = search(st.session_state.search_params, st.session_state.current_page, page_size)
 
         if results is not None:
             total_results, items = process_search_results(results)
@@ -114,27 +175,53 @@ def show_search_interface():
             else:
                 st.subheader("Результаты поиска:")
                 st.write(f"Найдено результатов: {total_results}")
-
-                edited_df = display_results_table(items)
-                selected_items = edited_df[edited_df["Выбрать"]].index.tolist()
+                with profiler.phase("Экспорт"):
+                    handle_export(st.session_state.search_params, total_results)
+
+                with profiler.phase("Таблица результатов"):
+                    edited_df = display_results_table(items)
+                    selected_items = edited_df[edited_df["Выбрать"]].index.tolist()
+
+                new_page = display_pagination(st.session_state.current_page, st.session_state.total_pages)
+                if new_page != st.session_state.current_page:
+                    st.session_state.current_page = new_page
+                    st.rerun()
+
+                # Пока пользователь смотрит страницу, соседние загружаются в кэш
+                if not offline:
+                    with profiler.phase("Предзагрузка страниц"):
+                        prefetch_search_pages(
+                            st.session_state.search_params, st.session_state.current_page,
+                            st.session_state.total_pages, page_size
+                        )
 
                 if selected_items:
                     st.subheader("Подробная информация о выбранных документах:")
-                    selected_details, selected_search_data = display_document_details(selected_items, items)
+                    with profiler.phase("Детали документов"):
+                        selected_details, selected_search_data = display_document_details(selected_items, items)
 
                     # Инициализация UI конструктора документов
                     doc_constructor_ui = DocumentConstructorUI()
                     
-                    # Для каждого выбранного документа показываем форму генерации
+                    merged_documents = []
                     for doc_id, details in selected_details.items():
                         search_data = selected_search_data.get(doc_id, {})
                         merged_data = details.copy()
                         merged_data.update({f'search_{k}': v for k, v in search_data.items()})
-                        
-                        doc_constructor_ui.display_document_generation_form(merged_data)
-                    
-                    # Отображение сгенерированных документов
-                    doc_constructor_ui.display_generated_documents()
+                        merged_documents.append(merged_data)
+
+                    with profiler.phase("Формы генерации"):
+                        # Пакетная генерация для всех выбранных документов
+                        doc_constructor_ui.display_batch_generation_form(merged_documents)
+
+                        # Для каждого выбранного документа показываем форму генерации
+                        for merged_data in merged_documents:
+                            doc_constructor_ui.display_document_generation_form(merged_data)
+
+                    with profiler.phase("Скачивание документов"):
+                        # Отображение сгенерированных документов
+                        doc_constructor_ui.display_generated_documents()
+                        doc_constructor_ui.display_request_stats()
 
         else:
             st.error("Произошла ошибка при выполнении поиска. Пожалуйста, попробуйте еще раз.")
@@ -142,10 +229,19 @@ def show_search_interface():
 def main():
     st.title("Поиск в базе FSA")
 
+    # Эндпоинт /metrics для Prometheus (один на процесс, повторный вызов ничего не делает)
+    if config.get('metrics_port'):
+        start_metrics_server(int(config['metrics_port']), config.get('metrics_host') or '127.0.0.1')
+
     if not authenticator.is_authenticated():
         authenticator.login()
     else:
-        show_search_interface()
+        # Разбивка времени перезапуска: profiling_enabled в config.json или ?profile=1 / ?profile=cprofile
+        profiler = RerunProfiler.from_request()
+        try:
+            show_search_interface(profiler)
+        finally:
+            profiler.finish()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,109 @@
+import hmac
+
+import pandas as pd
+import streamlit as st
+
+from config.config import load_config
+from src.auth import authenticator
+from src.bootstrap import bootstrap
+from src.utils.metrics import (
+    HTTP_IN_FLIGHT, HTTP_LATENCY, HTTP_REQUESTS, cache_hit_ratios, get_metrics_registry, start_metrics_server
+)
+
+st.set_page_config(layout="wide")
+
+bootstrap()
+config = load_config()
+
+
+def build_endpoint_table() -> pd.DataFrame:
+    """Сводка по эндпоинтам: запросы, ошибки, задержка (оценка по корзинам гистограммы)"""
+    totals, errors = {}, {}
+    for (endpoint, _, status), value in HTTP_REQUESTS.values().items():
+        totals[endpoint] = totals.get(endpoint, 0) + value
+        if not status.isdigit() or int(status) >= 500:
+            errors[endpoint] = errors.get(endpoint, 0) + value
+
+    in_flight = {key[0]: value for key, value in HTTP_IN_FLIGHT.values().items()}
+    latency = HTTP_LATENCY.snapshot()
+
+    rows = []
+    for endpoint in sorted(totals):
+        _, count, total_time = latency.get((endpoint,), ([], 0, 0.0))
+        rows.append({
+            "Эндпоинт": endpoint,
+            "Запросов": int(totals[endpoint]),
+            "Ошибок": int(errors.get(endpoint, 0)),
+            "Доля ошибок, %": 100 * errors.get(endpoint, 0) / totals[endpoint],
+            "Среднее, с": total_time / count if count else None,
+            "p50 ≤, с": HTTP_LATENCY.quantile(0.5, endpoint=endpoint),
+            "p95 ≤, с": HTTP_LATENCY.quantile(0.95, endpoint=endpoint),
+            "В работе": int(in_flight.get(endpoint, 0)),
+        })
+    return pd.DataFrame(rows)
+
+
+def has_admin_access() -> bool:
+    """
+    Страница доступна только администратору: тот же admin_api_key,
+    что FSAClient передаёт административным эндпоинтам.
+    """
+    api_key = config.get('admin_api_key')
+    if not api_key:
+        st.error("Страница метрик доступна администратору: задайте admin_api_key в config.json")
+        return False
+    if st.session_state.get('metrics_admin_access'):
+        return True
+
+    entered = st.text_input("Ключ администратора", type="password")
+    if not entered:
+        return False
+    if not hmac.compare_digest(entered.encode('utf-8'), str(api_key).encode('utf-8')):
+        st.error("Неверный ключ администратора")
+        return False
+    st.session_state['metrics_admin_access'] = True
+    return True
+
+
+def main():
+    st.title("Метрики")
+
+    if not authenticator.is_authenticated():
+        authenticator.login()
+        return
+    if not has_admin_access():
+        return
+
+    metrics_port = config.get('metrics_port')
+    if metrics_port:
+        metrics_host = config.get('metrics_host') or '127.0.0.1'
+        start_metrics_server(int(metrics_port), metrics_host)
+        st.caption(f"Prometheus: http://{metrics_host}:{metrics_port}/metrics")
+
+    if st.button("Обновить"):
+        st.rerun()
+
+    st.subheader("Исходящие запросы")
+    table = build_endpoint_table()
+    if table.empty:
+        st.info("Запросов ещё не было.")
+    else:
+        st.dataframe(
+            table, hide_index=True,
+            column_config={"Доля ошибок, %": st.column_config.NumberColumn(format="%.1f")}
+        )
+
+    st.subheader("Кэши")
+    ratios = cache_hit_ratios()
+    if ratios:
+        columns = st.columns(len(ratios))
+        for column, (cache, ratio) in zip(columns, sorted(ratios.items())):
+            column.metric(f"Попадания: {cache}", f"{ratio:.0%}")
+    else:
+        st.info("Обращений к кэшам ещё не было.")
+
+    with st.expander("Текст в формате Prometheus"):
+        st.code(get_metrics_registry().render_prometheus(), language="text")
+
+
+main()
@@ -1,168 +1,182 @@
-import requests
+import os
+from typing import Any, List, Optional, Tuple
+
 import streamlit as st
 from config.config import load_config
+from src.api.client import DocumentDetailsResult, get_fsa_client
+from src.api.exceptions import AuthenticationError, FSAApiError
+from src.api.export import export_search_results, make_export_path
+from src.api.local_index import get_local_index
+from src.api.prefetch import SearchPrefetcher
 from src.auth import authenticator
 
 config = load_config()
 
+# Функции модуля — тонкий синхронный фасад над FSAClient для интерфейса Streamlit:
+# они подставляют токен текущей сессии и переводят исключения клиента в сообщения UI.
+# Для фоновых задач используйте FSAClient или AsyncFSAClient напрямую.
+
+
+def _handle_auth_error():
+    st.error("Ошибка аутентификации. Пожалуйста, войдите в систему снова.")
+    st.session_state["authentication_status"] = False
+    st.rerun()
+
+
 def search_fsa(params, page=0, page_size=20):
-    url = f"{config['api_base_url']}{config['search_endpoint']}"
-    params['page'] = page
-    params['pageSize'] = page_size
-
-    # Добавляем поддержку поиска по филиалам
-    if 'branchCountry' in params and params['branchCountry']:
-        params['branchCountry'] = params['branchCountry']
-
-    headers = {}
-    token = authenticator.get_token()
-    if token:
-        headers['Authorization'] = f'Bearer {token}'
-
-    response = requests.get(url, params=params, headers=headers)
-    if response.status_code == 200:
-        result = response.json()
-        return result
-    elif response.status_code == 401:
-        st.error("Ошибка аутентификации. Пожалуйста, войдите в систему снова.")
-        st.session_state["authentication_status"] = False
-        st.rerun()
-    else:
-        st.error(f"Ошибка при запросе: {response.status_code}")
+    try:
+        return authenticator.call_with_token(
+            lambda token: get_fsa_client().search(params, page, page_size, token=token)
+        )
+    except AuthenticationError:
+        _handle_auth_error()
+    except FSAApiError as e:
+        st.error(str(e))
+        return None
+
+
+def local_index_available() -> bool:
+    return get_local_index() is not None
+
+
+def search_local(params, page=0, page_size=20):
+    """Поиск только по локальному индексу (без обращения к API), см. LocalIndex.search_offline"""
+    local_index = get_local_index()
+    if local_index is None:
+        return None
+    return local_index.search_offline(params, page, page_size)
+
+
+def prefetch_search_pages(params, page, total_pages, page_size=20):
+    """Фоновая загрузка соседних страниц в кэш (включается prefetch_enabled в config.json)"""
+    if not config.get('prefetch_enabled', False):
+        return
+    if "search_prefetcher" not in st.session_state:
+        st.session_state["search_prefetcher"] = SearchPrefetcher()
+    st.session_state["search_prefetcher"].schedule(
+        params, page, total_pages, page_size,
+        token=authenticator.get_token(),
+        include_previous=config.get('prefetch_previous', False)
+    )
+
+
+def export_search(params, fmt, progress=None):
+    """
+    Выгружает все результаты поиска в файл.
+
+    Returns:
+        (путь к файлу, число строк) или None при ошибке
+    """
+    path = make_export_path(fmt)
+    try:
+        rows = export_search_results(params, path, fmt, token=authenticator.get_token(), progress=progress)
+        return path, rows
+    except FSAApiError as e:
+        # Недописанный файл не отдаём пользователю
+        if os.path.exists(path):
+            os.remove(path)
+        if isinstance(e, AuthenticationError):
+            _handle_auth_error()
+        st.error(f"Ошибка при выгрузке результатов: {e}")
         return None
 
 
 def search_one_fsa(params):
-    url = f"{config['api_base_url']}{config['search_one_endpoint']}"
-
-    headers = {}
-    token = authenticator.get_token()
-    if token:
-        headers['Authorization'] = f'Bearer {token}'
-
-    response = requests.get(url, params=params, headers=headers)
-    if response.status_code == 200:
-        return response.json()
-    elif response.status_code == 401:
-        st.error("Ошибка аутентификации. Пожалуйста, войдите в систему снова.")
-        st.session_state["authentication_status"] = False
-        st.rerun()
-    else:
-        st.error(f"Ошибка при запросе: {response.status_code}")
+    try:
+        return authenticator.call_with_token(lambda token: get_fsa_client().search_one(params, token=token))
+    except AuthenticationError:
+        _handle_auth_error()
+    except FSAApiError as e:
+        st.error(str(e))
         return None
 
+
 def get_document_details(doc_id, doc_type):
-    url = f"{config['api_base_url']}{config['document_endpoints'][doc_type]}/{doc_id}"
-
-    headers = {}
-    token = authenticator.get_token()
-    if token:
-        headers['Authorization'] = f'Bearer {token}'
-
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        # Получаем JSON из ответа
-        response_data = response.json()
-        # Добавляем поле docType
-        response_data['docType'] = doc_type
-        return response_data
-    elif response.status_code == 401:
-        st.error("Ошибка аутентификации. Пожалуйста, войдите в систему снова.")
-        st.session_state["authentication_status"] = False
-        st.rerun()
-    else:
-        st.error(f"Ошибка при запросе детальной информации: {response.status_code}")
+    try:
+        return authenticator.call_with_token(
+            lambda token: get_fsa_client().get_document_details(doc_id, doc_type, token=token)
+        )
+    except AuthenticationError:
+        _handle_auth_error()
+    except FSAApiError as e:
+        st.error(str(e))
         return None
 
+
+def get_documents_details(ids_with_types: List[Tuple[Any, str]],
+                          max_workers: Optional[int] = None) -> List[DocumentDetailsResult]:
+    """
+    Параллельно запрашивает детальную информацию по нескольким документам.
+
+    Ошибки не выводятся в интерфейс, а возвращаются в поле error каждого результата,
+    см. FSAClient.get_documents_details.
+    """
+    # Токен читается в основном потоке: рабочие потоки не имеют доступа к session_state
+    client = get_fsa_client()
+    results = client.get_documents_details(
+        ids_with_types, token=authenticator.get_token(), max_workers=max_workers
+    )
+
+    # Отклонённые с 401 запросы повторяются один раз после обновления токена
+    rejected = [index for index, result in enumerate(results) if result.status_code == 401]
+    if rejected:
+        try:
+            token = authenticator.refresh_token()
+        except AuthenticationError:
+            return results
+        retried = client.get_documents_details(
+            [ids_with_types[index] for index in rejected], token=token, max_workers=max_workers
+        )
+        for index, result in zip(rejected, retried):
+            results[index] = result
+    return results
+
+
 def sync_document(doc_id, doc_type):
-    url = f"{config['api_base_url']}{config['sync_endpoints'][doc_type]}/{doc_id}"
-
-    headers = {}
-    token = authenticator.get_token()
-    if token:
-        headers['Authorization'] = f'Bearer {token}'
-
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return response.json()
-    elif response.status_code == 401:
-        st.error("Ошибка аутентификации. Пожалуйста, войдите в систему снова.")
-        st.session_state["authentication_status"] = False
-        st.rerun()
-    else:
-        st.error(f"Ошибка при синхронизации документа: {response.status_code}")
+    try:
+        return authenticator.call_with_token(
+            lambda token: get_fsa_client().sync_document(doc_id, doc_type, token=token)
+        )
+    except AuthenticationError:
+        _handle_auth_error()
+    except FSAApiError as e:
+        st.error(str(e))
         return None
 
 # Новые административные функции
 
-def full_reindex():
-    url = f"{config['api_base_url']}{config['full_reindex_endpoint']}"
-    headers = {'X-API-Key': config['admin_api_key']}
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return True
-    else:
-        st.error(f"Ошибка при выполнении полного переиндексирования: {response.status_code}")
+
+def _run_admin(operation) -> bool:
+    try:
+        return operation()
+    except FSAApiError as e:
+        st.error(str(e))
         return False
 
+
+def full_reindex():
+    return _run_admin(get_fsa_client().full_reindex)
+
+
 def restart_index_queue():
-    url = f"{config['api_base_url']}{config['restart_index_queue_endpoint']}"
-    headers = {'X-API-Key': config['admin_api_key']}
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return True
-    else:
-        st.error(f"Ошибка при перезапуске очереди индексирования: {response.status_code}")
-        return False
+    return _run_admin(get_fsa_client().restart_index_queue)
+
 
 def clear_queues():
-    url = f"{config['api_base_url']}{config['clear_queues_endpoint']}"
-    headers = {'X-API-Key': config['admin_api_key']}
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return True
-    else:
-        st.error(f"Ошибка при очистке очередей: {response.status_code}")
-        return False
+    return _run_admin(get_fsa_client().clear_queues)
+
 
 def load_documents(doc_type, date):
-    url = f"{config['api_base_url']}{config['load_endpoint']}"
-    params = {'t': doc_type, 'dt': date}
-    headers = {'X-API-Key': config['admin_api_key']}
-    response = requests.get(url, params=params, headers=headers)
-    if response.status_code == 200:
-        return True
-    else:
-        st.error(f"Ошибка при загрузке документов: {response.status_code}")
-        return False
+    return _run_admin(lambda: get_fsa_client().load_documents(doc_type, date))
+
 
 def load_documents_period(doc_type, start_date, end_date):
-    url = f"{config['api_base_url']}{config['load_period_endpoint']}"
-    params = {'t': doc_type, 'from': start_date, 'to': end_date}
-    headers = {'X-API-Key': config['admin_api_key']}
-    response = requests.get(url, params=params, headers=headers)
-    if response.status_code == 200:
-        return True
-    else:
-        st.error(f"Ошибка при загрузке документов за период: {response.status_code}")
-        return False
+    return _run_admin(lambda: get_fsa_client().load_documents_period(doc_type, start_date, end_date))
+
 
 def update_dictionaries():
-    url = f"{config['api_base_url']}{config['update_dictionaries_endpoint']}"
-    headers = {'X-API-Key': config['admin_api_key']}
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return True
-    else:
-        st.error(f"Ошибка при обновлении словарей: {response.status_code}")
-        return False
+    return _run_admin(get_fsa_client().update_dictionaries)
+
 
 def update_expired_documents():
-    url = f"{config['api_base_url']}{config['update_expired_endpoint']}"
-    headers = {'X-API-Key': config['admin_api_key']}
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return True
-    else:
-        st.error(f"Ошибка при обновлении истекших документов: {response.status_code}")
-        return False
\ No newline at end of file
+    return _run_admin(get_fsa_client().update_expired_documents)
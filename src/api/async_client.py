@@ -0,0 +1,180 @@
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from config.config import load_config
+from src.api.circuit_breaker import CircuitOpenError, get_circuit_breaker
+from src.api.client import ApiRequest, BaseFSAClient, DocumentDetailsResult, search_result_ids
+from src.api.exceptions import ApiConnectionError, FSAApiError, raise_for_status
+from src.api.http_client import RETRY_STATUSES, backoff_delay
+from src.api.response_cache import ResponseCache
+from src.api.single_flight import AsyncSingleFlight
+from src.utils.metrics import HTTP_IN_FLIGHT, HTTP_LATENCY, HTTP_REQUESTS
+
+config = load_config()
+
+
+class AsyncFSAClient(BaseFSAClient):
+    """
+    Асинхронный клиент API FSA для фоновых и пакетных задач (без зависимости от Streamlit).
+
+    Одинаковые одновременные запросы внутри одного клиента объединяются в один.
+
+    Пример:
+        async with AsyncFSAClient() as client:
+            results = await client.get_documents_details(pairs, token=token)
+    """
+
+    def __init__(self, base_url: Optional[str] = None, cache: Optional[ResponseCache] = None,
+                 max_connections: Optional[int] = None):
+        super().__init__(base_url, cache)
+        self._flight = AsyncSingleFlight()
+        max_connections = max_connections or int(config.get('async_max_connections', 100))
+        self.max_retries = int(config.get('max_retries', 3))
+        self._client = httpx.AsyncClient(
+            timeout=httpx.Timeout(float(config.get('timeout', 30)), connect=float(config.get('connect_timeout', 5))),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=int(config.get('pool_maxsize', 20))
+            )
+        )
+
+    async def __aenter__(self) -> 'AsyncFSAClient':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+    async def _send(self, request: ApiRequest) -> bytes:
+        breaker = get_circuit_breaker(request.endpoint)
+        # Повторы с экспоненциальной задержкой — только для идемпотентных запросов
+        attempts = self.max_retries + 1 if request.method in ('GET', 'HEAD') else 1
+
+        for attempt in range(1, attempts + 1):
+            try:
+                breaker.before_request()
+            except CircuitOpenError as e:
+                HTTP_REQUESTS.inc(endpoint=request.endpoint, method=request.method, status='circuit_open')
+                raise ApiConnectionError(str(e)) from e
+
+            HTTP_IN_FLIGHT.inc(endpoint=request.endpoint)
+            started = time.perf_counter()
+            try:
+                response = await self._client.request(
+                    request.method, request.url, params=request.params, headers=request.headers
+                )
+            except Exception as e:
+                # Любая ошибка записывается, иначе пробный запрос полуоткрытого автомата
+                # остался бы без результата
+                breaker.record_failure()
+                HTTP_REQUESTS.inc(endpoint=request.endpoint, method=request.method, status='error')
+                if not isinstance(e, httpx.TransportError):
+                    if isinstance(e, httpx.HTTPError):
+                        raise FSAApiError(f"{request.error_message}: {e}") from e
+                    raise
+                if attempt == attempts:
+                    raise ApiConnectionError(f"{request.error_message}: {e}") from e
+            else:
+                HTTP_REQUESTS.inc(endpoint=request.endpoint, method=request.method, status=str(response.status_code))
+                if response.status_code >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
+                if response.status_code not in RETRY_STATUSES or attempt == attempts:
+                    raise_for_status(response.status_code, request.error_message)
+                    return response.content
+            finally:
+                HTTP_LATENCY.observe(time.perf_counter() - started, endpoint=request.endpoint)
+                HTTP_IN_FLIGHT.dec(endpoint=request.endpoint)
+
+            await asyncio.sleep(backoff_delay(attempt))
+
+    async def _fetch_json(self, request: ApiRequest,
+                          tags: Callable[[Any], List[Any]] = lambda result: [],
+                          use_cache: bool = True) -> Any:
+        if use_cache:
+            cached = self._cached_json(request)
+            if cached is not None:
+                return cached
+
+        async def fetch() -> Tuple[bytes, Any]:
+            content = await self._send(request)
+            result = json.loads(content)
+            if use_cache:
+                self._store(request, content, tags(result))
+            return content, result
+
+        if request.cache_key is None:
+            return (await fetch())[1]
+        (content, result), shared = await self._flight.do(request.cache_key, fetch)
+        return json.loads(content) if shared else result
+
+    async def search(self, params: Dict[str, Any], page: int = 0, page_size: int = 20,
+                     token: Optional[str] = None, use_cache: bool = True) -> Any:
+        """use_cache=False — для массовой выгрузки, чтобы не вытеснять из кэша данные интерфейса"""
+        return await self._fetch_json(
+            self._search_request(params, page, page_size, token), search_result_ids, use_cache
+        )
+
+    async def search_one(self, params: Dict[str, Any], token: Optional[str] = None) -> Any:
+        return await self._fetch_json(self._search_one_request(params, token), search_result_ids)
+
+    async def get_document_details(self, doc_id: Any, doc_type: str,
+                                   token: Optional[str] = None) -> Dict[str, Any]:
+        details = await self._fetch_json(self._details_request(doc_id, doc_type, token), lambda result: [doc_id])
+        details['docType'] = doc_type
+        return details
+
+    async def get_documents_details(self, ids_with_types: List[Tuple[Any, str]], token: Optional[str] = None,
+                                    concurrency: Optional[int] = None) -> List[DocumentDetailsResult]:
+        """Конкурентно запрашивает детальную информацию; результаты в порядке ids_with_types"""
+        semaphore = asyncio.Semaphore(concurrency or int(config.get('details_concurrency', 8)))
+
+        async def fetch(doc_id: Any, doc_type: str) -> DocumentDetailsResult:
+            async with semaphore:
+                try:
+                    details = await self.get_document_details(doc_id, doc_type, token)
+                    return DocumentDetailsResult(doc_id, doc_type, details, 200, None)
+                except FSAApiError as e:
+                    return DocumentDetailsResult(doc_id, doc_type, None, e.status_code, str(e))
+
+        return list(await asyncio.gather(*(fetch(doc_id, doc_type) for doc_id, doc_type in ids_with_types)))
+
+    async def sync_document(self, doc_id: Any, doc_type: str, token: Optional[str] = None) -> Any:
+        result = json.loads(await self._send(self._sync_request(doc_id, doc_type, token)))
+        self.cache.invalidate_tag(doc_id)
+        return result
+
+    async def full_reindex(self) -> bool:
+        await self._send(self._admin_request('full_reindex', "Ошибка при выполнении полного переиндексирования"))
+        return True
+
+    async def restart_index_queue(self) -> bool:
+        await self._send(self._admin_request('restart_index_queue', "Ошибка при перезапуске очереди индексирования"))
+        return True
+
+    async def clear_queues(self) -> bool:
+        await self._send(self._admin_request('clear_queues', "Ошибка при очистке очередей"))
+        return True
+
+    async def load_documents(self, doc_type: str, date: str) -> bool:
+        await self._send(self._load_request(doc_type, date))
+        return True
+
+    async def load_documents_period(self, doc_type: str, start_date: str, end_date: str) -> bool:
+        await self._send(self._load_period_request(doc_type, start_date, end_date))
+        return True
+
+    async def update_dictionaries(self) -> bool:
+        await self._send(self._admin_request('update_dictionaries', "Ошибка при обновлении словарей"))
+        return True
+
+    async def update_expired_documents(self) -> bool:
+        await self._send(self._admin_request('update_expired', "Ошибка при обновлении истекших документов"))
+        return True
@@ -0,0 +1,93 @@
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+
+from config.config import load_config
+
+config = load_config()
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Запрос отклонён без обращения к сети: эндпоинт считается недоступным"""
+
+
+class CircuitBreaker:
+    """
+    Автомат «закрыт → открыт → полуоткрыт» для одного эндпоинта.
+
+    После failure_threshold сбоев подряд запросы отклоняются сразу в течение
+    reset_timeout секунд, затем пропускается один пробный запрос: при успехе
+    автомат закрывается, при сбое снова открывается. Пока пробный запрос
+    выполняется, остальные запросы отклоняются; если его результат не записан
+    за reset_timeout секунд, пропускается следующий пробный запрос.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at = 0.0
+        self._state = self.CLOSED
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_request(self) -> None:
+        """Проверить, можно ли выполнять запрос; иначе выбрасывает CircuitOpenError"""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+            now = time.monotonic()
+            if (self._state == self.OPEN and now - self._opened_at >= self.reset_timeout) or (
+                    self._state == self.HALF_OPEN and now - self._probe_started_at >= self.reset_timeout):
+                # Пропускаем один пробный запрос, остальные отклоняются до его результата
+                self._state = self.HALF_OPEN
+                self._probe_started_at = now
+                return
+            raise CircuitOpenError(
+                f"Сервис '{self.name}' временно недоступен, повторите попытку позже"
+            )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._state = self.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Получить общий автомат для эндпоинта, создав его при первом обращении"""
+    breaker: Optional[CircuitBreaker] = _breakers.get(name)
+    if breaker is None:
+        with _breakers_lock:
+            breaker = _breakers.get(name)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    name,
+                    failure_threshold=int(config.get('circuit_breaker_failure_threshold', 5)),
+                    reset_timeout=float(config.get('circuit_breaker_reset_timeout', 30))
+                )
+                _breakers[name] = breaker
+    return breaker
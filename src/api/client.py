@@ -0,0 +1,321 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import requests
+
+from config.config import EndpointNotConfiguredError, get_endpoints, load_config
+from src.api.exceptions import ApiConnectionError, ConfigurationError, FSAApiError, raise_for_status
+from src.api.http_client import get_http_client
+from src.api.local_index import LocalIndex, get_local_index
+from src.api.response_cache import ResponseCache, get_response_cache, make_cache_key
+from src.api.single_flight import SingleFlight
+
+config = load_config()
+
+
+class ApiRequest(NamedTuple):
+    """Описание одного запроса к API, общее для синхронного и асинхронного клиентов"""
+    method: str
+    url: str
+    params: Optional[Dict[str, Any]]
+    headers: Dict[str, str]
+    error_message: str
+    cache_key: Optional[str] = None
+    # Имя автомата отключения: сбои одного эндпоинта не блокируют остальные
+    endpoint: str = 'api'
+
+
+class DocumentDetailsResult(NamedTuple):
+    """Результат запроса детальной информации по одному документу"""
+    doc_id: Any
+    doc_type: str
+    details: Optional[Dict[str, Any]]
+    status_code: Optional[int]
+    error: Optional[str]
+
+
+def search_result_ids(result: Any) -> List[Any]:
+    """ID документов из ответа поиска — теги для инвалидации кэша"""
+    if isinstance(result, dict):
+        items = result.get('items') or []
+        if 'ID' in result:
+            items = [result, *items]
+    elif isinstance(result, list):
+        items = result
+    else:
+        return []
+    return [item['ID'] for item in items if isinstance(item, dict) and 'ID' in item]
+
+
+class BaseFSAClient:
+    """
+    Построение запросов к API FSA без привязки к транспорту и Streamlit.
+
+    Подклассы реализуют только выполнение запроса (requests или httpx),
+    поэтому URL, заголовки, ключи кэша и разбор ошибок у них общие.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, cache: Optional[ResponseCache] = None):
+        # None — api_base_url текущей конфигурации (в том числе после перезагрузки config.json)
+        self._base_url = base_url
+        self.cache = cache if cache is not None else get_response_cache()
+
+    @property
+    def base_url(self) -> str:
+        return self._base_url or config['api_base_url']
+
+    def _url(self, endpoint: str) -> str:
+        """URL эндпоинта из реестра, вычисленного при загрузке конфигурации"""
+        try:
+            return get_endpoints().url(endpoint, self._base_url)
+        except EndpointNotConfiguredError as e:
+            raise ConfigurationError(str(e)) from e
+
+    @staticmethod
+    def _auth_headers(token: Optional[str]) -> Dict[str, str]:
+        headers = {}
+        if token:
+            headers['Authorization'] = f'Bearer {token}'
+        return headers
+
+    @staticmethod
+    def _admin_headers() -> Dict[str, str]:
+        api_key = config.get('admin_api_key')
+        if not api_key:
+            raise ConfigurationError("admin_api_key не задан в config.json")
+        return {'X-API-Key': api_key}
+
+    def _search_request(self, params: Dict[str, Any], page: int, page_size: int,
+                        token: Optional[str]) -> ApiRequest:
+        params = {**params, 'page': page, 'pageSize': page_size}
+        return ApiRequest(
+            'GET', self._url('search'), params,
+            self._auth_headers(token), "Ошибка при запросе",
+            make_cache_key('search', params, token), 'search'
+        )
+
+    def _search_one_request(self, params: Dict[str, Any], token: Optional[str]) -> ApiRequest:
+        return ApiRequest(
+            'GET', self._url('search_one'), dict(params),
+            self._auth_headers(token), "Ошибка при запросе",
+            make_cache_key('search_one', params, token), 'search_one'
+        )
+
+    def _details_request(self, doc_id: Any, doc_type: str, token: Optional[str]) -> ApiRequest:
+        return ApiRequest(
+            'GET', f"{self._url(f'details:{doc_type}')}/{doc_id}", None,
+            self._auth_headers(token), "Ошибка при запросе детальной информации",
+            make_cache_key(f'details:{doc_type}:{doc_id}', None, token), 'details'
+        )
+
+    def _sync_request(self, doc_id: Any, doc_type: str, token: Optional[str]) -> ApiRequest:
+        return ApiRequest(
+            'GET', f"{self._url(f'sync:{doc_type}')}/{doc_id}", None,
+            self._auth_headers(token), "Ошибка при синхронизации документа", endpoint='sync'
+        )
+
+    def _admin_request(self, endpoint: str, error_message: str,
+                       params: Optional[Dict[str, Any]] = None) -> ApiRequest:
+        return ApiRequest(
+            'GET', self._url(endpoint), params,
+            self._admin_headers(), error_message, endpoint='admin'
+        )
+
+    def _load_request(self, doc_type: str, date: str) -> ApiRequest:
+        return self._admin_request(
+            'load', "Ошибка при загрузке документов", {'t': doc_type, 'dt': date}
+        )
+
+    def _load_period_request(self, doc_type: str, start_date: str, end_date: str) -> ApiRequest:
+        return self._admin_request(
+            'load_period', "Ошибка при загрузке документов за период",
+            {'t': doc_type, 'from': start_date, 'to': end_date}
+        )
+
+    def _cached_json(self, request: ApiRequest) -> Optional[Any]:
+        if request.cache_key is None:
+            return None
+        cached = self.cache.get(request.cache_key)
+        return json.loads(cached) if cached is not None else None
+
+    def _store(self, request: ApiRequest, content: bytes, tags: List[Any]) -> None:
+        if request.cache_key is not None:
+            self.cache.set(request.cache_key, content, tags=tags)
+
+
+class FSAClient(BaseFSAClient):
+    """
+    Синхронный клиент API FSA поверх общего пула HTTP-соединений.
+
+    Одинаковые одновременные запросы поиска и детальной информации
+    (из разных сессий или перезапусков) объединяются в один запрос к API.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, cache: Optional[ResponseCache] = None,
+                 local_index: Optional[LocalIndex] = None, shared_local_index: bool = False):
+        super().__init__(base_url, cache)
+        self._flight = SingleFlight()
+        # Постоянный индекс полученных документов (см. LocalIndex), по умолчанию выключен
+        self._local_index = local_index
+        self._shared_local_index = shared_local_index
+
+    @property
+    def local_index(self) -> Optional[LocalIndex]:
+        """
+        Локальный индекс клиента. При shared_local_index — общий get_local_index(),
+        который учитывает настройки local_index_* после перезагрузки config.json.
+        """
+        if self._shared_local_index:
+            return get_local_index()
+        return self._local_index
+
+    def _send(self, request: ApiRequest) -> bytes:
+        try:
+            response = get_http_client().request(
+                request.method, request.url, endpoint=request.endpoint,
+                params=request.params, headers=request.headers
+            )
+        except requests.RequestException as e:
+            raise ApiConnectionError(f"{request.error_message}: {e}") from e
+        raise_for_status(response.status_code, request.error_message)
+        return response.content
+
+    def _fetch_json(self, request: ApiRequest,
+                    tags: Callable[[Any], List[Any]] = lambda result: [],
+                    use_cache: bool = True) -> Any:
+        if use_cache:
+            cached = self._cached_json(request)
+            if cached is not None:
+                return cached
+
+        def fetch() -> Tuple[bytes, Any]:
+            content = self._send(request)
+            result = json.loads(content)
+            # Кэш заполняется до освобождения ключа, чтобы следующие вызовы попали в него
+            if use_cache:
+                self._store(request, content, tags(result))
+            return content, result
+
+        if request.cache_key is None:
+            return fetch()[1]
+        (content, result), shared = self._flight.do(request.cache_key, fetch)
+        # Разобранный ответ принадлежит вызвавшему запрос: остальные получают свою копию
+        return json.loads(content) if shared else result
+
+    def search(self, params: Dict[str, Any], page: int = 0, page_size: int = 20,
+               token: Optional[str] = None, use_cache: bool = True) -> Any:
+        """use_cache=False — для массовой выгрузки, чтобы не вытеснять из кэша данные интерфейса"""
+        local_index = self.local_index if use_cache else None
+        if local_index is not None:
+            local = local_index.search(params, page, page_size)
+            if local is not None:
+                return local
+
+        result = self._fetch_json(
+            self._search_request(params, page, page_size, token), search_result_ids, use_cache
+        )
+        if local_index is not None:
+            local_index.record_search(params, page, page_size, result)
+        return result
+
+    def search_one(self, params: Dict[str, Any], token: Optional[str] = None) -> Any:
+        return self._fetch_json(self._search_one_request(params, token), search_result_ids)
+
+    def get_document_details(self, doc_id: Any, doc_type: str, token: Optional[str] = None) -> Dict[str, Any]:
+        local_index = self.local_index
+        if local_index is not None:
+            details = local_index.get_details(doc_id, doc_type)
+            if details is not None:
+                details['docType'] = doc_type
+                return details
+
+        details = self._fetch_json(self._details_request(doc_id, doc_type, token), lambda result: [doc_id])
+        if local_index is not None:
+            local_index.record_details(doc_id, doc_type, details)
+        details['docType'] = doc_type
+        return details
+
+    def get_documents_details(self, ids_with_types: List[Tuple[Any, str]], token: Optional[str] = None,
+                              max_workers: Optional[int] = None) -> List[DocumentDetailsResult]:
+        """
+        Параллельно запрашивает детальную информацию по нескольким документам.
+
+        Args:
+            ids_with_types: список пар (ID документа, тип: 'declaration' или 'certificate')
+            token: JWT пользователя
+            max_workers: ограничение числа одновременных запросов
+                (по умолчанию details_concurrency из config.json)
+
+        Returns:
+            List[DocumentDetailsResult]: результаты в том же порядке, что и ids_with_types.
+            Ошибки не выбрасываются, а возвращаются в поле error каждого результата.
+        """
+        if not ids_with_types:
+            return []
+
+        max_workers = max_workers or int(config.get('details_concurrency', 8))
+        max_workers = max(1, min(max_workers, len(ids_with_types)))
+
+        def fetch(pair: Tuple[Any, str]) -> DocumentDetailsResult:
+            doc_id, doc_type = pair
+            try:
+                details = self.get_document_details(doc_id, doc_type, token)
+                return DocumentDetailsResult(doc_id, doc_type, details, 200, None)
+            except FSAApiError as e:
+                return DocumentDetailsResult(doc_id, doc_type, None, e.status_code, str(e))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(fetch, ids_with_types))
+
+    def sync_document(self, doc_id: Any, doc_type: str, token: Optional[str] = None) -> Any:
+        result = json.loads(self._send(self._sync_request(doc_id, doc_type, token)))
+        # Документ обновлён на бэкенде — закэшированные ответы с ним устарели
+        self.cache.invalidate_tag(doc_id)
+        local_index = self.local_index
+        if local_index is not None:
+            local_index.invalidate(doc_id)
+        return result
+
+    def full_reindex(self) -> bool:
+        self._send(self._admin_request('full_reindex', "Ошибка при выполнении полного переиндексирования"))
+        return True
+
+    def restart_index_queue(self) -> bool:
+        self._send(self._admin_request('restart_index_queue', "Ошибка при перезапуске очереди индексирования"))
+        return True
+
+    def clear_queues(self) -> bool:
+        self._send(self._admin_request('clear_queues', "Ошибка при очистке очередей"))
+        return True
+
+    def load_documents(self, doc_type: str, date: str) -> bool:
+        self._send(self._load_request(doc_type, date))
+        return True
+
+    def load_documents_period(self, doc_type: str, start_date: str, end_date: str) -> bool:
+        self._send(self._load_period_request(doc_type, start_date, end_date))
+        return True
+
+    def update_dictionaries(self) -> bool:
+        self._send(self._admin_request('update_dictionaries', "Ошибка при обновлении словарей"))
+        return True
+
+    def update_expired_documents(self) -> bool:
+        self._send(self._admin_request('update_expired', "Ошибка при обновлении истекших документов"))
+        return True
+
+
+_fsa_client: Optional[FSAClient] = None
+_fsa_client_lock = threading.Lock()
+
+
+def get_fsa_client() -> FSAClient:
+    """Получить общий синхронный клиент API FSA"""
+    global _fsa_client
+    if _fsa_client is None:
+        with _fsa_client_lock:
+            if _fsa_client is None:
+                _fsa_client = FSAClient(shared_local_index=True)
+    return _fsa_client
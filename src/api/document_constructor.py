@@ -1,109 +1,105 @@
 from typing import Dict, List, Any, Optional
 import requests
 import streamlit as st
-from config.config import Config
-from datetime import datetime
+from config.config import load_config
+from src.api.generation import generation_timeout, request_generation
+from src.api.http_client import get_http_client
+from src.api.request_history import RequestHistory
+from src.utils.document_cache import DocumentCache, get_document_cache
 import logging
+import zipfile
 
-# Настройка логирования
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s [%(levelname)s] %(message)s',
-    datefmt='%Y-%m-%d %H:%M:%S'
-)
 logger = logging.getLogger(__name__)
 
-config = Config.get_instance()
+config = load_config()
+
+# DOCX и PPTX уже являются ZIP-архивами: повторное сжатие только тратит CPU
+_PRECOMPRESSED_FORMATS = {'docx', 'pptx'}
+_ARCHIVE_NAME = 'documents.zip'
+
 
 class DocumentConstructor:
-    def __init__(self):
-        self.base_url = config.get('LOCAL_CERTIFICATE_API_URL')
-        self.headers = {
-            'Content-Type': 'application/json; charset=utf-8'
-        }
+    def __init__(self, document_cache: Optional[DocumentCache] = None):
+        # None — LOCAL_CERTIFICATE_API_URL текущей конфигурации (в том числе после перезагрузки config.json)
+        self._base_url: Optional[str] = None
+        # По умолчанию — общий дисковый кэш файлов (get_document_cache)
+        self.document_cache = document_cache
         self.request_history_key = "doc_constructor_request_history"
-        self.downloaded_docs_key = "downloaded_documents_cache"
-        self.max_history_size = 100
+        self.download_chunk_size = 64 * 1024
+        self.max_history_size = int(config.get('request_history_size', 100))
+        history_max_age = config.get('request_history_max_age')
+        self.history_max_age = float(history_max_age) if history_max_age else None
+        self.generation_timeout = generation_timeout()
         logger.info("DocumentConstructor initialized with base_url: %s", self.base_url)
 
+    @property
+    def base_url(self) -> Optional[str]:
+        return self._base_url or config.get('LOCAL_CERTIFICATE_API_URL')
+
+    @base_url.setter
+    def base_url(self, value: Optional[str]) -> None:
+        self._base_url = value
+
+    def _history(self) -> RequestHistory:
+        """История запросов текущей сессии"""
+        history = st.session_state.get(self.request_history_key)
+        if not isinstance(history, RequestHistory):
+            history = RequestHistory(self.max_history_size, self.history_max_age)
+            st.session_state[self.request_history_key] = history
+        return history
+
     def _add_to_request_history(self, doc_id: str, request_type: str, status: str):
         """Добавление записи в историю запросов"""
-        if self.request_history_key not in st.session_state:
-            st.session_state[self.request_history_key] = []
-        
-        history = st.session_state[self.request_history_key]
-        history.append({
-            'doc_id': doc_id,
-            'request_type': request_type,
-            'status': status,
-            'timestamp': datetime.now().isoformat()
-        })
+        record = self._history().add(doc_id, request_type, status)
         
         # Логирование события
         logger.info(
             "Request history updated - Doc ID: %s, Type: %s, Status: %s",
             doc_id, request_type, status
         )
-        
-        # Ограничение размера истории
-        if len(history) > self.max_history_size:
-            history.pop(0)
-            logger.debug("Request history trimmed to max size: %d", self.max_history_size)
+        if record.duration is not None:
+            logger.debug("Request %s for Doc ID %s took %.3f s", request_type, doc_id, record.duration)
 
     def get_request_status(self, doc_id: str) -> Dict[str, str]:
         """Получение статуса запросов для документа"""
-        if self.request_history_key not in st.session_state:
-            return {}
-        
-        history = st.session_state[self.request_history_key]
-        status = {}
-        for record in reversed(history):
-            if record['doc_id'] == doc_id:
-                status[record['request_type']] = record['status']
-        return status
+        return self._history().status(doc_id)
+
+    def get_request_stats(self) -> Dict[str, Dict[str, float]]:
+        """Статистика запросов сессии по типам (см. RequestHistory.stats)"""
+        return self._history().stats()
+
+    def request_generation(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST /generate_documents без обращения к Streamlit (см. src.api.generation.request_generation).
+
+        Raises:
+            requests.RequestException: при сетевой ошибке или неуспешном статусе ответа
+        """
+        return request_generation(data, self.base_url, self.generation_timeout)
+
+    @staticmethod
+    def _log_generation_error(doc_id: str, e: requests.RequestException) -> None:
+        logger.error(
+            "Error generating documents for Doc ID: %s - %s",
+            doc_id, str(e)
+        )
+        if hasattr(e, 'response') and e.response is not None:
+            logger.error(
+                "API Response - Status: %s, Content: %s",
+                e.response.status_code, e.response.text
+            )
 
     def generate_documents(self, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Генерация документов через API конструктора"""
         doc_id = str(data.get('ID', 'unknown'))
         try:
-            logger.info("Starting document generation for Doc ID: %s", doc_id)
-            logger.debug("Generation request data: %s", data)
-            
             self._add_to_request_history(doc_id, 'generate', 'processing')
-            
-            url = f"{self.base_url}/generate_documents"
-            logger.info("Sending POST request to: %s", url)
-            
-            response = requests.post(
-                url,
-                json={"data": data},
-                headers=self.headers
-            )
-            response.raise_for_status()
-            
-            documents_list = response.json()
-            logger.info("Documents generated successfully for Doc ID: %s", doc_id)
-            logger.debug("Generated documents: %s", documents_list)
-            
-            result = {
-                'documents': documents_list,
-                'merged_data': data
-            }
-            
+            result = self.request_generation(data)
             self._add_to_request_history(doc_id, 'generate', 'success')
             return result
             
         except requests.RequestException as e:
-            logger.error(
-                "Error generating documents for Doc ID: %s - %s", 
-                doc_id, str(e)
-            )
-            if hasattr(e, 'response') and e.response is not None:
-                logger.error(
-                    "API Response - Status: %s, Content: %s",
-                    e.response.status_code, e.response.text
-                )
-            
+            self._log_generation_error(doc_id, e)
             self._add_to_request_history(doc_id, 'generate', 'error')
             st.error(f"Ошибка при генерации документов: {str(e)}")
             if hasattr(e, 'response') and e.response is not None:
@@ -111,20 +107,32 @@ class DocumentConstructor:
                 st.error(f"Ответ сервера: {e.response.text}")
             return None
 
-    def _get_cache_key(self, doc_id: str, url: str) -> str:
-        """Создание уникального ключа для кэширования"""
-        return f"{doc_id}_{url}"
+    def _document_cache(self) -> DocumentCache:
+        return self.document_cache or get_document_cache()
+
+    def download_document_file(self, url: str, doc_id: str, version: str = '') -> Optional[str]:
+        """
+        Скачивание сгенерированного документа в общий дисковый кэш.
+
+        Файл передаётся по частям и не собирается целиком в памяти.
+
+        Args:
+            url: относительный URL файла из ответа /generate_documents
+            doc_id: ID документа
+            version: версия генерации (generated_at результата), чтобы не отдавать
+                файлы предыдущей генерации
+
+        Returns:
+            Optional[str]: путь к файлу в кэше или None при ошибке
+        """
+        cache = self._document_cache()
+        cache_key = cache.make_key(doc_id, url, version)
 
-    def download_document(self, url: str, doc_id: str) -> Optional[bytes]:
-        """Скачивание сгенерированного документа с кэшированием"""
-        cache_key = self._get_cache_key(doc_id, url)
-        
         # Проверяем наличие документа в кэше
-        if self.downloaded_docs_key in st.session_state:
-            cached_doc = st.session_state[self.downloaded_docs_key].get(cache_key)
-            if cached_doc is not None:
-                logger.info("Document found in cache for Doc ID: %s", doc_id)
-                return cached_doc
+        cached_path = cache.get_path(cache_key)
+        if cached_path is not None:
+            logger.info("Document found in cache for Doc ID: %s", doc_id)
+            return cached_path
 
         try:
             logger.info("Document not in cache, downloading for Doc ID: %s", doc_id)
@@ -133,20 +141,15 @@ class DocumentConstructor:
             download_url = f"{self.base_url}{url}"
             logger.info("Sending GET request to: %s", download_url)
             
-            response = requests.get(download_url)
-            response.raise_for_status()
-            
-            # Сохраняем в кэш
-            if self.downloaded_docs_key not in st.session_state:
-                st.session_state[self.downloaded_docs_key] = {}
-            
-            st.session_state[self.downloaded_docs_key][cache_key] = response.content
+            with get_http_client().get(download_url, endpoint='certificate_api', stream=True) as response:
+                response.raise_for_status()
+                path = cache.put_stream(cache_key, response.iter_content(chunk_size=self.download_chunk_size))
             
             logger.info("Document downloaded and cached for Doc ID: %s", doc_id)
-            logger.debug("Response size: %d bytes", len(response.content))
+            logger.debug("Cached file: %s", path)
             
             self._add_to_request_history(doc_id, 'download', 'success')
-            return response.content
+            return path
             
         except requests.RequestException as e:
             logger.error(
@@ -163,6 +166,18 @@ class DocumentConstructor:
             st.error(f"Ошибка при скачивании документа: {str(e)}")
             return None
 
+    def cached_document_path(self, url: str, doc_id: str, version: str = '') -> Optional[str]:
+        """Путь к уже скачанному документу без обращения к API (None, если его нет в кэше)"""
+        cache = self._document_cache()
+        return cache.get_path(cache.make_key(doc_id, url, version))
+
+    def download_document(self, url: str, doc_id: str, version: str = '') -> Optional[bytes]:
+        """Скачивание сгенерированного документа с кэшированием"""
+        if self.download_document_file(url, doc_id, version) is None:
+            return None
+        cache = self._document_cache()
+        return cache.get_bytes(cache.make_key(doc_id, url, version))
+
     @staticmethod
     def get_mime_type(format: str) -> str:
         """Получение MIME-типа для формата файла"""
@@ -171,4 +186,48 @@ class DocumentConstructor:
             'pptx': 'application/vnd.openxmlformats-officedocument.presentationml.presentation',
             'pdf': 'application/pdf'
         }
-        return mime_types.get(format, 'application/octet-stream') 
\ No newline at end of file
+        return mime_types.get(format, 'application/octet-stream') 
+
+    def cached_archive_path(self, doc_id: str, version: str = '') -> Optional[str]:
+        """Путь к уже собранному ZIP-архиву записи (None, если его нет в кэше)"""
+        cache = self._document_cache()
+        return cache.get_path(cache.make_key(doc_id, _ARCHIVE_NAME, version))
+
+    def build_documents_archive(self, doc_id: str, documents: List[Dict[str, Any]],
+                                version: str = '') -> Optional[str]:
+        """
+        ZIP-архив со всеми сгенерированными файлами записи.
+
+        Файлы скачиваются в дисковый кэш и добавляются в архив по одному,
+        архив пишется сразу в кэш, поэтому в памяти не находится ни один файл целиком.
+
+        Returns:
+            Optional[str]: путь к архиву или None, если какой-либо файл не скачался
+        """
+        archive_path = self.cached_archive_path(doc_id, version)
+        if archive_path is not None:
+            return archive_path
+
+        paths = []
+        for doc in documents:
+            path = self.download_document_file(doc['url'], doc_id, version)
+            if path is None:
+                return None
+            paths.append((path, f"{doc['name']}.{doc['format']}", doc['format']))
+
+        def write_archive(file) -> None:
+            with zipfile.ZipFile(file, 'w') as archive:
+                for path, arcname, fmt in paths:
+                    compression = zipfile.ZIP_STORED if fmt in _PRECOMPRESSED_FORMATS else zipfile.ZIP_DEFLATED
+                    archive.write(path, arcname, compress_type=compression)
+
+        cache = self._document_cache()
+        archive_key = cache.make_key(doc_id, _ARCHIVE_NAME, version)
+        logger.info("Building documents archive for Doc ID: %s (%d files)", doc_id, len(paths))
+        try:
+            return cache.put_with(archive_key, write_archive)
+        except OSError as e:
+            # Файл мог быть вытеснен из кэша между скачиванием и упаковкой
+            logger.error("Error building documents archive for Doc ID: %s - %s", doc_id, str(e))
+            st.error(f"Ошибка при формировании архива: {str(e)}")
+            return None
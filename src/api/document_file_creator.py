@@ -1,15 +1,17 @@
 import requests
 import streamlit as st
-from config.config import load_config
+from config.config import EndpointNotConfiguredError, get_endpoints
+from src.api.http_client import get_http_client
 from src.auth import authenticator
 import json
 
 
-config = load_config()
-
-
 def create_document_file(document_data):
-    url = f"{config['api_base_url']}{config['create_document_file_endpoint']}"
+    try:
+        url = get_endpoints().url('create_document_file')
+    except EndpointNotConfiguredError as e:
+        st.error(f"Создание файла документа недоступно: {e}")
+        return None
 
     headers = {
         'Content-Type': 'application/json',
@@ -23,7 +25,9 @@ def create_document_file(document_data):
     json_data = json.dumps(document_data, ensure_ascii=False, indent=None)
 
     try:
-        response = requests.post(url, data=json_data.encode('utf-8'), headers=headers)
+        response = get_http_client().post(
+            url, data=json_data.encode('utf-8'), headers=headers, endpoint='create_document_file'
+        )
         response.raise_for_status()  # Вызовет исключение для HTTP-ошибок
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -0,0 +1,50 @@
+from typing import Optional
+
+
+class FSAApiError(Exception):
+    """Базовая ошибка обращения к API FSA"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class ApiConnectionError(FSAApiError):
+    """Сетевая ошибка: бэкенд недоступен, обрыв соединения, таймаут"""
+
+
+class AuthenticationError(FSAApiError):
+    """Ответ 401: токен отсутствует, истёк или отозван"""
+
+
+class ClientError(FSAApiError):
+    """Ответ 4xx (кроме 401): некорректный запрос или документ не найден"""
+
+
+class ServerError(FSAApiError):
+    """Ответ 5xx: ошибка на стороне бэкенда"""
+
+
+class ConfigurationError(FSAApiError):
+    """Эндпоинт или ключ, нужный для запроса, не задан в config.json"""
+
+
+def raise_for_status(status_code: int, error_message: str) -> None:
+    """
+    Выбрасывает типизированное исключение для неуспешного HTTP-статуса.
+
+    Args:
+        status_code: HTTP-статус ответа
+        error_message: префикс сообщения, к нему добавляется код статуса
+    """
+    if 200 <= status_code < 300:
+        return
+
+    message = f"{error_message}: {status_code}"
+    if status_code == 401:
+        raise AuthenticationError(message, status_code)
+    if 400 <= status_code < 500:
+        raise ClientError(message, status_code)
+    if status_code >= 500:
+        raise ServerError(message, status_code)
+    raise FSAApiError(message, status_code)
@@ -0,0 +1,161 @@
+import csv
+import json
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from config.config import load_config
+from src.api.client import FSAClient, get_fsa_client
+from src.utils.results_table import RESULT_COLUMNS, build_results_frame
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+config = load_config()
+
+EXPORT_FORMATS = ('csv', 'jsonl', 'parquet')
+
+EXPORT_MIME_TYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+# progress(обработано страниц, всего страниц, записано строк)
+ProgressCallback = Callable[[int, int, int], None]
+
+
+class _CsvExportWriter:
+    def __init__(self, path: str):
+        # utf-8-sig — чтобы Excel корректно открывал кириллицу
+        self._file = open(path, 'w', encoding='utf-8-sig', newline='')
+        csv.writer(self._file).writerow(RESULT_COLUMNS)
+
+    def write_frame(self, frame: 'pd.DataFrame') -> None:
+        frame.to_csv(self._file, header=False, index=False)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _JsonlExportWriter:
+    def __init__(self, path: str):
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write_frame(self, frame: 'pd.DataFrame') -> None:
+        for record in frame.to_dict('records'):
+            self._file.write(json.dumps(record, ensure_ascii=False))
+            self._file.write('\n')
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetExportWriter:
+    def __init__(self, path: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._schema = pa.schema([(column, pa.string()) for column in RESULT_COLUMNS])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def write_frame(self, frame: 'pd.DataFrame') -> None:
+        if frame.empty:
+            return
+        # Все колонки пишутся строками, чтобы схема не зависела от содержимого страницы
+        table = self._pa.Table.from_pandas(frame.astype(str), schema=self._schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+_WRITERS = {
+    'csv': _CsvExportWriter,
+    'jsonl': _JsonlExportWriter,
+    'parquet': _ParquetExportWriter,
+}
+
+
+def make_export_path(fmt: str) -> str:
+    """Путь для нового файла выгрузки в каталоге export_dir (по умолчанию — временный каталог)"""
+    export_dir = config.get('export_dir') or os.path.join(tempfile.gettempdir(), 'fsa_exports')
+    os.makedirs(export_dir, exist_ok=True)
+    return os.path.join(export_dir, f"fsa_export_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.{fmt}")
+
+
+def _page_items(result: Any) -> List[Dict[str, Any]]:
+    if isinstance(result, dict):
+        return result.get('items') or []
+    if isinstance(result, list):
+        return result
+    return []
+
+
+def export_search_results(params: Dict[str, Any], path: str, fmt: str = 'csv',
+                          token: Optional[str] = None, client: Optional[FSAClient] = None,
+                          page_size: Optional[int] = None, concurrency: Optional[int] = None,
+                          progress: Optional[ProgressCallback] = None) -> int:
+    """
+    Выгружает все страницы поиска в файл, не держа весь результат в памяти.
+
+    Страницы запрашиваются параллельно (не более concurrency одновременно),
+    но записываются строго по порядку: в памяти одновременно находится
+    не больше concurrency страниц.
+
+    Args:
+        params: параметры поиска (как для search_fsa)
+        path: путь к итоговому файлу
+        fmt: 'csv', 'jsonl' или 'parquet'
+        token: JWT пользователя
+        client: клиент API (по умолчанию общий FSAClient)
+        page_size: размер страницы (по умолчанию export_page_size из config.json)
+        concurrency: число параллельных запросов (по умолчанию export_concurrency)
+        progress: функция обратного вызова progress(страниц, всего страниц, строк)
+
+    Returns:
+        int: количество записанных строк
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"Неподдерживаемый формат выгрузки: {fmt}")
+
+    client = client or get_fsa_client()
+    page_size = page_size or int(config.get('export_page_size', 100))
+    concurrency = max(1, concurrency or int(config.get('export_concurrency', 4)))
+
+    def fetch(page: int) -> List[Dict[str, Any]]:
+        return _page_items(client.search(params, page, page_size, token=token, use_cache=False))
+
+    first_page = client.search(params, 0, page_size, token=token, use_cache=False)
+    total_pages = first_page.get('totalPages', 1) if isinstance(first_page, dict) else 1
+
+    writer = _WRITERS[fmt](path)
+    rows_written = 0
+    try:
+        frame = build_results_frame(_page_items(first_page))
+        writer.write_frame(frame)
+        rows_written += len(frame)
+        if progress:
+            progress(1, total_pages, rows_written)
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            next_page = 1
+            window = deque()
+            while next_page < total_pages or window:
+                while next_page < total_pages and len(window) < concurrency:
+                    window.append(executor.submit(fetch, next_page))
+                    next_page += 1
+
+                frame = build_results_frame(window.popleft().result())
+                writer.write_frame(frame)
+                rows_written += len(frame)
+                if progress:
+                    progress(next_page - len(window), total_pages, rows_written)
+    finally:
+        writer.close()
+
+    return rows_written
@@ -0,0 +1,70 @@
+"""
+Запрос генерации документов к API конструктора без обращения к Streamlit.
+
+Используется DocumentConstructor, рабочими потоками очереди генерации
+и пакетной генерацией в fsa_cli.py.
+"""
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from config.config import load_config
+from src.api.http_client import get_http_client
+from src.utils.logging_utils import log_payload
+
+logger = logging.getLogger(__name__)
+
+config = load_config()
+
+GENERATION_HEADERS = {'Content-Type': 'application/json; charset=utf-8'}
+
+
+def generation_timeout() -> Tuple[float, float]:
+    """Генерация дольше обычного запроса: отдельный таймаут чтения (connect, read)"""
+    return float(config.get('connect_timeout', 5)), float(config.get('generation_timeout', 120))
+
+
+def request_generation(data: Dict[str, Any], base_url: Optional[str] = None,
+                       timeout: Optional[Tuple[float, float]] = None) -> Dict[str, Any]:
+    """
+    POST /generate_documents (безопасно для рабочих потоков).
+
+    Args:
+        data: данные записи (детали документа, при необходимости объединённые
+            с результатом поиска через merge_search_data)
+        base_url: адрес API конструктора (по умолчанию LOCAL_CERTIFICATE_API_URL)
+        timeout: (connect, read), по умолчанию generation_timeout()
+
+    Returns:
+        Dict[str, Any]: documents — список файлов, merged_data — отправленные данные,
+            generated_at — версия генерации
+
+    Raises:
+        requests.RequestException: при сетевой ошибке или неуспешном статусе ответа
+    """
+    doc_id = str(data.get('ID', 'unknown'))
+    logger.info("Starting document generation for Doc ID: %s", doc_id)
+    log_payload("Generation request data", data)
+
+    url = f"{base_url or config['LOCAL_CERTIFICATE_API_URL']}/generate_documents"
+    logger.info("Sending POST request to: %s", url)
+
+    response = get_http_client().post(
+        url,
+        json={"data": data},
+        headers=GENERATION_HEADERS,
+        endpoint='certificate_api',
+        timeout=timeout or generation_timeout()
+    )
+    response.raise_for_status()
+
+    documents_list = response.json()
+    logger.info("Documents generated successfully for Doc ID: %s", doc_id)
+    log_payload("Generated documents", documents_list)
+
+    return {
+        'documents': documents_list,
+        'merged_data': data,
+        # Версия генерации: файлы повторной генерации не смешиваются в кэше с прежними
+        'generated_at': datetime.now().isoformat()
+    }
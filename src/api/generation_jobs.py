@@ -0,0 +1,302 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import requests
+
+from config.config import load_config
+from src.api.document_constructor import DocumentConstructor
+
+logger = logging.getLogger(__name__)
+
+config = load_config()
+
+# Состояния задания: queued -> processing -> success | error
+JOB_QUEUED = 'queued'
+JOB_PROCESSING = 'processing'
+JOB_SUCCESS = 'success'
+JOB_ERROR = 'error'
+
+JOB_FINISHED_STATES = (JOB_SUCCESS, JOB_ERROR)
+
+INTERRUPTED_ERROR = "Генерация прервана остановкой приложения"
+
+
+class GenerationJob(NamedTuple):
+    """Задание на генерацию документов для одной записи"""
+    job_id: str
+    doc_id: str
+    status: str
+    result: Optional[Dict[str, Any]]
+    error: Optional[str]
+    created_at: float
+    updated_at: float
+
+    @property
+    def finished(self) -> bool:
+        return self.status in JOB_FINISHED_STATES
+
+
+class GenerationJobStore:
+    """
+    Хранилище заданий генерации в SQLite.
+
+    Состояние заданий переживает перезапуски скрипта Streamlit и переподключения
+    пользователя; результат генерации хранится вместе с заданием.
+
+    Одну базу могут использовать несколько процессов (реплики, воркеры Streamlit).
+    Каждое задание помечено владельцем — процессом, который его выполняет; владелец
+    периодически отмечается в generation_job_owners (heartbeat), и незавершённые
+    задания считаются прерванными, только если их владелец перестал отмечаться.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        # Хост, PID и случайный токен запуска: PID может повториться после перезапуска
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS generation_jobs (
+                job_id TEXT PRIMARY KEY,
+                doc_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                owner TEXT
+            )
+            """
+        )
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(generation_jobs)")}
+        if 'owner' not in columns:
+            # База, созданная до появления владельцев заданий
+            self._connection.execute("ALTER TABLE generation_jobs ADD COLUMN owner TEXT")
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS generation_jobs_doc ON generation_jobs (doc_id, created_at)"
+        )
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS generation_job_owners (owner TEXT PRIMARY KEY, heartbeat_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+        self.heartbeat()
+
+    def create(self, doc_id: str) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO generation_jobs (job_id, doc_id, status, created_at, updated_at, owner) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, doc_id, JOB_QUEUED, now, now, self.owner)
+            )
+            self._connection.commit()
+        return job_id
+
+    def update(self, job_id: str, status: str, result: Optional[Dict[str, Any]] = None,
+               error: Optional[str] = None) -> None:
+        with self._lock:
+            self._connection.execute(
+                "UPDATE generation_jobs SET status = ?, result = ?, error = ?, updated_at = ? WHERE job_id = ?",
+                (status, json.dumps(result, ensure_ascii=False) if result is not None else None,
+                 error, time.time(), job_id)
+            )
+            self._connection.commit()
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT job_id, doc_id, status, result, error, created_at, updated_at "
+                "FROM generation_jobs WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+        return self._to_job(row)
+
+    def latest_for_doc(self, doc_id: str) -> Optional[GenerationJob]:
+        """Последнее задание по записи (для восстановления статуса после переподключения)"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT job_id, doc_id, status, result, error, created_at, updated_at "
+                "FROM generation_jobs WHERE doc_id = ? ORDER BY created_at DESC LIMIT 1",
+                (doc_id,)
+            ).fetchone()
+        return self._to_job(row)
+
+    def heartbeat(self) -> None:
+        """Отметить, что владелец заданий этого хранилища жив"""
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO generation_job_owners (owner, heartbeat_at) VALUES (?, ?)",
+                (self.owner, time.time())
+            )
+            self._connection.commit()
+
+    def fail_unfinished(self, error: str, stale_after: float) -> int:
+        """
+        Пометить ошибкой незавершённые задания, оставшиеся после остановки процессов (при старте).
+
+        Затрагиваются задания этого владельца, задания без владельца и задания владельцев,
+        не отмечавшихся дольше stale_after секунд. Задания живых процессов не трогаются.
+        """
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE generation_jobs SET status = ?, error = ?, updated_at = ? "
+                "WHERE status IN (?, ?) AND (owner IS NULL OR owner = ?)",
+                (JOB_ERROR, error, time.time(), JOB_QUEUED, JOB_PROCESSING, self.owner)
+            )
+            self._connection.commit()
+        return cursor.rowcount + self.fail_stale_owners(error, stale_after)
+
+    def fail_stale_owners(self, error: str, stale_after: float) -> int:
+        """
+        Пометить ошибкой незавершённые задания других владельцев, не отмечавшихся дольше stale_after секунд.
+
+        Собственные задания не затрагиваются, поэтому метод безопасно вызывать периодически.
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._connection.execute(
+                """
+                UPDATE generation_jobs SET status = ?, error = ?, updated_at = ?
+                WHERE status IN (?, ?) AND owner IS NOT NULL AND owner != ? AND owner NOT IN (
+                    SELECT owner FROM generation_job_owners WHERE heartbeat_at >= ?
+                )
+                """,
+                (JOB_ERROR, error, now, JOB_QUEUED, JOB_PROCESSING, self.owner, now - stale_after)
+            )
+            self._connection.execute(
+                "DELETE FROM generation_job_owners WHERE heartbeat_at < ? AND owner != ?",
+                (now - stale_after, self.owner)
+            )
+            self._connection.commit()
+        return cursor.rowcount
+
+    def purge(self, max_age: float) -> int:
+        """Удалить завершённые задания старше max_age секунд"""
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM generation_jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (JOB_SUCCESS, JOB_ERROR, time.time() - max_age)
+            )
+            self._connection.commit()
+        return cursor.rowcount
+
+    @staticmethod
+    def _to_job(row) -> Optional[GenerationJob]:
+        if row is None:
+            return None
+        job_id, doc_id, status, result, error, created_at, updated_at = row
+        return GenerationJob(
+            job_id, doc_id, status,
+            json.loads(result) if result is not None else None,
+            error, created_at, updated_at
+        )
+
+
+class GenerationJobQueue:
+    """
+    Очередь генерации документов: задания выполняются в пуле потоков,
+    вызывающий сразу получает ID задания и опрашивает его статус.
+
+    При заданном heartbeat_interval фоновый поток отмечает владельца заданий живым
+    и помечает ошибкой задания процессов, не отмечавшихся дольше stale_after секунд.
+    """
+
+    def __init__(self, store: GenerationJobStore, max_workers: int,
+                 constructor: Optional[DocumentConstructor] = None,
+                 heartbeat_interval: Optional[float] = None, stale_after: Optional[float] = None):
+        self.store = store
+        self.constructor = constructor or DocumentConstructor()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='generation-job')
+        if heartbeat_interval:
+            self._heartbeat_thread = threading.Thread(
+                target=self._heartbeat_loop,
+                args=(heartbeat_interval, stale_after or 3 * heartbeat_interval),
+                name='generation-job-heartbeat', daemon=True
+            )
+            self._heartbeat_thread.start()
+
+    def _heartbeat_loop(self, interval: float, stale_after: float) -> None:
+        while True:
+            time.sleep(interval)
+            try:
+                self._heartbeat(stale_after)
+            except sqlite3.Error:
+                logger.exception("Generation job heartbeat failed")
+
+    def _heartbeat(self, stale_after: float) -> None:
+        self.store.heartbeat()
+        # Задания этого процесса ещё выполняются — затрагиваются только остановившиеся владельцы
+        interrupted = self.store.fail_stale_owners(INTERRUPTED_ERROR, stale_after)
+        if interrupted:
+            logger.warning("Marked %d generation jobs of stopped processes as failed", interrupted)
+
+    def submit(self, data: Dict[str, Any]) -> str:
+        """Поставить генерацию в очередь и вернуть ID задания"""
+        doc_id = str(data.get('ID', 'unknown'))
+        job_id = self.store.create(doc_id)
+        self._executor.submit(self._run, job_id, doc_id, data)
+        logger.info("Generation job %s queued for Doc ID: %s", job_id, doc_id)
+        return job_id
+
+    def submit_many(self, documents: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Поставить в очередь генерацию для нескольких записей: {doc_id: job_id}"""
+        return {str(data.get('ID', 'unknown')): self.submit(data) for data in documents}
+
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        return self.store.get(job_id)
+
+    def _run(self, job_id: str, doc_id: str, data: Dict[str, Any]) -> None:
+        self.store.update(job_id, JOB_PROCESSING)
+        try:
+            result = self.constructor.request_generation(data)
+        except requests.RequestException as e:
+            self.constructor._log_generation_error(doc_id, e)
+            self.store.update(job_id, JOB_ERROR, error=str(e))
+            return
+        except Exception as e:
+            # Задание не должно навсегда остаться в статусе processing
+            logger.exception("Generation job %s failed for Doc ID: %s", job_id, doc_id)
+            self.store.update(job_id, JOB_ERROR, error=str(e))
+            return
+        self.store.update(job_id, JOB_SUCCESS, result=result)
+        logger.info("Generation job %s finished for Doc ID: %s", job_id, doc_id)
+
+
+_job_queue: Optional[GenerationJobQueue] = None
+_job_queue_lock = threading.Lock()
+
+
+def get_generation_job_queue() -> GenerationJobQueue:
+    """Получить общую для всех сессий очередь генерации"""
+    global _job_queue
+    if _job_queue is None:
+        with _job_queue_lock:
+            if _job_queue is None:
+                store = GenerationJobStore(
+                    config.get('generation_jobs_db')
+                    or os.path.join(tempfile.gettempdir(), 'fsa_generation_jobs.sqlite3')
+                )
+                heartbeat_interval = float(config.get('generation_job_heartbeat_interval', 10))
+                stale_after = float(config.get('generation_job_stale_after', 3 * heartbeat_interval))
+                # Задания других живых процессов с той же базой не затрагиваются
+                interrupted = store.fail_unfinished(INTERRUPTED_ERROR, stale_after)
+                if interrupted:
+                    logger.warning("Marked %d interrupted generation jobs as failed", interrupted)
+                store.purge(float(config.get('generation_jobs_retention', 7 * 24 * 60 * 60)))
+                _job_queue = GenerationJobQueue(
+                    store, max_workers=int(config.get('generation_concurrency', 4)),
+                    heartbeat_interval=heartbeat_interval, stale_after=stale_after
+                )
+    return _job_queue
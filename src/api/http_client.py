@@ -0,0 +1,155 @@
+import logging
+import random
+import threading
+import time
+from typing import Any, Optional, Set
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config.config import Config, load_config
+from src.api.circuit_breaker import CircuitOpenError, get_circuit_breaker
+from src.utils.metrics import HTTP_IN_FLIGHT, HTTP_LATENCY, HTTP_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+config = load_config()
+
+# Статусы, при которых идемпотентный запрос повторяется
+RETRY_STATUSES = (502, 503, 504)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Задержка перед повтором attempt (с 1): экспонента с «полным» джиттером"""
+    factor = float(config.get('retry_backoff_factor', 0.5))
+    limit = float(config.get('retry_backoff_max', 10))
+    return random.uniform(0, min(limit, factor * (2 ** (attempt - 1))))
+
+
+# Настройки, при изменении которых в config.json сессия пересоздаётся с новым пулом
+SESSION_KEYS = frozenset({
+    'pool_connections', 'pool_maxsize', 'pool_block', 'max_retries',
+    'retry_backoff_factor', 'retry_backoff_max', 'connect_timeout', 'timeout',
+})
+
+
+class HttpClient:
+    """Общая HTTP-сессия с пулом keep-alive соединений для всех запросов к API"""
+    _instance = None
+    _lock = threading.Lock()
+
+    def __init__(self):
+        self._configure()
+        self.session = self._create_session()
+
+    def _configure(self) -> None:
+        self.pool_connections = int(config.get('pool_connections', 10))
+        self.pool_maxsize = int(config.get('pool_maxsize', 20))
+        # (connect, read) — зависший бэкенд не должен держать поток Streamlit бесконечно
+        self.timeout = (float(config.get('connect_timeout', 5)), float(config.get('timeout', 30)))
+
+    def _on_config_reload(self, changed: Set[str]) -> None:
+        """
+        Пересоздать сессию с новыми размерами пула, повторами и таймаутами без перезапуска.
+
+        Запросы, уже выполняющиеся в старой сессии, завершаются: при закрытии пула urllib3
+        закрывает только простаивающие соединения, занятые закрываются при возврате.
+        """
+        if not changed & SESSION_KEYS:
+            return
+        self._configure()
+        previous, self.session = self.session, self._create_session()
+        previous.close()
+        logger.info(
+            "HTTP session recreated: pool_connections=%s, pool_maxsize=%s, timeout=%s",
+            self.pool_connections, self.pool_maxsize, self.timeout
+        )
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        retry = Retry(
+            total=int(config.get('max_retries', 3)),
+            # Повторяем только идемпотентные запросы; POST повторяется лишь при ошибке соединения
+            allowed_methods=frozenset({'GET', 'HEAD'}),
+            status_forcelist=RETRY_STATUSES,
+            backoff_factor=float(config.get('retry_backoff_factor', 0.5)),
+            backoff_max=float(config.get('retry_backoff_max', 10)),
+            backoff_jitter=float(config.get('retry_backoff_factor', 0.5)),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=config.get('pool_block', False),
+            max_retries=retry
+        )
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    @classmethod
+    def get_instance(cls) -> 'HttpClient':
+        """Получить общий экземпляр клиента (живёт между перезапусками скрипта и сессиями)"""
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+                    Config.get_instance().add_reload_listener(cls._instance._on_config_reload)
+        return cls._instance
+
+    def request(self, method: str, url: str, endpoint: Optional[str] = None, **kwargs: Any) -> requests.Response:
+        """
+        Выполнить запрос через пул соединений.
+
+        Args:
+            method: HTTP-метод
+            url: полный URL
+            endpoint: имя автомата отключения (по умолчанию — хост из URL)
+            **kwargs: параметры requests; timeout по умолчанию берётся из config.json
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        name = endpoint or urlsplit(url).netloc
+        breaker = get_circuit_breaker(name)
+        try:
+            breaker.before_request()
+        except CircuitOpenError:
+            HTTP_REQUESTS.inc(endpoint=name, method=method, status='circuit_open')
+            raise
+
+        HTTP_IN_FLIGHT.inc(endpoint=name)
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception:
+            # Любая ошибка запроса записывается, иначе пробный запрос полуоткрытого автомата
+            # остался бы без результата
+            breaker.record_failure()
+            HTTP_REQUESTS.inc(endpoint=name, method=method, status='error')
+            raise
+        finally:
+            # Для stream=True — время до получения заголовков ответа
+            HTTP_LATENCY.observe(time.perf_counter() - started, endpoint=name)
+            HTTP_IN_FLIGHT.dec(endpoint=name)
+
+        HTTP_REQUESTS.inc(endpoint=name, method=method, status=str(response.status_code))
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def get(self, url: str, params: Optional[dict] = None, **kwargs: Any) -> requests.Response:
+        return self.request('GET', url, params=params, **kwargs)
+
+    def post(self, url: str, data: Any = None, json: Any = None, **kwargs: Any) -> requests.Response:
+        return self.request('POST', url, data=data, json=json, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def get_http_client() -> HttpClient:
+    """Получить общий HTTP-клиент"""
+    return HttpClient.get_instance()
@@ -0,0 +1,303 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from config.config import load_config
+from src.api.response_cache import make_cache_key
+from src.utils.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+config = load_config()
+
+# Параметры формы поиска -> колонка полнотекстового индекса.
+# Параметры без отдельной колонки (страна, материалы и т.п.) ищутся по всему тексту записи.
+_FTS_COLUMNS = {
+    'rn': 'rn',
+    'manufacturer': 'manufacturer',
+    'brand': 'brand',
+    'applicant': 'applicant',
+    'product_name': 'product_name',
+    'tnved': 'tnveds',
+    'country': 'content',
+    'branchCountry': 'content',
+    'materials': 'content',
+    'genders': 'content',
+    'q': 'content',
+}
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def _text_values(value: Any) -> Iterable[str]:
+    """Все строковые и числовые значения вложенной структуры"""
+    if isinstance(value, dict):
+        for item in value.values():
+            yield from _text_values(item)
+    elif isinstance(value, list):
+        for item in value:
+            yield from _text_values(item)
+    elif isinstance(value, (str, int, float)) and not isinstance(value, bool):
+        yield str(value)
+
+
+def _join(value: Any) -> str:
+    if isinstance(value, list):
+        return ' '.join(str(item) for item in value if item is not None)
+    return '' if value is None else str(value)
+
+
+def _match_expression(params: Dict[str, Any]) -> Optional[str]:
+    """
+    Выражение MATCH FTS5 для параметров формы поиска.
+
+    Каждое слово значения ищется как префикс в своей колонке, все условия объединяются через AND.
+    """
+    terms = []
+    for key, value in params.items():
+        column = _FTS_COLUMNS.get(key)
+        if column is None or not value:
+            continue
+        for word in _WORD_RE.findall(str(value)):
+            terms.append(f'{column}:"{word}"*')
+    return ' AND '.join(terms) if terms else None
+
+
+class LocalIndex:
+    """
+    Локальный индекс полученных документов (SQLite + FTS5).
+
+    Хранит элементы ответов поиска и детальную информацию, а также журнал запросов:
+    повторный поиск с теми же параметрами и страницей отвечается локально, пока
+    запись журнала моложе max_age. Офлайн-поиск (search_offline) фильтрует все
+    сохранённые документы приблизительно — только по тому, что уже есть в индексе.
+    """
+
+    def __init__(self, path: str, max_age: float):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                id TEXT PRIMARY KEY,
+                doc_type TEXT,
+                item TEXT,
+                item_fetched_at REAL,
+                details TEXT,
+                details_type TEXT,
+                details_fetched_at REAL
+            );
+            CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+                id UNINDEXED, rn, manufacturer, brand, applicant, product_name, tnveds, content,
+                tokenize = 'unicode61 remove_diacritics 2'
+            );
+            CREATE TABLE IF NOT EXISTS query_log (
+                query_key TEXT PRIMARY KEY,
+                meta TEXT,
+                fetched_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS query_log_items (
+                query_key TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                doc_id TEXT NOT NULL,
+                PRIMARY KEY (query_key, position)
+            );
+            CREATE INDEX IF NOT EXISTS query_log_items_doc ON query_log_items (doc_id);
+            """
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def query_key(params: Dict[str, Any], page: int, page_size: int) -> str:
+        # Индекс общий для пользователей: токен в ключ не входит
+        return make_cache_key('search', {**params, 'page': page, 'pageSize': page_size}, None)
+
+    def _fresh(self, fetched_at: Optional[float], max_age: Optional[float]) -> bool:
+        max_age = self.max_age if max_age is None else max_age
+        return fetched_at is not None and time.time() - fetched_at <= max_age
+
+    def search(self, params: Dict[str, Any], page: int, page_size: int,
+               max_age: Optional[float] = None) -> Optional[Any]:
+        """
+        Ответ на повторный поиск из индекса.
+
+        Returns:
+            ответ в формате API или None, если такого запроса не было или он устарел
+        """
+        key = self.query_key(params, page, page_size)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT meta, fetched_at FROM query_log WHERE query_key = ?", (key,)
+            ).fetchone()
+            if row is None or not self._fresh(row[1], max_age):
+                record_cache_lookup('local_index', False)
+                return None
+            items = self._connection.execute(
+                "SELECT d.item FROM query_log_items q JOIN documents d ON d.id = q.doc_id "
+                "WHERE q.query_key = ? ORDER BY q.position",
+                (key,)
+            ).fetchall()
+
+        record_cache_lookup('local_index', True)
+        items = [json.loads(item) for (item,) in items if item is not None]
+        meta = json.loads(row[0]) if row[0] is not None else None
+        if meta is None:
+            return items
+        return {**meta, 'items': items}
+
+    def record_search(self, params: Dict[str, Any], page: int, page_size: int, result: Any) -> None:
+        """Сохранить ответ поиска: элементы — в документы, порядок — в журнал запросов"""
+        if isinstance(result, dict):
+            items = result.get('items') or []
+            meta = json.dumps({k: v for k, v in result.items() if k != 'items'}, ensure_ascii=False)
+        elif isinstance(result, list):
+            items, meta = result, None
+        else:
+            return
+
+        key = self.query_key(params, page, page_size)
+        now = time.time()
+        items = [item for item in items if isinstance(item, dict) and 'ID' in item]
+        with self._lock, self._connection:
+            for item in items:
+                self._upsert_item_locked(item, now)
+            self._connection.execute("DELETE FROM query_log_items WHERE query_key = ?", (key,))
+            self._connection.executemany(
+                "INSERT INTO query_log_items (query_key, position, doc_id) VALUES (?, ?, ?)",
+                [(key, position, str(item['ID'])) for position, item in enumerate(items)]
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO query_log (query_key, meta, fetched_at) VALUES (?, ?, ?)",
+                (key, meta, now)
+            )
+
+    def _upsert_item_locked(self, item: Dict[str, Any], now: float) -> None:
+        doc_id = str(item['ID'])
+        manufacturer = item.get('Manufacturer') if isinstance(item.get('Manufacturer'), dict) else {}
+        product = item.get('Product') if isinstance(item.get('Product'), dict) else {}
+        self._connection.execute(
+            "INSERT INTO documents (id, doc_type, item, item_fetched_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET doc_type = excluded.doc_type, item = excluded.item, "
+            "item_fetched_at = excluded.item_fetched_at",
+            (doc_id, item.get('Type'), json.dumps(item, ensure_ascii=False), now)
+        )
+        self._connection.execute("DELETE FROM documents_fts WHERE id = ?", (doc_id,))
+        self._connection.execute(
+            "INSERT INTO documents_fts (id, rn, manufacturer, brand, applicant, product_name, tnveds, content) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                doc_id, _join(item.get('Number')), _join(manufacturer.get('Name')), _join(item.get('Brand')),
+                _join(item.get('Applicant')), _join(product.get('Name')), _join(product.get('Tnveds')),
+                ' '.join(_text_values(item)),
+            )
+        )
+
+    def get_details(self, doc_id: Any, doc_type: str, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT details, details_fetched_at FROM documents WHERE id = ? AND details_type = ?",
+                (str(doc_id), doc_type)
+            ).fetchone()
+        hit = row is not None and row[0] is not None and self._fresh(row[1], max_age)
+        record_cache_lookup('local_index', hit)
+        return json.loads(row[0]) if hit else None
+
+    def record_details(self, doc_id: Any, doc_type: str, details: Dict[str, Any]) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO documents (id, details, details_type, details_fetched_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET details = excluded.details, details_type = excluded.details_type, "
+                "details_fetched_at = excluded.details_fetched_at",
+                (str(doc_id), json.dumps(details, ensure_ascii=False), doc_type, time.time())
+            )
+
+    def invalidate(self, doc_id: Any) -> None:
+        """Документ изменился на бэкенде: убрать детали и запросы, в ответы которых он входил"""
+        doc_id = str(doc_id)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE documents SET details = NULL, details_fetched_at = NULL WHERE id = ?", (doc_id,)
+            )
+            self._connection.execute(
+                "DELETE FROM query_log WHERE query_key IN "
+                "(SELECT query_key FROM query_log_items WHERE doc_id = ?)",
+                (doc_id,)
+            )
+            self._connection.execute(
+                "DELETE FROM query_log_items WHERE query_key NOT IN (SELECT query_key FROM query_log)"
+            )
+
+    def search_offline(self, params: Dict[str, Any], page: int = 0, page_size: int = 20) -> Dict[str, Any]:
+        """
+        Поиск по всем сохранённым документам без обращения к API.
+
+        Фильтры применяются приблизительно (по префиксам слов), а результат
+        содержит только документы, уже попавшие в индекс.
+        """
+        conditions, args = [], []
+        expression = _match_expression(params)
+        if expression:
+            conditions.append("d.id IN (SELECT id FROM documents_fts WHERE documents_fts MATCH ?)")
+            args.append(expression)
+        if params.get('t'):
+            conditions.append("d.doc_type = ?")
+            args.append(params['t'])
+        where = ' AND '.join(["d.item IS NOT NULL", *conditions])
+
+        with self._lock:
+            total = self._connection.execute(f"SELECT COUNT(*) FROM documents d WHERE {where}", args).fetchone()[0]
+            rows = self._connection.execute(
+                f"SELECT d.item FROM documents d WHERE {where} ORDER BY d.item_fetched_at DESC LIMIT ? OFFSET ?",
+                [*args, page_size, page * page_size]
+            ).fetchall()
+
+        return {
+            'items': [json.loads(item) for (item,) in rows],
+            'total': total,
+            'totalPages': max(1, -(-total // page_size)),
+        }
+
+    def stats(self) -> Tuple[int, int, int]:
+        """(документов с элементом поиска, документов с деталями, запросов в журнале)"""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT (SELECT COUNT(*) FROM documents WHERE item IS NOT NULL), "
+                "(SELECT COUNT(*) FROM documents WHERE details IS NOT NULL), "
+                "(SELECT COUNT(*) FROM query_log)"
+            ).fetchone()
+
+
+_local_index: Optional[LocalIndex] = None
+_local_index_lock = threading.Lock()
+
+
+def get_local_index() -> Optional[LocalIndex]:
+    """
+    Общий локальный индекс или None, если он выключен (local_index_enabled в config.json).
+
+    Настройки перечитываются при каждом вызове, поэтому после перезагрузки config.json
+    индекс включается, выключается или открывается по новому пути без перезапуска.
+    """
+    global _local_index
+    if not config.get('local_index_enabled', False):
+        return None
+    path = config.get('local_index_path') or os.path.join(tempfile.gettempdir(), 'fsa_local_index.sqlite3')
+    max_age = float(config.get('local_index_max_age', 24 * 60 * 60))
+    index = _local_index
+    if index is None or index.path != path:
+        with _local_index_lock:
+            if _local_index is None or _local_index.path != path:
+                # Прежний индекс закрывается сборщиком мусора, когда его перестанут использовать
+                _local_index = LocalIndex(path, max_age=max_age)
+            index = _local_index
+    index.max_age = max_age
+    return index
@@ -0,0 +1,99 @@
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from config.config import load_config
+from src.api.client import FSAClient, get_fsa_client
+from src.api.exceptions import FSAApiError
+from src.api.response_cache import make_cache_key
+
+logger = logging.getLogger(__name__)
+
+config = load_config()
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Общий для всех сессий пул фоновой предзагрузки"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=int(config.get('prefetch_workers', 2)),
+                    thread_name_prefix='search-prefetch'
+                )
+    return _executor
+
+
+class SearchPrefetcher:
+    """
+    Фоновая предзагрузка соседних страниц поиска в кэш ответов.
+
+    Экземпляр хранится в сессии пользователя. При смене параметров поиска
+    ещё не начатые загрузки отменяются; уже выполняющийся запрос завершается,
+    но его ответ попадает в кэш только под ключом прежнего поиска.
+    """
+
+    def __init__(self, client: Optional[FSAClient] = None):
+        self.client = client
+        self._search_key: Optional[str] = None
+        self._pending: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+
+    def schedule(self, params: Dict[str, Any], page: int, total_pages: int, page_size: int,
+                 token: Optional[str], include_previous: bool = False) -> None:
+        """
+        Запланировать загрузку страницы page + 1 (и page - 1 при include_previous).
+
+        Args:
+            params: параметры поиска без page/pageSize
+            page: номер только что показанной страницы (с нуля)
+            total_pages: общее число страниц из ответа поиска
+            page_size: размер страницы, с которым вызывается search_fsa
+            token: токен пользователя (читается в основном потоке)
+            include_previous: загружать также предыдущую страницу
+        """
+        search_key = make_cache_key('search', {**params, 'pageSize': page_size}, token)
+        pages = [page + 1]
+        if include_previous:
+            pages.append(page - 1)
+
+        with self._lock:
+            if search_key != self._search_key:
+                self._cancel_locked()
+                self._search_key = search_key
+
+            for target in pages:
+                if not 0 <= target < total_pages:
+                    continue
+                future = self._pending.get(target)
+                if future is not None and not future.done():
+                    continue
+                self._pending[target] = _get_executor().submit(
+                    self._prefetch, search_key, dict(params), target, page_size, token
+                )
+
+    def cancel(self) -> None:
+        """Отменить все запланированные загрузки"""
+        with self._lock:
+            self._cancel_locked()
+            self._search_key = None
+
+    def _cancel_locked(self) -> None:
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+    def _prefetch(self, search_key: str, params: Dict[str, Any], page: int,
+                  page_size: int, token: Optional[str]) -> None:
+        if self._search_key != search_key:
+            return
+        try:
+            (self.client or get_fsa_client()).search(params, page, page_size, token=token)
+            logger.debug("Prefetched search page %d", page)
+        except FSAApiError as e:
+            logger.debug("Prefetch of search page %d failed: %s", page, e)
@@ -0,0 +1,135 @@
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, NamedTuple, Optional, Tuple
+
+# Статусы, которыми завершается запрос (после 'processing')
+FINISHED_STATUSES = ('success', 'error')
+
+
+class RequestRecord(NamedTuple):
+    doc_id: str
+    request_type: str
+    status: str
+    timestamp: str
+    # Длительность запроса в секундах (для завершающих статусов, если известен старт)
+    duration: Optional[float]
+    recorded_at: float
+
+
+class _TypeStats:
+    __slots__ = ('finished', 'errors', 'total_duration', 'max_duration', 'timed')
+
+    def __init__(self):
+        self.finished = 0
+        self.errors = 0
+        self.total_duration = 0.0
+        self.max_duration = 0.0
+        self.timed = 0
+
+
+class RequestHistory:
+    """
+    История запросов конструктора документов.
+
+    Записи хранятся в deque ограниченной длины, а последний статус каждого
+    типа запроса по документу — в индексе {doc_id: {request_type: запись}},
+    поэтому статус документа читается без просмотра всей истории.
+    Агрегированная статистика (число запросов, доля ошибок, длительность)
+    ведётся по типам запросов за всё время жизни объекта.
+    """
+
+    def __init__(self, max_size: int = 100, max_age: Optional[float] = None):
+        self.max_size = max_size
+        self.max_age = max_age
+        self._records: Deque[RequestRecord] = deque()
+        self._latest: Dict[str, Dict[str, RequestRecord]] = {}
+        self._started: Dict[Tuple[str, str], float] = {}
+        self._stats: Dict[str, _TypeStats] = {}
+        self._lock = threading.Lock()
+
+    def add(self, doc_id: str, request_type: str, status: str) -> RequestRecord:
+        now = time.monotonic()
+        with self._lock:
+            duration = None
+            if status == 'processing':
+                self._started[(doc_id, request_type)] = now
+            elif status in FINISHED_STATUSES:
+                started = self._started.pop((doc_id, request_type), None)
+                if started is not None:
+                    duration = now - started
+                self._update_stats(request_type, status, duration)
+
+            record = RequestRecord(doc_id, request_type, status, datetime.now().isoformat(), duration, now)
+            self._records.append(record)
+            self._latest.setdefault(doc_id, {})[request_type] = record
+            self._trim_locked(now)
+        return record
+
+    def _update_stats(self, request_type: str, status: str, duration: Optional[float]) -> None:
+        stats = self._stats.get(request_type)
+        if stats is None:
+            stats = self._stats[request_type] = _TypeStats()
+        stats.finished += 1
+        if status == 'error':
+            stats.errors += 1
+        if duration is not None:
+            stats.timed += 1
+            stats.total_duration += duration
+            stats.max_duration = max(stats.max_duration, duration)
+
+    def _trim_locked(self, now: float) -> None:
+        while self._records and (
+            len(self._records) > self.max_size
+            or (self.max_age is not None and now - self._records[0].recorded_at > self.max_age)
+        ):
+            self._forget_locked(self._records.popleft())
+
+    def _forget_locked(self, record: RequestRecord) -> None:
+        # Запрос без завершающего статуса (потерянное задание, переподключение)
+        # не должен навсегда остаться в _started
+        key = (record.doc_id, record.request_type)
+        if record.status == 'processing' and self._started.get(key) == record.recorded_at:
+            del self._started[key]
+        # Из индекса удаляется только запись, которая всё ещё является последней
+        by_type = self._latest.get(record.doc_id)
+        if by_type is None or by_type.get(record.request_type) is not record:
+            return
+        del by_type[record.request_type]
+        if not by_type:
+            del self._latest[record.doc_id]
+
+    def status(self, doc_id: str) -> Dict[str, str]:
+        """Последний статус каждого типа запроса по документу"""
+        with self._lock:
+            if self.max_age is not None:
+                self._trim_locked(time.monotonic())
+            by_type = self._latest.get(doc_id)
+            if not by_type:
+                return {}
+            return {request_type: record.status for request_type, record in by_type.items()}
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Статистика по типам запросов.
+
+        Returns:
+            {request_type: {'count', 'errors', 'error_rate', 'avg_duration', 'max_duration'}},
+            длительности в секундах
+        """
+        with self._lock:
+            return {
+                request_type: {
+                    'count': stats.finished,
+                    'errors': stats.errors,
+                    'error_rate': stats.errors / stats.finished if stats.finished else 0.0,
+                    'avg_duration': stats.total_duration / stats.timed if stats.timed else 0.0,
+                    'max_duration': stats.max_duration,
+                }
+                for request_type, stats in self._stats.items()
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
@@ -0,0 +1,133 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Set
+
+from config.config import load_config
+from src.utils.metrics import record_cache_lookup
+
+config = load_config()
+
+
+class _CacheEntry(NamedTuple):
+    content: bytes
+    expires_at: float
+    tags: frozenset
+
+
+def make_cache_key(endpoint: str, params: Optional[Dict[str, Any]] = None, token: Optional[str] = None) -> str:
+    """
+    Формирует ключ кэша из эндпоинта, нормализованных параметров и области токена.
+
+    Пустые значения параметров отбрасываются, ключи сортируются, поэтому
+    {'rn': 'X', 'q': ''} и {'rn': 'X'} дают один и тот же ключ. Сам токен в ключ
+    не попадает — только его хэш, чтобы ответы разных пользователей не смешивались.
+    """
+    normalized = sorted(
+        (str(k), str(v)) for k, v in (params or {}).items()
+        if v is not None and v != ''
+    )
+    scope = hashlib.sha256(token.encode('utf-8')).hexdigest()[:16] if token else 'anonymous'
+    return json.dumps([endpoint, normalized, scope], ensure_ascii=False)
+
+
+class ResponseCache:
+    """Потокобезопасный кэш сырых ответов API с TTL и LRU-вытеснением по размеру в байтах"""
+
+    def __init__(self, ttl: float, max_bytes: int):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[str, _CacheEntry]' = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Получить содержимое по ключу или None, если записи нет или она устарела"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        record_cache_lookup('response', entry is not None)
+        return entry.content if entry is not None else None
+
+    def set(self, key: str, content: bytes, tags: Iterable[Any] = ()) -> None:
+        """Сохранить содержимое; tags — идентификаторы документов для точечной инвалидации"""
+        size = len(content)
+        if self.ttl <= 0 or size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            entry = _CacheEntry(content, time.monotonic() + self.ttl, frozenset(str(tag) for tag in tags))
+            self._entries[key] = entry
+            self._size += size
+            for tag in entry.tags:
+                self._tags.setdefault(tag, set()).add(key)
+
+            while self._size > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+
+    def invalidate_tag(self, tag: Any) -> int:
+        """Удалить все записи, связанные с документом; возвращает число удалённых записей"""
+        with self._lock:
+            keys = self._tags.pop(str(tag), set())
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+            self._size = 0
+
+    @property
+    def size(self) -> int:
+        """Текущий суммарный размер записей в байтах"""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._size -= len(entry.content)
+        for tag in entry.tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Получить общий для процесса кэш ответов"""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache(
+                    ttl=float(config.get('cache_ttl', 300)),
+                    max_bytes=int(config.get('cache_max_bytes', 64 * 1024 * 1024))
+                )
+    return _response_cache
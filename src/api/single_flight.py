@@ -0,0 +1,88 @@
+import asyncio
+import threading
+from typing import Awaitable, Callable, Dict, Generic, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+
+class _Call(Generic[T]):
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[T] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Объединение одинаковых одновременных вызовов.
+
+    Пока вызов с ключом key выполняется, остальные вызовы с тем же ключом
+    не обращаются к бэкенду, а ждут и получают тот же результат (или ту же ошибку).
+    После завершения ключ освобождается: повторный вызов выполнится заново
+    (к тому моменту ответ обычно уже лежит в кэше).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Выполнить fn или дождаться уже выполняющегося вызова с тем же ключом.
+
+        Returns:
+            (результат, shared): shared=True, если результат получен от чужого вызова.
+            Общий результат не должен изменяться вызывающими.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    Асинхронный вариант SingleFlight для одного цикла событий.
+
+    Вызов выполняется отдельной задачей: отмена одного из ожидающих
+    не прерывает запрос для остальных.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        task = self._tasks.get(key)
+        shared = task is not None
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task), shared
+
+    def in_flight(self) -> int:
+        return len(self._tasks)
@@ -0,0 +1,13 @@
+"""
+Аутентификация.
+
+authenticator (Streamlit) импортируется лениво: фоновые задачи и CLI используют
+src.auth.jwt_authenticator без загрузки Streamlit.
+"""
+
+
+def __getattr__(name):
+    if name in ('authenticator', 'Authenticator'):
+        from src.auth import streamlit_authenticator
+        return getattr(streamlit_authenticator, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,31 +1,52 @@
-from abc import ABC, abstractmethod
+from typing import Callable, Optional, TypeVar
+
+from src.api.exceptions import FSAApiError
+from src.auth.base_authenticator import BaseAuthenticator
+from src.auth.token_manager import TokenManager
+
+T = TypeVar('T')
 
-class BaseAuthenticator(ABC):
-    @abstractmethod
-    def login(self, credentials: dict) -> bool:
-        pass
-    
-    @abstractmethod
-    def logout(self) -> None:
-        pass
-    
-    @abstractmethod
-    def is_authenticated(self) -> bool:
-        pass
-    
-    @abstractmethod
-    def get_token(self) -> str:
-        pass
 
 class JWTAuthenticator(BaseAuthenticator):
-    def __init__(self, auth_url: str, token_field: str = "access"):
+    """
+    JWT-аутентификация без Streamlit — для CLI, фоновых задач и рабочих потоков.
+
+    Учётные данные запоминаются, поэтому при отсутствии refresh-токена
+    истекающий токен обновляется повторным входом без участия пользователя.
+    Один экземпляр можно разделять между потоками.
+    """
+
+    def __init__(self, auth_url: str, token_field: str = "access",
+                 refresh_url: Optional[str] = None, refresh_field: str = "refresh",
+                 refresh_margin: float = 300):
         self.auth_url = auth_url
         self.token_field = token_field
-        
+        self.tokens = TokenManager(
+            auth_url, refresh_url=refresh_url, token_field=token_field,
+            refresh_field=refresh_field, refresh_margin=refresh_margin
+        )
+
     def login(self, credentials: dict) -> bool:
-        # Реализация JWT авторизации
-        pass
+        try:
+            self.tokens.login(credentials['username'], credentials['password'], remember_credentials=True)
+            return True
+        except FSAApiError:
+            return False
+
+    def logout(self) -> None:
+        self.tokens.clear()
+
+    def is_authenticated(self) -> bool:
+        return self.tokens.is_valid() or self.tokens.can_refresh()
+
+    def get_token(self) -> str:
+        return self.tokens.get_token()
+
+    def call_with_token(self, fn: Callable[[Optional[str]], T]) -> T:
+        """Вызвать fn(token) с повтором после обновления токена при ответе 401"""
+        return self.tokens.call_with_token(fn)
+
 
 class OAuth2Authenticator(BaseAuthenticator):
     # Реализация OAuth2 авторизации
-    pass 
\ No newline at end of file
+    pass 
@@ -0,0 +1,134 @@
+import streamlit as st
+from datetime import datetime
+from typing import Callable, Optional, TypeVar
+from config.config import load_config
+from src.api.exceptions import ApiConnectionError, FSAApiError
+from src.auth.token_manager import TokenManager
+
+config = load_config()
+
+T = TypeVar('T')
+
+
+class Authenticator:
+    def __init__(self):
+        self.token_key = "jwt_token"
+        self.token_expiry_key = "jwt_token_expiry"
+        self.token_manager_key = "jwt_token_manager"
+
+    @property
+    def api_url(self) -> str:
+        # Читается при обращении: модуль создаёт authenticator при импорте, не загружая config.json
+        return config['auth_url']
+
+    def _token_manager(self) -> TokenManager:
+        """Токены текущей сессии (пароль в сессии не хранится — обновление только по refresh-токену)"""
+        manager = st.session_state.get(self.token_manager_key)
+        if manager is None:
+            manager = TokenManager(
+                self.api_url,
+                refresh_url=config.get('auth_refresh_url'),
+                refresh_margin=float(config.get('token_refresh_margin', 300))
+            )
+            st.session_state[self.token_manager_key] = manager
+        return manager
+
+    def _sync_session_state(self, manager: TokenManager):
+        st.session_state[self.token_key] = manager.token
+        st.session_state[self.token_expiry_key] = manager.expires_at
+
+    def login(self):
+        st.subheader("Вход в систему")
+        username = st.text_input("Имя пользователя")
+        password = st.text_input("Пароль", type="password")
+
+        if st.button("Войти"):
+            with st.spinner('Выполняется вход в систему...'):
+                manager = self._token_manager()
+                try:
+                    manager.login(username, password)
+                    self._sync_session_state(manager)
+                    st.session_state["authentication_status"] = True
+                    st.success("Вход выполнен успешно!")
+                    st.rerun()
+                except ApiConnectionError as e:
+                    st.error(f"Ошибка при отправке запроса: {str(e)}")
+                except FSAApiError as e:
+                    st.error(str(e))
+
+    def logout(self):
+        if st.button("Выйти"):
+            self._token_manager().clear()
+            st.session_state[self.token_key] = None
+            st.session_state[self.token_expiry_key] = None
+            st.session_state["authentication_status"] = False
+            st.rerun()
+
+    def is_authenticated(self):
+        if st.session_state.get("authentication_status", False):
+            manager = self._token_manager()
+            # get_token заранее обновляет истекающий токен, если есть refresh-токен
+            manager.get_token()
+            self._sync_session_state(manager)
+            expiry = st.session_state.get(self.token_expiry_key)
+            if expiry and expiry > datetime.now():
+                return True
+            else:
+                manager.clear()
+                st.session_state["authentication_status"] = False
+                st.session_state[self.token_key] = None
+                st.session_state[self.token_expiry_key] = None
+        return False
+
+    def get_token(self):
+        return self._token_manager().get_token()
+
+    def refresh_token(self) -> str:
+        """
+        Принудительно обновить токен (после ответа 401).
+
+        Raises:
+            AuthenticationError: обновление невозможно
+        """
+        manager = self._token_manager()
+        try:
+            return manager.refresh(stale_token=manager.token)
+        finally:
+            self._sync_session_state(manager)
+
+    def call_with_token(self, fn: Callable[[Optional[str]], T]) -> T:
+        """
+        Вызвать fn(token); при ответе 401 обновить токен и повторить один раз.
+
+        Токен читается в основном потоке сессии, fn может передавать его рабочим потокам.
+
+        Raises:
+            AuthenticationError: токен не удалось обновить или повтор тоже получил 401
+        """
+        manager = self._token_manager()
+        try:
+            return manager.call_with_token(fn)
+        finally:
+            self._sync_session_state(manager)
+
+    def login_required(self, func):
+        def wrapper(*args, **kwargs):
+            if self.is_authenticated():
+                return func(*args, **kwargs)
+            else:
+                st.warning("Пожалуйста, выполните вход для доступа к этой странице.")
+                self.login()
+
+        return wrapper
+
+
+authenticator = Authenticator()
+
+
+# # Пример использования декоратора login_required
+# @authenticator.login_required
+# def protected_function():
+#     st.write("Это защищенная функция, доступная только аутентифицированным пользователям.")
+#
+# # Если вам нужно использовать аутентификацию в другом файле, вы можете импортировать authenticator:
+# # from src.auth import authenticator
\ No newline at end of file
@@ -0,0 +1,204 @@
+import base64
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import requests
+
+from src.api.exceptions import ApiConnectionError, AuthenticationError, raise_for_status
+from src.api.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Срок жизни токена, если в нём нет поля exp (прежнее фиксированное значение)
+DEFAULT_TOKEN_LIFETIME = timedelta(hours=72)
+
+
+def decode_jwt_expiry(token: str) -> Optional[datetime]:
+    """
+    Срок действия JWT из поля exp полезной нагрузки.
+
+    Подпись не проверяется: значение нужно только для планирования обновления,
+    проверку токена выполняет бэкенд.
+
+    Returns:
+        Optional[datetime]: локальное время истечения или None, если exp не удалось прочитать
+    """
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get('exp')
+        return datetime.fromtimestamp(float(exp)) if exp is not None else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
+
+
+class TokenManager:
+    """
+    Жизненный цикл JWT: получение, заблаговременное обновление и повтор запроса после 401.
+
+    Токен обновляется за refresh_margin секунд до истечения срока из поля exp:
+    через refresh_url (если бэкенд выдал refresh-токен) или повторным входом
+    с сохранёнными учётными данными. Экземпляр потокобезопасен и может быть общим
+    для нескольких рабочих потоков — одновременно выполняется только одно обновление.
+    """
+
+    def __init__(self, auth_url: str, refresh_url: Optional[str] = None,
+                 token_field: str = "access", refresh_field: str = "refresh",
+                 refresh_margin: float = 300):
+        self.auth_url = auth_url
+        self.refresh_url = refresh_url
+        self.token_field = token_field
+        self.refresh_field = refresh_field
+        self.refresh_margin = timedelta(seconds=refresh_margin)
+        self._lock = threading.Lock()
+        self._token: Optional[str] = None
+        self._refresh_token: Optional[str] = None
+        self._expires_at: Optional[datetime] = None
+        self._credentials: Optional[Dict[str, str]] = None
+
+    @property
+    def token(self) -> Optional[str]:
+        """Текущий токен без попытки обновления"""
+        return self._token
+
+    @property
+    def expires_at(self) -> Optional[datetime]:
+        return self._expires_at
+
+    def is_valid(self) -> bool:
+        return self._token is not None and self._expires_at is not None and self._expires_at > datetime.now()
+
+    def set_tokens(self, token: str, refresh_token: Optional[str] = None) -> None:
+        with self._lock:
+            self._set_tokens_locked(token, refresh_token)
+
+    def _set_tokens_locked(self, token: str, refresh_token: Optional[str]) -> None:
+        self._token = token
+        if refresh_token:
+            self._refresh_token = refresh_token
+        self._expires_at = decode_jwt_expiry(token) or datetime.now() + DEFAULT_TOKEN_LIFETIME
+        logger.info("Access token valid until %s", self._expires_at.isoformat(timespec='seconds'))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._token = None
+            self._refresh_token = None
+            self._expires_at = None
+            self._credentials = None
+
+    def login(self, username: str, password: str, remember_credentials: bool = False) -> str:
+        """
+        Получить токен по имени пользователя и паролю.
+
+        Args:
+            remember_credentials: сохранить учётные данные для повторного входа
+                при обновлении (для фоновых задач без refresh-токена)
+
+        Raises:
+            AuthenticationError: неверные учётные данные
+            FSAApiError: иной неуспешный ответ или сетевая ошибка
+        """
+        credentials = {"username": username, "password": password}
+        with self._lock:
+            data = self._post(self.auth_url, credentials, "Ошибка при входе")
+            self._set_tokens_locked(self._access_from(data), data.get(self.refresh_field))
+            if remember_credentials:
+                self._credentials = credentials
+            return self._token
+
+    def get_token(self) -> Optional[str]:
+        """Действующий токен; если срок истекает в пределах refresh_margin — сначала обновляет его"""
+        token = self._token
+        if token is not None and not self._expires_soon():
+            return token
+        if not self.can_refresh():
+            return token
+        try:
+            return self.refresh(stale_token=token)
+        except (AuthenticationError, ApiConnectionError) as e:
+            # Текущий токен ещё может действовать: бэкенд сам ответит 401, если нет
+            logger.warning("Proactive token refresh failed: %s", e)
+            return self._token
+
+    def can_refresh(self) -> bool:
+        return bool((self.refresh_url and self._refresh_token) or self._credentials)
+
+    def refresh(self, stale_token: Optional[str] = None) -> str:
+        """
+        Обновить токен.
+
+        Args:
+            stale_token: токен, который вызывающий считает устаревшим. Если другой
+                поток уже успел его заменить, повторного обращения к бэкенду не будет.
+
+        Raises:
+            AuthenticationError: обновить токен невозможно
+        """
+        with self._lock:
+            if stale_token is not None and self._token is not None and self._token != stale_token \
+                    and not self._expires_soon():
+                return self._token
+
+            if self.refresh_url and self._refresh_token:
+                try:
+                    data = self._post(self.refresh_url, {self.refresh_field: self._refresh_token},
+                                      "Ошибка при обновлении токена")
+                    self._set_tokens_locked(self._access_from(data), data.get(self.refresh_field))
+                    return self._token
+                except AuthenticationError:
+                    # refresh-токен истёк — пробуем войти заново, если есть учётные данные
+                    self._refresh_token = None
+                    if not self._credentials:
+                        raise
+
+            if self._credentials:
+                data = self._post(self.auth_url, self._credentials, "Ошибка при повторном входе")
+                self._set_tokens_locked(self._access_from(data), data.get(self.refresh_field))
+                return self._token
+
+        raise AuthenticationError("Токен истёк и не может быть обновлён", 401)
+
+    def call_with_token(self, fn: Callable[[Optional[str]], T]) -> T:
+        """
+        Вызвать fn(token); при AuthenticationError обновить токен и повторить один раз.
+
+        Raises:
+            AuthenticationError: повторный вызов тоже получил 401 или обновление невозможно
+        """
+        token = self.get_token()
+        try:
+            return fn(token)
+        except AuthenticationError:
+            if not self.can_refresh():
+                raise
+            logger.info("Request rejected with 401, refreshing token and retrying once")
+            return fn(self.refresh(stale_token=token))
+
+    def _expires_soon(self) -> bool:
+        return self._expires_at is None or self._expires_at - self.refresh_margin <= datetime.now()
+
+    def _access_from(self, data: Dict[str, Any]) -> str:
+        token = data.get(self.token_field)
+        if not token:
+            raise AuthenticationError("Токен отсутствует в ответе сервера")
+        return token
+
+    @staticmethod
+    def _post(url: str, payload: Dict[str, Any], error_message: str) -> Dict[str, Any]:
+        try:
+            response = get_http_client().post(url, json=payload, endpoint='auth')
+        except requests.RequestException as e:
+            raise ApiConnectionError(f"{error_message}: {e}") from e
+        # Неверные учётные данные или refresh-токен бэкенд может вернуть как 400
+        if response.status_code in (400, 403):
+            raise AuthenticationError(f"{error_message}: {response.status_code}", response.status_code)
+        raise_for_status(response.status_code, error_message)
+        try:
+            return response.json()
+        except ValueError as e:
+            raise AuthenticationError(f"{error_message}: некорректный ответ сервера") from e
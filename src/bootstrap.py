@@ -0,0 +1,57 @@
+"""
+Явная инициализация процесса: конфигурация, логирование и кодировка вывода.
+
+Модули проекта при импорте ничего не настраивают. Точки входа (fsa_search_app.py,
+fsa_cli.py, страницы Streamlit) вызывают bootstrap() до начала работы;
+повторные вызовы, например при каждом перезапуске скрипта Streamlit, ничего не делают.
+"""
+import logging
+import sys
+import threading
+from typing import Optional, TextIO
+
+from config.config import Config
+
+LOG_FORMAT = '%(asctime)s [%(levelname)s] %(message)s'
+LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_lock = threading.Lock()
+_initialized = False
+
+
+def _ensure_utf8_stdout() -> None:
+    """Вывод кириллицы в консоль с другой кодировкой по умолчанию (например, cp1251 в Windows)"""
+    encoding = (getattr(sys.stdout, 'encoding', None) or '').lower()
+    if encoding not in ('utf-8', 'utf8') and hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+
+
+def bootstrap(level: Optional[int] = None, stream: Optional[TextIO] = None) -> Config:
+    """
+    Загрузить конфигурацию и настроить логирование (один раз на процесс).
+
+    Ошибки config.json проявляются здесь, при старте, а не при первом обращении к настройке.
+
+    Args:
+        level: уровень корневого логгера (по умолчанию log_level из config.json или INFO)
+        stream: поток для журнала (по умолчанию stderr)
+
+    Returns:
+        Config: загруженная конфигурация
+    """
+    global _initialized
+    with _lock:
+        if not _initialized:
+            config = Config.get_instance()
+            _ensure_utf8_stdout()
+            logging.basicConfig(
+                level=level if level is not None else config.get('log_level', 'INFO'),
+                format=LOG_FORMAT,
+                datefmt=LOG_DATE_FORMAT,
+                stream=stream
+            )
+            # Изменения config.json применяются без перезапуска (кэши и сессии сохраняются)
+            if config.get('config_reload_interval'):
+                config.watch(float(config['config_reload_interval']))
+            _initialized = True
+    return Config.get_instance()
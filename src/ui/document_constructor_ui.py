@@ -1,13 +1,25 @@
+import time
 import streamlit as st
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Set
+from config.config import load_config
 from src.api.document_constructor import DocumentConstructor
+from src.api.generation_jobs import JOB_ERROR, JOB_QUEUED, JOB_SUCCESS, GenerationJob, get_generation_job_queue
+
+config = load_config()
+
 
 class DocumentConstructorUI:
     def __init__(self):
         self.constructor = DocumentConstructor()
+        self.jobs = get_generation_job_queue()
 
-    def display_request_status(self, doc_id: str):
+    def display_request_status(self, doc_id: str, poll_jobs: bool = True):
         """Отображение статуса запросов для документа"""
+        if poll_jobs:
+            job_id = self._active_job_id(doc_id)
+            if job_id:
+                self._poll_generation_job(doc_id, job_id)
+
         status = self.constructor.get_request_status(doc_id)
         if status:
             with st.expander("Статус запросов"):
@@ -19,50 +31,234 @@ class DocumentConstructorUI:
                     }.get(state, '❓')
                     st.write(f"{icon} {request_type}: {state}")
 
+    def display_request_stats(self):
+        """Сводка по запросам сессии: количество, доля ошибок, длительность"""
+        stats = self.constructor.get_request_stats()
+        if not stats:
+            return
+        with st.expander("Статистика запросов"):
+            for request_type, values in stats.items():
+                st.write(
+                    f"**{request_type}**: {values['count']} запросов, "
+                    f"ошибок {values['error_rate']:.0%}, "
+                    f"в среднем {values['avg_duration']:.2f} с, максимум {values['max_duration']:.2f} с"
+                )
+
+    def _active_job_id(self, doc_id: str) -> Optional[str]:
+        """
+        ID выполняющегося задания генерации для записи.
+
+        После переподключения сессия пуста, тогда задание находится по записи
+        в хранилище заданий: незавершённое продолжает опрашиваться, а результат
+        завершившегося, пока пользователь был отключён, восстанавливается в сессии.
+        """
+        active = st.session_state.setdefault('generation_jobs', {})
+        if doc_id in active:
+            return active[doc_id]
+        job = self.jobs.store.latest_for_doc(doc_id)
+        if job is None:
+            return None
+        if not job.finished:
+            active[doc_id] = job.job_id
+            return job.job_id
+        generated = st.session_state.get('generated_documents') or {}
+        if doc_id not in generated and doc_id not in st.session_state.get('generation_errors', {}):
+            self._apply_finished_job(doc_id, job)
+        return None
+
+    def _apply_finished_job(self, doc_id: str, job: Optional[GenerationJob]):
+        """Перенести результат или ошибку завершённого задания в состояние сессии"""
+        if job is not None and job.status == JOB_SUCCESS:
+            self._store_generated(doc_id, job.result)
+            self.constructor._add_to_request_history(doc_id, 'generate', 'success')
+        else:
+            error = job.error if job is not None else "задание не найдено"
+            st.session_state.setdefault('generation_errors', {})[doc_id] = error
+            self.constructor._add_to_request_history(doc_id, 'generate', JOB_ERROR)
+
+    def _poll_generation_job(self, doc_id: str, job_id: str):
+        """
+        Опрос задания генерации без перезапуска всей страницы.
+
+        Фрагмент создаётся при каждом вызове: интервал читается из текущей конфигурации
+        (а не при импорте модуля), идентификатор фрагмента от этого не меняется.
+        """
+        interval = float(config.get('generation_job_poll_interval', 2))
+        st.fragment(run_every=interval)(self._render_generation_job)(doc_id, job_id)
+
+    def _render_generation_job(self, doc_id: str, job_id: str):
+        job = self.jobs.get(job_id)
+        if job is None or job.finished:
+            st.session_state.get('generation_jobs', {}).pop(doc_id, None)
+            self._apply_finished_job(doc_id, job)
+            # Результат показывается в основной части страницы
+            st.rerun()
+
+        state = "в очереди" if job.status == JOB_QUEUED else "выполняется"
+        st.info(f"⏳ Генерация документов {doc_id}: {state} ({int(time.time() - job.created_at)} с)")
+
+    def _submit_generation(self, documents: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Поставить генерацию в очередь; результат появится после завершения задания (см. _poll_generation_job)"""
+        job_ids = self.jobs.submit_many(documents)
+        st.session_state.setdefault('generation_jobs', {}).update(job_ids)
+        errors = st.session_state.setdefault('generation_errors', {})
+        for doc_id in job_ids:
+            errors.pop(doc_id, None)
+            self.constructor._add_to_request_history(doc_id, 'generate', 'processing')
+        return job_ids
+
     def display_document_generation_form(self, document_data: Dict[str, Any]):
         """Отображение формы для генерации документов"""
         doc_id = str(document_data.get('ID', 'unknown'))
         st.subheader(f"Генерация документов ({doc_id})")
-        
+
+        if st.button("Сгенерировать документы", key=f"gen_btn_{doc_id}"):
+            self._submit_generation([document_data])
+
         self.display_request_status(doc_id)
+
+        error = st.session_state.get('generation_errors', {}).get(doc_id)
+        if error:
+            st.error(f"Ошибка при генерации документов: {error}")
         
         with st.expander("Данные для генерации"):
             st.json(document_data)
-            
-        if st.button("Сгенерировать документы", key=f"gen_btn_{doc_id}"):
-            with st.spinner("Генерация документов..."):
-                result = self.constructor.generate_documents(document_data)
-                if result:
-                    st.session_state.generated_documents = result
-                    st.success("Документы успешно сгенерированы!")
-                    st.rerun()
+
+    @staticmethod
+    def _store_generated(doc_id: str, result: Dict[str, Any]):
+        """Сохранение результата генерации (по одному на документ)"""
+        if not isinstance(st.session_state.get('generated_documents'), dict):
+            st.session_state.generated_documents = {}
+        st.session_state.generated_documents[doc_id] = result
+
+    def display_batch_generation_form(self, documents: List[Dict[str, Any]]):
+        """Генерация документов сразу для всех выбранных записей"""
+        if len(documents) < 2:
+            return
+
+        if st.button(f"Сгенерировать документы для всех выбранных ({len(documents)})", key="gen_btn_batch"):
+            st.session_state.batch_generation_jobs = self._submit_generation(documents)
+
+        batch = st.session_state.get('batch_generation_jobs')
+        if batch:
+            # Обновляется при каждом перезапуске, который вызывают завершившиеся задания
+            active = st.session_state.get('generation_jobs', {})
+            done = sum(1 for doc_id, job_id in batch.items() if active.get(doc_id) != job_id)
+            st.progress(done / len(batch), text=f"Готово {done} из {len(batch)}")
+            if done == len(batch):
+                del st.session_state.batch_generation_jobs
 
     def display_generated_documents(self):
         """Отображение сгенерированных документов"""
-        if 'generated_documents' not in st.session_state:
+        generated = st.session_state.get('generated_documents')
+        if not generated:
             return
 
-        documents = st.session_state.generated_documents
         st.subheader("Сгенерированные документы")
-        
-        doc_id = str(documents.get('merged_data', {}).get('ID', 'unknown'))
-        self.display_request_status(doc_id)
 
-        for doc in documents.get('documents', []):
-            col1, col2 = st.columns([3, 1])
-            
-            with col1:
-                st.write(f"📄 {doc['name']}")
-                
-            with col2:
-                content = self.constructor.download_document(doc['url'], doc_id)
-                if content:
-                    mime_type = self.constructor.get_mime_type(doc['format'])
-                    if st.download_button(
-                        label=f"Скачать {doc['format'].upper()}",
-                        data=content,
-                        file_name=f"{doc['name']}.{doc['format']}",
-                        mime=mime_type,
-                        key=f"download_{doc['name']}"
-                    ):
-                        st.success(f"Файл {doc['name']} успешно скачан") 
\ No newline at end of file
+        for doc_id, documents in generated.items():
+            st.write(f"**Документ {doc_id}**")
+            self.display_request_status(doc_id, poll_jobs=False)
+
+            version = documents.get('generated_at', '')
+            for doc in documents.get('documents', []):
+                col1, col2 = st.columns([3, 1])
+
+                with col1:
+                    st.write(f"📄 {doc['name']}")
+
+                with col2:
+                    self._display_download(doc, doc_id, version)
+
+            if len(documents.get('documents', [])) > 1:
+                self._display_archive_download(doc_id, documents['documents'], version)
+
+    @staticmethod
+    def _requested_downloads() -> Set[str]:
+        """Файлы, запрошенные кнопкой «Получить» и ещё не скачанные"""
+        requested = st.session_state.get('requested_downloads')
+        if not isinstance(requested, set):
+            requested = st.session_state.requested_downloads = set()
+        return requested
+
+    def _display_download(self, doc: Dict[str, Any], doc_id: str, version: str):
+        """
+        Кнопка скачивания одного файла.
+
+        Кнопка «Скачать» показывается только для файла, запрошенного кнопкой «Получить»,
+        и только до его скачивания: download_button читает файл в память Streamlit
+        при каждом перезапуске скрипта. В режиме lazy_downloads файл запрашивается у API
+        только по нажатию «Получить», иначе заранее скачивается в дисковый кэш.
+        """
+        key = f"{doc_id}_{doc['name']}_{doc['format']}"
+        requested = self._requested_downloads()
+        request_key = f"{key}_{version}"
+        if not config.get('lazy_downloads', True):
+            self.constructor.download_document_file(doc['url'], doc_id, version)
+
+        if request_key not in requested:
+            # Запрос отмечается до перезапуска, чтобы кнопка сразу сменилась на «Скачать»
+            st.button(f"Получить {doc['format'].upper()}", key=f"fetch_{key}", on_click=requested.add, args=(request_key,))
+            return
+
+        path = self.constructor.cached_document_path(doc['url'], doc_id, version)
+        if path is None:
+            with st.spinner("Скачивание..."):
+                path = self.constructor.download_document_file(doc['url'], doc_id, version)
+            if path is None:
+                requested.discard(request_key)
+                return
+
+        self._serve_file(
+            path,
+            label=f"Скачать {doc['format'].upper()}",
+            file_name=f"{doc['name']}.{doc['format']}",
+            mime=self.constructor.get_mime_type(doc['format']),
+            key=f"download_{key}",
+            request_key=request_key
+        )
+
+    def _display_archive_download(self, doc_id: str, documents: List[Dict[str, Any]], version: str):
+        """Все файлы записи одним ZIP-архивом (собирается и отдаётся по нажатию)"""
+        key = f"{doc_id}_archive"
+        requested = self._requested_downloads()
+        request_key = f"{key}_{version}"
+        if request_key not in requested:
+            st.button("Собрать ZIP со всеми файлами", key=f"fetch_{key}", on_click=requested.add, args=(request_key,))
+            return
+
+        path = self.constructor.cached_archive_path(doc_id, version)
+        if path is None:
+            with st.spinner("Формирование архива..."):
+                path = self.constructor.build_documents_archive(doc_id, documents, version)
+            if path is None:
+                requested.discard(request_key)
+                return
+
+        self._serve_file(
+            path,
+            label="Скачать ZIP",
+            file_name=f"documents_{doc_id}.zip",
+            mime="application/zip",
+            key=f"download_{key}",
+            request_key=request_key
+        )
+
+    def _serve_file(self, path: str, label: str, file_name: str, mime: str, key: str, request_key: str):
+        # Файл читается из дискового кэша, а не хранится в session_state
+        requested = self._requested_downloads()
+        try:
+            file = open(path, 'rb')
+        except OSError:
+            # Файл вытеснен из кэша — будет запрошен заново при следующем нажатии
+            requested.discard(request_key)
+            st.warning(f"Файл {file_name} больше недоступен, получите его заново")
+            return
+        with file:
+            # После скачивания кнопка снова сменяется на «Получить», и файл больше не читается
+            st.download_button(label=label, data=file, file_name=file_name, mime=mime, key=key,
+                               on_click=self._on_downloaded, args=(request_key, file_name))
+
+    def _on_downloaded(self, request_key: str, file_name: str):
+        self._requested_downloads().discard(request_key)
+        st.toast(f"Файл {file_name} успешно скачан")
@@ -1,22 +1,6 @@
 import streamlit as st
-import pandas as pd
-from src.utils.utils import format_date, flatten_dict
-
-
-def generate_fsa_url(doc_type: str, doc_id: str) -> str:
-    """
-    Генерирует URL для просмотра документа на сайте FSA.
-
-    Args:
-        doc_type: тип документа ('D' для декларации, 'C' для сертификата)
-        doc_id: идентификатор документа
-
-    Returns:
-        str: полный URL для просмотра документа
-    """
-    base_url = "https://pub.fsa.gov.ru/rss"
-    type_segment = "declaration" if doc_type == "D" else "certificate"
-    return f"{base_url}/{type_segment}/view/{doc_id}/manufacturer"
+from src.utils.results_table import build_results_frame, generate_fsa_url
+from src.utils.utils import format_date
 
 
 def display_search_form():
@@ -64,33 +48,8 @@ def display_search_form():
 
 
 def display_results_table(items):
-    formatted_results = []
-    for item in items:
-        flat_item = flatten_dict(item)
-        tnveds = flat_item.get("Product_Tnveds", [])
-        # Проверка на None и преобразование в пустой список если None
-        if tnveds is None:
-            tnveds = []
-
-        formatted_item = {
-            "Выбрать": False,
-            "ID": flat_item.get("ID", ""),
-            "Ссылка": generate_fsa_url(flat_item.get("Type"), flat_item.get("ID")),
-            "Номер": flat_item.get("Number", ""),
-            "Тип": "Декларация" if flat_item.get("Type") == "D" else "Сертификат",
-            "Статус": flat_item.get("Status", ""),
-            "Дата регистрации": format_date(flat_item.get("RegistrationDate")),
-            "Действителен до": format_date(flat_item.get("ValidityPeriod")),
-            "Заявитель": flat_item.get("Applicant", ""),
-            "Производитель": flat_item.get("Manufacturer_Name", ""),
-            "Продукция": flat_item.get("Product_Name", ""),
-            "ТН ВЭД": ", ".join(tnveds),  # Используем обработанное значение
-            "Бренд": flat_item.get("Brand", ""),
-            "Материалы": ", ".join(flat_item.get("Materials", [])),
-        }
-        formatted_results.append(formatted_item)
-
-    df = pd.DataFrame(formatted_results)
+    df = build_results_frame(items)
+    df.insert(0, "Выбрать", False)
 
     column_config = {
         "Выбрать": st.column_config.CheckboxColumn(
@@ -123,6 +82,29 @@ def display_results_table(items):
 
 
 
+def display_pagination(current_page: int, total_pages: int) -> int:
+    """
+    Отображает переключатель страниц результатов поиска.
+
+    Returns:
+        int: номер выбранной страницы (с нуля); совпадает с current_page, если ничего не нажато
+    """
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+
+    with col_prev:
+        prev_clicked = st.button("← Назад", disabled=current_page <= 0, key="page_prev")
+    with col_info:
+        st.write(f"Страница {current_page + 1} из {max(total_pages, 1)}")
+    with col_next:
+        next_clicked = st.button("Вперёд →", disabled=current_page >= total_pages - 1, key="page_next")
+
+    if prev_clicked:
+        return current_page - 1
+    if next_clicked:
+        return current_page + 1
+    return current_page
+
+
 def display_document_details(details):
     st.subheader("Подробная информация о документе")
 
@@ -1,19 +1,11 @@
-import requests
-import json
-from typing import Dict, Any, Union, Optional
-import sys
-import io
+from collections.abc import Mapping, Sequence
+from functools import lru_cache
+from typing import Dict, Any, Union, Optional, Callable, Iterable, List, NamedTuple, Tuple
 import logging
-from config.config import load_config
+from src.utils.logging_utils import log_payload
 
 
-config = load_config()
-
-# Настройка логирования
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
-
-
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+# Логирование и кодировку вывода настраивает src.bootstrap в точке входа
 
 
 def utf8_encode_dict(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -36,21 +28,123 @@ def utf8_encode_dict(data: Dict[str, Any]) -> Dict[str, Any]:
     return result
 
 
-def get_nested_value(data: Dict[str, Any], path: str, default: Any = '') -> Any:
-    keys = path.split('.')
-    value = data
-    for key in keys:
-        if key.endswith(']'):
-            key, index = key[:-1].split('[')
-            try:
-                value = value.get(key, [])[int(index)]
-            except (IndexError, TypeError):
-                return default
-        else:
+# Признак отсутствующего значения при обходе пути (аналог возврата default)
+_MISSING = object()
+
+
+def _step(value: Any, key: str, index: Optional[int]) -> Any:
+    """Один шаг пути: value[key] или value[key][index]; _MISSING, если значения нет"""
+    try:
+        if index is None:
             value = value.get(key, {})
-        if value == {}:
-            return default
-    return value if value != {} else default
+        else:
+            value = value.get(key, [])[index]
+    except (IndexError, TypeError, AttributeError):
+        return _MISSING
+    return _MISSING if isinstance(value, Mapping) and not value else value
+
+
+class PathAccessor:
+    """Путь вида 'RegistryData.experts[0].surname', разобранный один раз при создании"""
+    __slots__ = ('path', 'steps')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.steps: Tuple[Tuple[str, Optional[int]], ...] = tuple(self._parse(path))
+
+    @staticmethod
+    def _parse(path: str) -> List[Tuple[str, Optional[int]]]:
+        steps = []
+        for key in path.split('.'):
+            if key.endswith(']'):
+                key, index = key[:-1].split('[')
+                steps.append((key, int(index)))
+            else:
+                steps.append((key, None))
+        return steps
+
+    def __call__(self, data: Any, default: Any = '') -> Any:
+        value = data
+        for key, index in self.steps:
+            value = _step(value, key, index)
+            if value is _MISSING:
+                return default
+        return value
+
+
+@lru_cache(maxsize=None)
+def compile_path(path: str) -> PathAccessor:
+    """Получить (и закэшировать) разобранный путь"""
+    return PathAccessor(path)
+
+
+def get_nested_value(data: Dict[str, Any], path: str, default: Any = '') -> Any:
+    return compile_path(path)(data, default)
+
+
+class FieldSpec(NamedTuple):
+    """Описание выходного поля: путь в документе, значение по умолчанию и преобразование"""
+    name: str
+    path: str
+    default: Any = ''
+    transform: Optional[Callable[[Any], Any]] = None
+
+
+class _PathNode:
+    __slots__ = ('children', 'fields')
+
+    def __init__(self):
+        self.children: Dict[Tuple[str, Optional[int]], '_PathNode'] = {}
+        self.fields: List[int] = []
+
+
+class FieldMapping:
+    """
+    Скомпилированный набор полей для извлечения из документа.
+
+    Пути всех полей собираются в общее дерево, поэтому общие префиксы
+    (например, 'RegistryData') разрешаются один раз на документ, а строки
+    путей не разбираются повторно при каждом вызове.
+    """
+
+    def __init__(self, fields: List[FieldSpec]):
+        self.fields = list(fields)
+        self._root = _PathNode()
+        for field_index, spec in enumerate(self.fields):
+            node = self._root
+            for step in compile_path(spec.path).steps:
+                node = node.children.setdefault(step, _PathNode())
+            node.fields.append(field_index)
+
+    def evaluate(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Извлечь все поля из одного документа"""
+        values: List[Any] = [_MISSING] * len(self.fields)
+        self._walk(self._root, data, values)
+
+        result = {}
+        for spec, value in zip(self.fields, values):
+            if value is _MISSING:
+                value = spec.default
+            result[spec.name] = _materialize(spec.transform(value) if spec.transform else value)
+        return result
+
+    def evaluate_batch(self, documents: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Извлечь поля из каждого документа пакета"""
+        return [self.evaluate(document) for document in documents]
+
+    def _walk(self, node: _PathNode, value: Any, values: List[Any]) -> None:
+        for (key, index), child in node.children.items():
+            child_value = _step(value, key, index)
+            if child_value is _MISSING:
+                # Всё поддерево получает значения по умолчанию
+                continue
+            for field_index in child.fields:
+                values[field_index] = child_value
+            if child.children:
+                self._walk(child, child_value, values)
+
+
+_FIRST_ADDRESS = compile_path('addresses[0].fullAddress')
 
 
 def filter_contacts(contacts: list, id_type: int) -> str:
@@ -69,147 +163,247 @@ def stringify_values(obj):
         return str(obj)
 
 
+def _stringify_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return StringifiedView(value)
+    if isinstance(value, list):
+        return StringifiedList(value)
+    if value is None:
+        return ''
+    return str(value)
+
+
+class StringifiedView(Mapping):
+    """
+    Ленивый аналог stringify_values для словаря: значения приводятся к строкам
+    только при чтении, исходный документ не копируется.
+    """
+    __slots__ = ('_data',)
+
+    def __init__(self, data: Dict[str, Any]):
+        self._data = data
+
+    def __getitem__(self, key: str) -> Any:
+        return _stringify_value(self._data[key])
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class StringifiedList(Sequence):
+    """Ленивый аналог stringify_values для списка"""
+    __slots__ = ('_items',)
+
+    def __init__(self, items: List[Any]):
+        self._items = items
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return StringifiedList(self._items[index])
+        return _stringify_value(self._items[index])
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+def _materialize(value: Any) -> Any:
+    """Ленивые представления в результате заменяются обычными dict/list (для JSON и сравнения)"""
+    if isinstance(value, StringifiedView):
+        return stringify_values(value._data)
+    if isinstance(value, StringifiedList):
+        return stringify_values(value._items)
+    return value
+
+
+def _is_list(value: Any) -> bool:
+    return isinstance(value, (list, StringifiedList))
+
+
+def _format_certification_body(cert_auth: Any) -> str:
+    if isinstance(cert_auth, Mapping):
+        return (
+            f"Название: {cert_auth.get('fullName', '')}\n"
+            f"Адрес: {_FIRST_ADDRESS(cert_auth)}\n"
+            f"Телефон: {filter_contacts(cert_auth.get('contacts', []), '1')}\n"
+            f"Email: {filter_contacts(cert_auth.get('contacts', []), '4')}\n"
+            f"Аттестат аккредитации: {cert_auth.get('attestatRegNumber', '')}\n"
+            f"Дата регистрации: {cert_auth.get('attestatRegDate', '')}"
+        )
+    return str(cert_auth)
+
+
+def _format_applicant(applicant: Any) -> str:
+    if isinstance(applicant, Mapping):
+        return (
+            f"Название: {applicant.get('fullName', '')}\n"
+            f"Адрес: {_FIRST_ADDRESS(applicant)}\n"
+            f"ОГРН: {applicant.get('ogrn', '')}\n"
+            f"Телефон: {filter_contacts(applicant.get('contacts', []), '1')}\n"
+            f"Email: {filter_contacts(applicant.get('contacts', []), '4')}"
+        )
+    return str(applicant)
+
+
+def _format_manufacturer(manufacturer: Any) -> str:
+    if isinstance(manufacturer, Mapping):
+        return (
+            f"Название: {manufacturer.get('fullName', '')}\n"
+            f"Адрес: {_FIRST_ADDRESS(manufacturer)}"
+        )
+    return str(manufacturer)
+
+
+def _format_codes(codes: Any) -> str:
+    return ', '.join(codes) if _is_list(codes) else str(codes)
+
+
+def _format_test_reports(test_reports: Any) -> str:
+    if _is_list(test_reports):
+        return '\n'.join([f"{report.get('number', '')}: {report.get('name', '')}" for report in test_reports])
+    return str(test_reports)
+
+
+def _format_expert(expert: Any) -> str:
+    if isinstance(expert, Mapping):
+        return f"{expert.get('surname', '')} {expert.get('firstName', '')} {expert.get('patronimyc', '')}"
+    return str(expert)
+
+
+def _format_head(head: Any) -> str:
+    if isinstance(head, Mapping):
+        return f"{head.get('surname', '')} {head.get('firstName', '')} {head.get('patronymic', '')}"
+    return str(head)
+
+
+REGISTRY_FIELDS = [
+    FieldSpec('certificate_number', 'RegistryData.number'),
+    FieldSpec('batch_number', 'RegistryData.blankNumber'),
+]
+
+CERTIFICATION_BODY_FIELDS = [
+    FieldSpec('certification_body', 'RegistryData.certificationAuthority', {}, _format_certification_body),
+]
+
+APPLICANT_FIELDS = [
+    FieldSpec('applicant', 'RegistryData.applicant', {}, _format_applicant),
+]
+
+MANUFACTURER_FIELDS = [
+    FieldSpec('manufacturer', 'RegistryData.manufacturer', {}, _format_manufacturer),
+]
+
+PRODUCT_FIELDS = [
+    FieldSpec('product_description', 'RegistryData.product.fullName'),
+    FieldSpec('tn_ved_codes', 'RegistryData.product.identifications[0].idTnveds', '', _format_codes),
+    FieldSpec('technical_regulation', 'RegistryData.idTechnicalReglaments', [], ', '.join),
+    FieldSpec('standards_and_conditions', 'RegistryData.product.storageCondition'),
+]
+
+TEST_REPORT_FIELDS = [
+    FieldSpec('test_reports', 'RegistryData.documents.applicantOtherDocuments', [], _format_test_reports),
+]
+
+DATES_AND_PERSONNEL_FIELDS = [
+    FieldSpec('issue_date', 'RegistryData.certRegDate'),
+    FieldSpec('expiry_date', 'RegistryData.certEndDate'),
+    FieldSpec('expert_name', 'RegistryData.experts[0]', {}, _format_expert),
+    FieldSpec('head_of_certification_body', 'RegistryData', {}, _format_head),
+]
+
+# Полный набор полей документа; порядок совпадает с порядком ключей результата
+CERTIFICATE_MAPPING = FieldMapping(
+    REGISTRY_FIELDS + CERTIFICATION_BODY_FIELDS + APPLICANT_FIELDS + MANUFACTURER_FIELDS
+    + PRODUCT_FIELDS + TEST_REPORT_FIELDS + DATES_AND_PERSONNEL_FIELDS
+)
+
+_REGISTRY_MAPPING = FieldMapping(REGISTRY_FIELDS)
+_CERTIFICATION_BODY_MAPPING = FieldMapping(CERTIFICATION_BODY_FIELDS)
+_APPLICANT_MAPPING = FieldMapping(APPLICANT_FIELDS)
+_MANUFACTURER_MAPPING = FieldMapping(MANUFACTURER_FIELDS)
+_PRODUCT_MAPPING = FieldMapping(PRODUCT_FIELDS)
+_TEST_REPORT_MAPPING = FieldMapping(TEST_REPORT_FIELDS)
+_DATES_AND_PERSONNEL_MAPPING = FieldMapping(DATES_AND_PERSONNEL_FIELDS)
+
+
 def process_complex_json(data: Dict[str, Any]) -> Dict[str, str]:
-    logging.info("Входные данные: %s", json.dumps(data, ensure_ascii=False, indent=2))
-    data = stringify_values(data)
-    result = {}
-    result.update(process_registry_data(data))
-    result.update(process_certification_body(data))
-    result.update(process_applicant(data))
-    result.update(process_manufacturer(data))
-    result.update(process_product_info(data))
-    result.update(process_test_reports(data))
-    result.update(process_dates_and_personnel(data))
-    return result
+    log_payload("Входные данные", data)
+    # Значения приводятся к строкам при чтении, без полной копии документа
+    return CERTIFICATE_MAPPING.evaluate(StringifiedView(data))
+
+
+def process_complex_json_batch(documents: Iterable[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Подготовка полей для пакета документов с общим скомпилированным набором путей"""
+    return [process_complex_json(document) for document in documents]
 
 
 def process_registry_data(data: Dict[str, Any]) -> Dict[str, str]:
-    return {
-        'certificate_number': get_nested_value(data, 'RegistryData.number'),
-        'batch_number': get_nested_value(data, 'RegistryData.blankNumber'),
-    }
+    return _REGISTRY_MAPPING.evaluate(data)
 
 
 def process_certification_body(data: Dict[str, Any]) -> Dict[str, str]:
-    cert_auth = get_nested_value(data, 'RegistryData.certificationAuthority', {})
-    if isinstance(cert_auth, dict):
-        return {
-            'certification_body': (
-                f"Название: {cert_auth.get('fullName', '')}\n"
-                f"Адрес: {get_nested_value(cert_auth, 'addresses[0].fullAddress')}\n"
-                f"Телефон: {filter_contacts(cert_auth.get('contacts', []), '1')}\n"
-                f"Email: {filter_contacts(cert_auth.get('contacts', []), '4')}\n"
-                f"Аттестат аккредитации: {cert_auth.get('attestatRegNumber', '')}\n"
-                f"Дата регистрации: {cert_auth.get('attestatRegDate', '')}"
-            )
-        }
-    return {'certification_body': str(cert_auth)}
+    return _CERTIFICATION_BODY_MAPPING.evaluate(data)
 
 
 def process_applicant(data: Dict[str, Any]) -> Dict[str, str]:
-    applicant = get_nested_value(data, 'RegistryData.applicant', {})
-    if isinstance(applicant, dict):
-        return {
-            'applicant': (
-                f"Название: {applicant.get('fullName', '')}\n"
-                f"Адрес: {get_nested_value(applicant, 'addresses[0].fullAddress')}\n"
-                f"ОГРН: {applicant.get('ogrn', '')}\n"
-                f"Телефон: {filter_contacts(applicant.get('contacts', []), '1')}\n"
-                f"Email: {filter_contacts(applicant.get('contacts', []), '4')}"
-            )
-        }
-    return {'applicant': str(applicant)}
+    return _APPLICANT_MAPPING.evaluate(data)
 
 
 def process_manufacturer(data: Dict[str, Any]) -> Dict[str, str]:
-    manufacturer = get_nested_value(data, 'RegistryData.manufacturer', {})
-    if isinstance(manufacturer, dict):
-        return {
-            'manufacturer': (
-                f"Название: {manufacturer.get('fullName', '')}\n"
-                f"Адрес: {get_nested_value(manufacturer, 'addresses[0].fullAddress')}"
-            )
-        }
-    return {'manufacturer': str(manufacturer)}
+    return _MANUFACTURER_MAPPING.evaluate(data)
 
 
 def process_product_info(data: Dict[str, Any]) -> Dict[str, str]:
-    tn_ved_codes = get_nested_value(data, 'RegistryData.product.identifications[0].idTnveds')
-    return {
-        'product_description': get_nested_value(data, 'RegistryData.product.fullName'),
-        'tn_ved_codes': ', '.join(tn_ved_codes) if isinstance(tn_ved_codes, list) else str(tn_ved_codes),
-        'technical_regulation': ', '.join(get_nested_value(data, 'RegistryData.idTechnicalReglaments', [])),
-        'standards_and_conditions': get_nested_value(data, 'RegistryData.product.storageCondition'),
-    }
+    return _PRODUCT_MAPPING.evaluate(data)
 
 
 def process_test_reports(data: Dict[str, Any]) -> Dict[str, str]:
-    test_reports = get_nested_value(data, 'RegistryData.documents.applicantOtherDocuments', [])
-    if isinstance(test_reports, list):
-        return {
-            'test_reports': '\n'.join(
-                [f"{report.get('number', '')}: {report.get('name', '')}" for report in test_reports])
-        }
-    return {'test_reports': str(test_reports)}
+    return _TEST_REPORT_MAPPING.evaluate(data)
 
 
 def process_dates_and_personnel(data: Dict[str, Any]) -> Dict[str, str]:
-    result = {
-        'issue_date': get_nested_value(data, 'RegistryData.certRegDate'),
-        'expiry_date': get_nested_value(data, 'RegistryData.certEndDate'),
-    }
-
-    expert = get_nested_value(data, 'RegistryData.experts[0]', {})
-    if isinstance(expert, dict):
-        result[
-            'expert_name'] = f"{expert.get('surname', '')} {expert.get('firstName', '')} {expert.get('patronimyc', '')}"
-    else:
-        result['expert_name'] = str(expert)
+    return _DATES_AND_PERSONNEL_MAPPING.evaluate(data)
 
-    head = get_nested_value(data, 'RegistryData', {})
-    if isinstance(head, dict):
-        result[
-            'head_of_certification_body'] = f"{head.get('surname', '')} {head.get('firstName', '')} {head.get('patronymic', '')}"
-    else:
-        result['head_of_certification_body'] = str(head)
 
-    return result
+def merge_search_data(details: Dict[str, Any], search_data: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Данные для генерации: детали документа, дополненные полями результата поиска.
+
+    Поля поиска, которых нет в деталях, добавляются с префиксом search_,
+    коды ТН ВЭД дополнительно доступны шаблонам как tnved_codes.
+    """
+    merged_data = details.copy()
+    if search_data:
+        for key, value in search_data.items():
+            if key not in merged_data:
+                merged_data[f'search_{key}'] = value
+                if key == 'TNVED':
+                    merged_data['tnved_codes'] = value
+    return merged_data
 
 
 def generate_documents(details: Dict[str, Any], search_data: Optional[Dict[str, Any]] = None) -> Dict[str, Union[bytes, str]]:
+    # HTTP-клиент нужен только здесь: пакетные обработчики, которым нужен лишь маппинг,
+    # не загружают requests при импорте
+    import requests
+    from src.api.generation import request_generation
+
     try:
-        # Подготовка данных не меняется
-        merged_data = details.copy()
-        if search_data:
-            for key, value in search_data.items():
-                if key not in merged_data:
-                    merged_data[f'search_{key}'] = value
-                    if key == 'TNVED':
-                        merged_data['tnved_codes'] = value
-
-        utf8_data = utf8_encode_dict(merged_data)
-        payload = {"data": utf8_data}
-
-        # Отправка запроса
-        generate_url = f"{config['LOCAL_CERTIFICATE_API_URL']}/generate_documents"
-        response = requests.post(
-            generate_url,
-            json=payload,
-            headers={'Content-Type': 'application/json; charset=utf-8'}
-        )
-        response.raise_for_status()
-        
-        # Получаем список документов в новом формате
-        documents_list = response.json()  # Теперь это список словарей с type, format, name, url
-        
+        merged_data = merge_search_data(details, search_data)
+        # Строки Python уже в Unicode, requests сам кодирует JSON в UTF-8 —
+        # повторная рекурсивная копия документа не нужна
+        generated = request_generation(merged_data)
+
         result = {
-            'documents': documents_list,  # Сохраняем весь список документов
-            'merged_data': merged_data    
+            'documents': generated['documents'],  # Список словарей с type, format, name, url
+            'merged_data': merged_data
         }
-        
+
         logging.info("Документы успешно сгенерированы для данных: %s",
                     merged_data.get('ID', '') or merged_data.get('search_ID', 'Unknown ID'))
-        
+
         return result
 
     except requests.RequestException as e:
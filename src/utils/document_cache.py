@@ -0,0 +1,250 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import BinaryIO, Callable, Dict, Iterable, NamedTuple, Optional
+
+from config.config import load_config
+from src.utils.metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+config = load_config()
+
+
+class _DiskEntry(NamedTuple):
+    size: int
+    created_at: float
+
+
+class DocumentCache:
+    """
+    Общий для всех сессий кэш сгенерированных файлов (DOCX/PPTX/PDF).
+
+    Файлы хранятся на диске под ключом sha256(ID документа, URL, версия генерации),
+    поэтому переживают перезапуск процесса. Суммарный размер ограничен max_bytes
+    с вытеснением давно не использованных файлов, записи старше ttl удаляются.
+    Небольшие файлы дополнительно держатся в памяти (горячий уровень).
+
+    Файл больше max_bytes не вытесняет остальные: он хранится вне учёта размера,
+    пока его не заменит следующий такой файл или не истечёт ttl.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, ttl: float, memory_max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.memory_max_bytes = memory_max_bytes
+        self._lock = threading.Lock()
+        self._disk: 'OrderedDict[str, _DiskEntry]' = OrderedDict()
+        self._disk_size = 0
+        # Не более одного файла больше max_bytes (ключ -> запись)
+        self._oversized: Dict[str, _DiskEntry] = {}
+        self._memory: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._memory_size = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(doc_id: str, url: str, version: str = '') -> str:
+        """Ключ содержимого: один и тот же файл одной генерации всегда получает один ключ"""
+        return hashlib.sha256(f"{doc_id}\0{url}\0{version}".encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.bin")
+
+    def _load_index(self) -> None:
+        """Восстановить индекс по файлам каталога (после перезапуска процесса)"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.bin'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            entries.append((stat.st_atime, name[:-4], _DiskEntry(stat.st_size, stat.st_mtime)))
+
+        with self._lock:
+            for _, key, entry in sorted(entries):
+                if entry.size > self.max_bytes:
+                    for previous in list(self._oversized):
+                        self._remove_locked(previous)
+                    self._oversized[key] = entry
+                else:
+                    self._disk[key] = entry
+                    self._disk_size += entry.size
+            self._evict_locked()
+
+    def get_path(self, key: str) -> Optional[str]:
+        """Путь к файлу в кэше или None, если его нет или срок хранения истёк"""
+        with self._lock:
+            entry = self._disk.get(key) or self._oversized.get(key)
+            if entry is not None and time.time() - entry.created_at > self.ttl:
+                self._remove_locked(key)
+                entry = None
+            if key in self._disk:
+                self._disk.move_to_end(key)
+        record_cache_lookup('document', entry is not None)
+        return self._path(key) if entry is not None else None
+
+    def get_bytes(self, key: str) -> Optional[bytes]:
+        """Содержимое файла: из памяти, если оно там есть, иначе с диска"""
+        with self._lock:
+            content = self._memory.get(key)
+            if content is not None:
+                self._memory.move_to_end(key)
+                if key in self._disk:
+                    self._disk.move_to_end(key)
+        if content is not None:
+            record_cache_lookup('document', True)
+            return content
+
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as file:
+                content = file.read()
+        except OSError:
+            return None
+        self._remember(key, content)
+        return content
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        """Открыть файл из кэша для потокового чтения (вызывающий закрывает файл)"""
+        path = self.get_path(key)
+        if path is None:
+            return None
+        try:
+            return open(path, 'rb')
+        except OSError:
+            return None
+
+    def put_stream(self, key: str, chunks: Iterable[bytes]) -> str:
+        """Записать файл по частям, не собирая его целиком в памяти"""
+        def write_chunks(file: BinaryIO) -> None:
+            for chunk in chunks:
+                file.write(chunk)
+
+        return self.put_with(key, write_chunks)
+
+    def put_with(self, key: str, write: Callable[[BinaryIO], None]) -> str:
+        """
+        Записать файл функцией write(file), например при сборке ZIP-архива.
+
+        Запись идёт во временный файл и атомарно переименовывается,
+        поэтому читатели никогда не видят недописанный файл. Возвращённый путь
+        остаётся действительным и для файла больше max_bytes.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                write(file)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            if key in self._disk:
+                self._disk_size -= self._disk.pop(key).size
+            self._oversized.pop(key, None)
+            stale = self._memory.pop(key, None)
+            if stale is not None:
+                self._memory_size -= len(stale)
+            entry = _DiskEntry(size, time.time())
+            if size > self.max_bytes:
+                # Иначе вытеснение сразу удалило бы только что записанный файл вместе со всеми остальными
+                for previous in list(self._oversized):
+                    self._remove_locked(previous)
+                self._oversized[key] = entry
+                logger.warning(
+                    "Document %s (%d bytes) exceeds document cache limit, kept outside the LRU", key, size
+                )
+            else:
+                self._disk[key] = entry
+                self._disk_size += size
+            self._evict_locked()
+        logger.debug("Document cached on disk: %s (%d bytes)", key, size)
+        return self._path(key)
+
+    def put_bytes(self, key: str, content: bytes) -> str:
+        path = self.put_stream(key, [content])
+        self._remember(key, content)
+        return path
+
+    def _remember(self, key: str, content: bytes) -> None:
+        # В памяти держим только небольшие файлы, чтобы один большой PDF не вытеснил остальные
+        if len(content) > self.memory_max_bytes // 8:
+            return
+        with self._lock:
+            if key in self._memory:
+                return
+            self._memory[key] = content
+            self._memory_size += len(content)
+            while self._memory_size > self.memory_max_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_size -= len(evicted)
+
+    def _evict_locked(self) -> None:
+        now = time.time()
+        expired = [
+            key for key, entry in [*self._disk.items(), *self._oversized.items()]
+            if now - entry.created_at > self.ttl
+        ]
+        for key in expired:
+            self._remove_locked(key)
+        while self._disk_size > self.max_bytes and self._disk:
+            self._remove_locked(next(iter(self._disk)))
+
+    def _remove_locked(self, key: str) -> None:
+        entry = self._disk.pop(key, None)
+        if entry is not None:
+            self._disk_size -= entry.size
+        self._oversized.pop(key, None)
+        content = self._memory.pop(key, None)
+        if content is not None:
+            self._memory_size -= len(content)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            # Например, файл ещё открыт читателем в Windows; из индекса он уже исключён
+            logger.warning("Failed to remove cached document %s: %s", key, e)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'files': len(self._disk),
+                'disk_bytes': self._disk_size,
+                'oversized_bytes': sum(entry.size for entry in self._oversized.values()),
+                'memory_files': len(self._memory),
+                'memory_bytes': self._memory_size,
+            }
+
+
+_document_cache: Optional[DocumentCache] = None
+_document_cache_lock = threading.Lock()
+
+
+def get_document_cache() -> DocumentCache:
+    """Получить общий кэш файлов документов"""
+    global _document_cache
+    if _document_cache is None:
+        with _document_cache_lock:
+            if _document_cache is None:
+                _document_cache = DocumentCache(
+                    cache_dir=config.get('document_cache_dir')
+                    or os.path.join(tempfile.gettempdir(), 'fsa_document_cache'),
+                    max_bytes=int(config.get('document_cache_max_bytes', 1024 * 1024 * 1024)),
+                    ttl=float(config.get('document_cache_ttl', 24 * 60 * 60)),
+                    memory_max_bytes=int(config.get('document_cache_memory_bytes', 64 * 1024 * 1024))
+                )
+    return _document_cache
@@ -0,0 +1,87 @@
+import json
+import logging
+import random
+import threading
+from typing import Any
+
+from config.config import load_config
+
+config = load_config()
+
+PAYLOAD_LOGGER_NAME = 'fsa.payload'
+
+_payload_logger_lock = threading.Lock()
+_payload_logger_configured = False
+
+
+class LazyJson:
+    """
+    Отложенная сериализация payload для логирования.
+
+    JSON строится только при форматировании записи (то есть если уровень
+    включён) и обрывается после max_chars символов, не сериализуя остаток.
+    """
+    __slots__ = ('payload', 'max_chars')
+
+    def __init__(self, payload: Any, max_chars: int):
+        self.payload = payload
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        encoder = json.JSONEncoder(ensure_ascii=False, default=str)
+        parts = []
+        length = 0
+        for chunk in encoder.iterencode(self.payload):
+            parts.append(chunk)
+            length += len(chunk)
+            if self.max_chars and length > self.max_chars:
+                return ''.join(parts)[:self.max_chars] + '... (обрезано)'
+        return ''.join(parts)
+
+
+def get_payload_logger() -> logging.Logger:
+    """
+    Логгер для дампов данных запросов и документов.
+
+    По умолчанию наследует уровень корневого логгера, то есть дампы уровня DEBUG
+    не пишутся. payload_log_level в config.json включает их отдельно от остальных логов,
+    payload_log_file направляет их в отдельный файл.
+    """
+    global _payload_logger_configured
+    logger = logging.getLogger(PAYLOAD_LOGGER_NAME)
+    if _payload_logger_configured:
+        return logger
+
+    with _payload_logger_lock:
+        if not _payload_logger_configured:
+            level = config.get('payload_log_level')
+            if level:
+                logger.setLevel(level)
+            log_file = config.get('payload_log_file')
+            if log_file:
+                handler = logging.FileHandler(log_file, encoding='utf-8')
+                handler.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s] %(message)s'))
+                logger.addHandler(handler)
+                logger.propagate = False
+            _payload_logger_configured = True
+    return logger
+
+
+def log_payload(message: str, payload: Any, level: int = logging.DEBUG) -> None:
+    """
+    Залогировать payload, если уровень включён и запись попала в выборку.
+
+    Args:
+        message: текст записи, к нему через двоеточие добавляется JSON
+        payload: данные для дампа (сериализуются лениво)
+        level: уровень записи
+    """
+    logger = get_payload_logger()
+    if not logger.isEnabledFor(level):
+        return
+
+    sample_rate = float(config.get('payload_log_sample_rate', 1.0))
+    if sample_rate < 1.0 and random.random() >= sample_rate:
+        return
+
+    logger.log(level, "%s: %s", message, LazyJson(payload, int(config.get('payload_log_max_chars', 2000))))
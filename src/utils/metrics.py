@@ -0,0 +1,272 @@
+import bisect
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Границы корзин гистограмм задержек (секунды): от быстрых ответов кэша до долгой генерации
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """Монотонно растущий счётчик"""
+    kind = 'counter'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, value: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + value
+
+    def values(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """Значение, которое может расти и уменьшаться (например, число запросов в работе)"""
+    kind = 'gauge'
+
+    def dec(self, value: float = 1.0, **labels: str) -> None:
+        self.inc(-value, **labels)
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class _HistogramSeries:
+    __slots__ = ('buckets', 'count', 'total')
+
+    def __init__(self, size: int):
+        self.buckets = [0] * size
+        self.count = 0
+        self.total = 0.0
+
+
+class Histogram(_Metric):
+    """Распределение значений по корзинам (для задержек)"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.bounds = tuple(sorted(buckets))
+        self._series: Dict[LabelValues, _HistogramSeries] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _HistogramSeries(len(self.bounds))
+            if index < len(self.bounds):
+                series.buckets[index] += 1
+            series.count += 1
+            series.total += value
+
+    def snapshot(self) -> Dict[LabelValues, Tuple[List[int], int, float]]:
+        """{метки: (накопленные счётчики по корзинам, количество, сумма)}"""
+        with self._lock:
+            result = {}
+            for key, series in self._series.items():
+                cumulative, running = [], 0
+                for count in series.buckets:
+                    running += count
+                    cumulative.append(running)
+                result[key] = (cumulative, series.count, series.total)
+            return result
+
+    def quantile(self, q: float, **labels: str) -> Optional[float]:
+        """Оценка квантиля по корзинам (верхняя граница корзины), None — если наблюдений нет"""
+        data = self.snapshot().get(self._key(labels))
+        if data is None or data[1] == 0:
+            return None
+        cumulative, count, _ = data
+        rank = q * count
+        for bound, running in zip(self.bounds, cumulative):
+            if running >= rank:
+                return bound
+        return float('inf')
+
+    def render(self) -> List[str]:
+        lines = self._header()
+        for key, (cumulative, count, total) in sorted(self.snapshot().items()):
+            for bound, running in zip(self.bounds, cumulative):
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {running}")
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            plain = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{plain} {_format_value(total)}")
+            lines.append(f"{self.name}_count{plain} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Набор метрик процесса с выводом в текстовом формате Prometheus"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _get_or_create(self, cls, name: str, help_text: str, labelnames: Sequence[str], **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Метрика {name} уже зарегистрирована с типом {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, help_text, labelnames)
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, help_text, labelnames)
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, help_text, labelnames, buckets=buckets)
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+_registry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    """Общий реестр метрик процесса"""
+    return _registry
+
+
+# Метрики исходящих HTTP-запросов (HttpClient и AsyncFSAClient)
+HTTP_REQUESTS = _registry.counter(
+    'fsa_http_requests_total', 'Outbound HTTP requests by endpoint, method and status', ('endpoint', 'method', 'status')
+)
+HTTP_LATENCY = _registry.histogram(
+    'fsa_http_request_duration_seconds', 'Outbound HTTP request latency (until response headers)', ('endpoint',)
+)
+HTTP_IN_FLIGHT = _registry.gauge(
+    'fsa_http_requests_in_flight', 'Outbound HTTP requests currently in progress', ('endpoint',)
+)
+# Обращения к кэшам: cache = response | document | local_index, result = hit | miss
+CACHE_REQUESTS = _registry.counter(
+    'fsa_cache_requests_total', 'Cache lookups by cache and result', ('cache', 'result')
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def cache_hit_ratios() -> Dict[str, float]:
+    """Доля попаданий по каждому кэшу"""
+    totals: Dict[str, List[float]] = {}
+    for (cache, result), value in CACHE_REQUESTS.values().items():
+        hits_and_total = totals.setdefault(cache, [0.0, 0.0])
+        hits_and_total[1] += value
+        if result == 'hit':
+            hits_and_total[0] += value
+    return {cache: hits / total for cache, (hits, total) in totals.items() if total}
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = _registry.render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: int, host: str = '127.0.0.1') -> bool:
+    """
+    Запустить HTTP-эндпоинт /metrics в фоновом потоке (один раз на процесс).
+
+    По умолчанию эндпоинт доступен только локально; для сбора метрик с другого
+    хоста задайте metrics_host (например, 0.0.0.0 за сетевым экраном).
+
+    Returns:
+        bool: True, если сервер работает
+    """
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return True
+        try:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            # Порт занят, например другой репликой на том же хосте
+            logger.warning("Metrics endpoint not started on port %s: %s", port, e)
+            return False
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name='metrics-server', daemon=True).start()
+        logger.info("Metrics endpoint listening on %s:%s/metrics", host, port)
+        return True
@@ -0,0 +1,105 @@
+import cProfile
+import io
+import logging
+import pstats
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Iterator, List, NamedTuple, Optional
+
+import streamlit as st
+
+from config.config import load_config
+
+logger = logging.getLogger(__name__)
+
+config = load_config()
+
+# ?profile=1 — разбивка по фазам, ?profile=cprofile — дополнительно профиль cProfile
+PROFILE_QUERY_PARAM = 'profile'
+CPROFILE_MODE = 'cprofile'
+
+
+class PhaseTiming(NamedTuple):
+    name: str
+    depth: int
+    duration: float
+
+
+class RerunProfiler:
+    """
+    Замер фаз одного перезапуска скрипта Streamlit.
+
+    Выключенный профилировщик ничего не замеряет: phase() возвращает пустой контекст.
+    Результат пишется в журнал и показывается в боковой панели.
+    """
+
+    def __init__(self, enabled: bool = False, capture_profile: bool = False):
+        self.enabled = enabled
+        self.capture_profile = enabled and capture_profile
+        self.phases: List[PhaseTiming] = []
+        self._depth = 0
+        self._started = time.perf_counter()
+        self._profile: Optional[cProfile.Profile] = None
+        if self.capture_profile:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    @classmethod
+    def from_request(cls) -> 'RerunProfiler':
+        """Включается флагом profiling_enabled в config.json или параметром ?profile= в URL"""
+        mode = st.query_params.get(PROFILE_QUERY_PARAM)
+        enabled = bool(config.get('profiling_enabled', False)) or bool(mode)
+        capture = mode == CPROFILE_MODE or bool(config.get('profiling_cprofile', False))
+        return cls(enabled, capture)
+
+    def phase(self, name: str):
+        if not self.enabled:
+            return nullcontext()
+        return self._timed(name)
+
+    @contextmanager
+    def _timed(self, name: str) -> Iterator[None]:
+        index = len(self.phases)
+        self.phases.append(PhaseTiming(name, self._depth, 0.0))
+        self._depth += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            # Фаза фиксируется и при st.rerun()/st.stop(), которые выходят через исключение
+            self._depth -= 1
+            self.phases[index] = PhaseTiming(name, self._depth, time.perf_counter() - started)
+
+    def finish(self) -> None:
+        """Завершить замер: записать в журнал и показать разбивку в боковой панели"""
+        if not self.enabled:
+            return
+        total = time.perf_counter() - self._started
+        profile_text = None
+        if self._profile is not None:
+            self._profile.disable()
+            stream = io.StringIO()
+            pstats.Stats(self._profile, stream=stream).sort_stats('cumulative').print_stats(
+                int(config.get('profiling_top_functions', 25))
+            )
+            profile_text = stream.getvalue()
+
+        logger.info(
+            "Rerun profile: total %.1f ms; %s", total * 1000,
+            "; ".join(f"{'  ' * p.depth}{p.name} {p.duration * 1000:.1f} ms" for p in self.phases)
+        )
+        self._render(total, profile_text)
+
+    def _render(self, total: float, profile_text: Optional[str]) -> None:
+        with st.sidebar.expander("Профиль перезапуска", expanded=True):
+            st.write(f"Всего: **{total * 1000:.1f} мс**")
+            for timing in self.phases:
+                share = timing.duration / total if total else 0.0
+                indent = ' ' * 4 * timing.depth
+                st.text(f"{indent}{timing.name}: {timing.duration * 1000:.1f} мс ({share:.0%})")
+            if profile_text:
+                st.download_button(
+                    "Скачать профиль cProfile", profile_text, file_name="rerun_profile.txt",
+                    mime="text/plain", key="rerun_profile_download"
+                )
+                st.code(profile_text, language="text")
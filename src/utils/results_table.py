@@ -0,0 +1,94 @@
+from typing import TYPE_CHECKING, Any, Dict, List
+
+# pandas и numpy импортируются при первом построении таблицы, а не при импорте модуля
+if TYPE_CHECKING:
+    import pandas as pd
+
+FSA_BASE_URL = "https://pub.fsa.gov.ru/rss"
+
+# Колонки таблицы результатов (без служебной колонки «Выбрать» интерфейса)
+RESULT_COLUMNS = [
+    "ID", "Ссылка", "Номер", "Тип", "Статус", "Дата регистрации", "Действителен до",
+    "Заявитель", "Производитель", "Продукция", "ТН ВЭД", "Бренд", "Материалы",
+]
+
+
+def generate_fsa_url(doc_type: str, doc_id: str) -> str:
+    """
+    Генерирует URL для просмотра документа на сайте FSA.
+
+    Args:
+        doc_type: тип документа ('D' для декларации, 'C' для сертификата)
+        doc_id: идентификатор документа
+
+    Returns:
+        str: полный URL для просмотра документа
+    """
+    type_segment = "declaration" if doc_type == "D" else "certificate"
+    return f"{FSA_BASE_URL}/{type_segment}/view/{doc_id}/manufacturer"
+
+
+def _column(frame: 'pd.DataFrame', name: str) -> 'pd.Series':
+    """Колонка нормализованной таблицы или пустая колонка, если поля нет ни в одном элементе"""
+    import pandas as pd
+
+    if name in frame.columns:
+        return frame[name]
+    return pd.Series(None, index=frame.index, dtype=object)
+
+
+def _format_dates(values: 'pd.Series') -> 'pd.Series':
+    """Векторный аналог format_date: '2024-01-31T00:00:00Z' -> '31.01.2024', пустые -> ''"""
+    import pandas as pd
+
+    parsed = pd.to_datetime(values, format="%Y-%m-%dT%H:%M:%SZ", errors='coerce')
+    return parsed.dt.strftime("%d.%m.%Y").fillna("")
+
+
+def _join_lists(values: 'pd.Series') -> 'pd.Series':
+    """Списки строк -> 'a, b'; None и отсутствующие значения -> ''"""
+    return values.str.join(", ").fillna("")
+
+
+def build_results_frame(items: List[Dict[str, Any]]) -> 'pd.DataFrame':
+    """
+    Строит таблицу результатов поиска за один проход по колонкам.
+
+    Вложенные словари разворачиваются через pd.json_normalize с разделителем '_'
+    (как flatten_dict), даты и ссылки вычисляются векторно для всей колонки.
+
+    Args:
+        items: элементы ответа поиска
+
+    Returns:
+        pd.DataFrame: колонки RESULT_COLUMNS в том же порядке
+    """
+    import numpy as np
+    import pandas as pd
+
+    frame = pd.json_normalize(items, sep='_')
+    if frame.empty:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    ids = _column(frame, "ID")
+    doc_types = _column(frame, "Type")
+    is_declaration = doc_types == "D"
+    type_segments = pd.Series(
+        np.where(is_declaration, "declaration", "certificate"), index=frame.index
+    )
+
+    return pd.DataFrame({
+        "ID": ids.fillna(""),
+        "Ссылка": FSA_BASE_URL + "/" + type_segments + "/view/" + ids.astype(str) + "/manufacturer",
+        "Номер": _column(frame, "Number").fillna(""),
+        "Тип": np.where(is_declaration, "Декларация", "Сертификат"),
+        "Статус": _column(frame, "Status").fillna(""),
+        "Дата регистрации": _format_dates(_column(frame, "RegistrationDate")),
+        "Действителен до": _format_dates(_column(frame, "ValidityPeriod")),
+        "Заявитель": _column(frame, "Applicant").fillna(""),
+        "Производитель": _column(frame, "Manufacturer_Name").fillna(""),
+        "Продукция": _column(frame, "Product_Name").fillna(""),
+        "ТН ВЭД": _join_lists(_column(frame, "Product_Tnveds")),
+        "Бренд": _column(frame, "Brand").fillna(""),
+        "Материалы": _join_lists(_column(frame, "Materials")),
+    }, columns=RESULT_COLUMNS)
@@ -0,0 +1,61 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.api.async_client import AsyncFSAClient
+from src.api.circuit_breaker import CircuitBreaker, get_circuit_breaker
+from src.api.client import ApiRequest
+from src.api.exceptions import FSAApiError
+from src.api.response_cache import ResponseCache
+from src.utils.metrics import HTTP_IN_FLIGHT
+
+
+def make_client(handler) -> AsyncFSAClient:
+    client = AsyncFSAClient(base_url='http://stub.invalid', cache=ResponseCache(ttl=0, max_bytes=0))
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def in_flight(endpoint: str) -> float:
+    return HTTP_IN_FLIGHT.values().get((endpoint,), 0.0)
+
+
+@pytest.mark.parametrize('error, expected', [
+    (httpx.DecodingError('bad gzip'), FSAApiError),
+    (ValueError('unexpected'), ValueError),
+])
+def test_non_transport_errors_release_gauge_and_record_failure(error, expected):
+    endpoint = f'async-test-{type(error).__name__}'
+    breaker = get_circuit_breaker(endpoint)
+    breaker.failure_threshold = 1
+
+    def handler(request):
+        raise error
+
+    async def run():
+        client = make_client(handler)
+        try:
+            await client._send(ApiRequest('GET', 'http://stub.invalid/x', None, {}, "Ошибка", endpoint=endpoint))
+        finally:
+            await client.aclose()
+
+    with pytest.raises(expected):
+        asyncio.run(run())
+    assert in_flight(endpoint) == 0
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_success_releases_gauge():
+    endpoint = 'async-test-success'
+
+    async def run():
+        client = make_client(lambda request: httpx.Response(200, content=b'{"ok": true}'))
+        try:
+            return await client._send(ApiRequest('GET', 'http://stub.invalid/x', None, {}, "Ошибка", endpoint=endpoint))
+        finally:
+            await client.aclose()
+
+    assert asyncio.run(run()) == b'{"ok": true}'
+    assert in_flight(endpoint) == 0
+    assert get_circuit_breaker(endpoint).state == CircuitBreaker.CLOSED
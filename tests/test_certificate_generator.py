@@ -0,0 +1,51 @@
+import json
+
+from benchmarks.sample_data import make_registry_document
+from src.utils.certificate_generator import (
+    CERTIFICATE_MAPPING, merge_search_data, process_complex_json, stringify_values
+)
+
+
+def baseline(document):
+    """Прежний путь: полная строковая копия документа, затем извлечение полей"""
+    return CERTIFICATE_MAPPING.evaluate(stringify_values(document))
+
+
+def test_matches_baseline_on_sample_document():
+    document = make_registry_document()
+    assert process_complex_json(document) == baseline(document)
+
+
+def test_list_leaf_is_plain_list():
+    document = make_registry_document()
+    document['RegistryData']['product']['storageCondition'] = ['a', 1, None]
+
+    result = process_complex_json(document)
+
+    assert result['standards_and_conditions'] == ['a', '1', '']
+    assert type(result['standards_and_conditions']) is list
+    assert result == baseline(document)
+    json.dumps(result, ensure_ascii=False)
+
+
+def test_dict_leaf_is_plain_dict():
+    document = make_registry_document()
+    document['RegistryData']['number'] = {'value': 123, 'parts': [1, {'x': None}]}
+
+    result = process_complex_json(document)
+
+    assert result['certificate_number'] == {'value': '123', 'parts': ['1', {'x': ''}]}
+    assert type(result['certificate_number']) is dict
+    assert result == baseline(document)
+    json.dumps(result, ensure_ascii=False)
+
+
+def test_merge_search_data_adds_missing_fields():
+    details = {'ID': 1, 'number': 'РОСС'}
+    search = {'ID': 1, 'number': 'other', 'TNVED': '8471', 'Type': 'C'}
+
+    merged = merge_search_data(details, search)
+
+    assert merged == {'ID': 1, 'number': 'РОСС', 'search_TNVED': '8471', 'tnved_codes': '8471', 'search_Type': 'C'}
+    assert details == {'ID': 1, 'number': 'РОСС'}
+    assert merge_search_data(details, None) == details
@@ -0,0 +1,125 @@
+import pytest
+import requests
+
+from src.api import circuit_breaker as circuit_breaker_module
+from src.api.circuit_breaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker
+from src.api.http_client import HttpClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker_module, 'time', fake)
+    return fake
+
+
+def open_breaker(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.failure_threshold):
+        breaker.before_request()
+        breaker.record_failure()
+
+
+def test_opens_after_threshold_failures(clock):
+    breaker = CircuitBreaker('test', failure_threshold=3, reset_timeout=10)
+    for _ in range(2):
+        breaker.before_request()
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_success_resets_failure_count(clock):
+    breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=10)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_probe_success_closes(clock):
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=10)
+    open_breaker(breaker)
+
+    clock.now += 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.before_request()
+    # Пока пробный запрос выполняется, остальные отклоняются
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_request()
+
+
+def test_half_open_probe_failure_reopens(clock):
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=10)
+    open_breaker(breaker)
+
+    clock.now += 10
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_unfinished_probe_expires_after_reset_timeout(clock):
+    breaker = CircuitBreaker('test', failure_threshold=1, reset_timeout=10)
+    open_breaker(breaker)
+
+    clock.now += 10
+    breaker.before_request()
+    # Результат пробного запроса так и не записан
+    clock.now += 9
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    clock.now += 1
+    breaker.before_request()
+
+
+class RaisingSession:
+    def __init__(self, error: Exception):
+        self.error = error
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        raise self.error
+
+
+@pytest.mark.parametrize('error', [
+    requests.exceptions.ChunkedEncodingError('broken chunk'),
+    requests.exceptions.ContentDecodingError('bad gzip'),
+    requests.exceptions.TooManyRedirects('loop'),
+])
+def test_http_client_records_any_request_exception(clock, error):
+    name = f'test-{type(error).__name__}'
+    breaker = get_circuit_breaker(name)
+    breaker.failure_threshold = 1
+    client = HttpClient()
+    client.session = RaisingSession(error)
+
+    with pytest.raises(type(error)):
+        client.get('http://stub.invalid/', endpoint=name)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # Пробный запрос с той же ошибкой снова открывает автомат, а не оставляет его полуоткрытым
+    clock.now += breaker.reset_timeout
+    with pytest.raises(type(error)):
+        client.get('http://stub.invalid/', endpoint=name)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert client.session.calls == 2
@@ -0,0 +1,55 @@
+import os
+
+from src.utils.document_cache import DocumentCache
+
+
+def make_cache(tmp_path, max_bytes: int = 100) -> DocumentCache:
+    return DocumentCache(str(tmp_path / 'cache'), max_bytes=max_bytes, ttl=3600, memory_max_bytes=1024)
+
+
+def test_lru_eviction_within_limit(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put_bytes('a', b'x' * 40)
+    cache.put_bytes('b', b'x' * 40)
+    assert cache.get_path('a') is not None
+    cache.put_bytes('c', b'x' * 40)
+
+    # 'a' использовался недавно, поэтому вытеснен 'b'
+    assert cache.get_path('b') is None
+    assert cache.get_path('a') is not None
+    assert cache.get_path('c') is not None
+
+
+def test_oversized_file_is_kept_and_does_not_evict_others(tmp_path):
+    cache = make_cache(tmp_path)
+    small = cache.put_bytes('small', b'x' * 40)
+
+    path = cache.put_stream('big', [b'y' * 80, b'y' * 80])
+    assert os.path.exists(path)
+    with open(path, 'rb') as file:
+        assert file.read() == b'y' * 160
+    assert cache.get_path('big') == path
+    assert os.path.exists(small)
+    assert cache.stats()['disk_bytes'] == 40
+
+
+def test_next_oversized_file_replaces_previous(tmp_path):
+    cache = make_cache(tmp_path)
+    first = cache.put_stream('big1', [b'y' * 150])
+    second = cache.put_stream('big2', [b'z' * 150])
+
+    assert not os.path.exists(first)
+    assert cache.get_path('big1') is None
+    assert cache.get_path('big2') == second
+    assert cache.stats()['oversized_bytes'] == 150
+
+
+def test_index_is_restored_after_restart(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put_bytes('a', b'x' * 40)
+    cache.put_stream('big', [b'y' * 150])
+
+    restarted = make_cache(tmp_path)
+    assert restarted.get_bytes('a') == b'x' * 40
+    assert restarted.get_path('big') is not None
+    assert restarted.stats()['disk_bytes'] == 40
@@ -0,0 +1,154 @@
+import sqlite3
+import threading
+
+import pytest
+
+from src.api import generation_jobs as generation_jobs_module
+from src.api.generation_jobs import (
+    JOB_ERROR, JOB_PROCESSING, JOB_QUEUED, JOB_SUCCESS, GenerationJobQueue, GenerationJobStore
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(generation_jobs_module, 'time', fake)
+    return fake
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'jobs.sqlite3')
+
+
+def test_jobs_survive_reconnect(clock, db_path):
+    store = GenerationJobStore(db_path)
+    job_id = store.create('42')
+    store.update(job_id, JOB_SUCCESS, result={'files': ['a.pdf']})
+
+    # Новое подключение к той же базе, как после перезапуска процесса
+    reopened = GenerationJobStore(db_path)
+    job = reopened.get(job_id)
+    assert job.doc_id == '42'
+    assert job.status == JOB_SUCCESS
+    assert job.result == {'files': ['a.pdf']}
+    assert job.finished
+
+
+def test_latest_for_doc_returns_newest_job(clock, db_path):
+    store = GenerationJobStore(db_path)
+    store.create('42')
+    clock.now += 1
+    newest = store.create('42')
+    store.create('43')
+    assert store.latest_for_doc('42').job_id == newest
+    assert store.latest_for_doc('missing') is None
+
+
+def test_purge_removes_only_old_finished_jobs(clock, db_path):
+    store = GenerationJobStore(db_path)
+    old = store.create('1')
+    store.update(old, JOB_ERROR, error='boom')
+    unfinished = store.create('2')
+    clock.now += 100
+    recent = store.create('3')
+    store.update(recent, JOB_SUCCESS, result={})
+
+    assert store.purge(50) == 1
+    assert store.get(old) is None
+    assert store.get(unfinished) is not None
+    assert store.get(recent) is not None
+
+
+def test_fail_unfinished_leaves_live_owners_alone(clock, db_path):
+    live = GenerationJobStore(db_path)
+    live_job = live.create('1')
+    live.update(live_job, JOB_PROCESSING)
+
+    dead = GenerationJobStore(db_path)
+    dead_job = dead.create('2')
+
+    clock.now += 20
+    live.heartbeat()
+    starting = GenerationJobStore(db_path)
+    assert starting.fail_unfinished('interrupted', stale_after=30) == 0
+
+    # Владелец dead больше не отмечается и через stale_after считается остановленным
+    clock.now += 15
+    live.heartbeat()
+    assert starting.fail_unfinished('interrupted', stale_after=30) == 1
+    assert starting.get(dead_job).status == JOB_ERROR
+    assert starting.get(dead_job).error == 'interrupted'
+    assert starting.get(live_job).status == JOB_PROCESSING
+
+
+class BlockingConstructor:
+    """Генерация, которая завершается только по сигналу release"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def request_generation(self, data):
+        self.started.set()
+        self.release.wait(5)
+        return {'documents': [], 'generated_at': 'now'}
+
+
+def test_heartbeat_keeps_own_jobs_and_fails_stale_owners(clock, db_path):
+    dead = GenerationJobStore(db_path)
+    dead_job = dead.create('2')
+
+    constructor = BlockingConstructor()
+    queue = GenerationJobQueue(GenerationJobStore(db_path), max_workers=1, constructor=constructor)
+    try:
+        job_id = queue.submit({'ID': 1})
+        assert constructor.started.wait(5)
+        queued_job = queue.submit({'ID': 3})
+
+        clock.now += 60
+        queue._heartbeat(stale_after=30)
+
+        # Задания живой очереди не прерываются, задания остановившегося владельца — да
+        assert queue.get(job_id).status == JOB_PROCESSING
+        assert queue.get(queued_job).status == JOB_QUEUED
+        assert queue.get(dead_job).status == JOB_ERROR
+    finally:
+        constructor.release.set()
+        queue._executor.shutdown(wait=True)
+    assert queue.get(job_id).status == JOB_SUCCESS
+    assert queue.get(queued_job).status == JOB_SUCCESS
+
+
+def test_fail_unfinished_at_startup_fails_own_jobs(clock, db_path):
+    store = GenerationJobStore(db_path)
+    job_id = store.create('1')
+    assert store.fail_unfinished('interrupted', stale_after=30) == 1
+    assert store.get(job_id).status == JOB_ERROR
+
+
+def test_legacy_database_is_migrated(clock, db_path):
+    connection = sqlite3.connect(db_path)
+    connection.execute(
+        "CREATE TABLE generation_jobs (job_id TEXT PRIMARY KEY, doc_id TEXT NOT NULL, status TEXT NOT NULL, "
+        "result TEXT, error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+    )
+    connection.execute(
+        "INSERT INTO generation_jobs VALUES ('old', '1', ?, NULL, NULL, 1, 1)", (JOB_QUEUED,)
+    )
+    connection.commit()
+    connection.close()
+
+    store = GenerationJobStore(db_path)
+    # Задание без владельца осталось от версии без heartbeat и считается прерванным
+    assert store.fail_unfinished('interrupted', stale_after=30) == 1
+    assert store.get('old').status == JOB_ERROR
+    assert store.get(store.create('2')).status == JOB_QUEUED
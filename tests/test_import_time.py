@@ -0,0 +1,12 @@
+import pytest
+
+from benchmarks.import_time import MODULES, probe_import
+
+
+@pytest.mark.parametrize('module, forbidden', sorted(MODULES.items()))
+def test_import_has_no_side_effects(module, forbidden):
+    probe = probe_import(module)
+
+    assert probe['side_effects'] == []
+    assert not probe['config_loaded'], f"{module} читает config.json при импорте"
+    assert not set(forbidden) & set(probe['heavy']), f"{module} загружает {probe['heavy']}"
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from src.api import client as client_module
+from src.api import local_index as local_index_module
+from src.api.client import FSAClient, get_fsa_client
+from src.api.local_index import LocalIndex, get_local_index
+from src.api.response_cache import ResponseCache
+
+
+@pytest.fixture
+def settings(monkeypatch, tmp_path):
+    values = {'local_index_enabled': False, 'local_index_path': str(tmp_path / 'index.sqlite3')}
+    monkeypatch.setattr(local_index_module, 'config', values)
+    monkeypatch.setattr(local_index_module, '_local_index', None)
+    monkeypatch.setattr(client_module, '_fsa_client', None)
+    return values
+
+
+def test_settings_are_reread_on_each_call(settings, tmp_path):
+    assert get_local_index() is None
+
+    settings['local_index_enabled'] = True
+    index = get_local_index()
+    assert index.path == settings['local_index_path']
+    assert get_local_index() is index
+
+    settings['local_index_max_age'] = 60
+    assert get_local_index() is index
+    assert index.max_age == 60
+
+    settings['local_index_path'] = str(tmp_path / 'moved.sqlite3')
+    moved = get_local_index()
+    assert moved is not index
+    assert moved.path == settings['local_index_path']
+
+    settings['local_index_enabled'] = False
+    assert get_local_index() is None
+
+
+def test_shared_client_follows_local_index_settings(settings):
+    assert get_fsa_client().local_index is None
+
+    settings['local_index_enabled'] = True
+    client = get_fsa_client()
+    assert client.local_index is get_local_index()
+
+    settings['local_index_enabled'] = False
+    assert get_fsa_client() is client
+    assert client.local_index is None
+
+
+def test_bulk_search_does_not_write_to_local_index(settings, monkeypatch, tmp_path):
+    index = LocalIndex(str(tmp_path / 'bulk.sqlite3'), max_age=3600)
+    client = FSAClient(base_url='http://stub.invalid', cache=ResponseCache(ttl=0, max_bytes=0), local_index=index)
+    response = {'items': [{'ID': 1, 'Type': 'C'}], 'total': 1, 'totalPages': 1}
+    monkeypatch.setattr(client, '_send', lambda request: json.dumps(response).encode('utf-8'))
+
+    assert client.search({'rn': 'РОСС'}, use_cache=False) == response
+    assert index.stats() == (0, 0, 0)
+
+    assert client.search({'rn': 'РОСС'}) == response
+    assert index.stats()[0] == 1
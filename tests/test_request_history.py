@@ -0,0 +1,114 @@
+import pytest
+
+from src.api import request_history as request_history_module
+from src.api.request_history import RequestHistory
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(request_history_module, 'time', fake)
+    return fake
+
+
+def test_status_reports_latest_per_request_type(clock):
+    history = RequestHistory(max_size=10)
+    history.add('1', 'generate', 'processing')
+    history.add('1', 'download', 'processing')
+    history.add('1', 'generate', 'success')
+
+    assert history.status('1') == {'generate': 'success', 'download': 'processing'}
+    assert history.status('2') == {}
+
+
+def test_size_bound_drops_oldest_records(clock):
+    history = RequestHistory(max_size=3)
+    for doc_id in ('1', '2', '3', '4'):
+        history.add(doc_id, 'generate', 'success')
+
+    assert len(history) == 3
+    assert history.status('1') == {}
+    assert history.status('4') == {'generate': 'success'}
+
+
+def test_trimming_old_record_keeps_newer_status(clock):
+    history = RequestHistory(max_size=2)
+    history.add('1', 'generate', 'processing')
+    history.add('1', 'generate', 'success')
+    # Вытесняется запись 'processing', последний статус документа остаётся
+    history.add('2', 'generate', 'processing')
+
+    assert history.status('1') == {'generate': 'success'}
+
+
+def test_max_age_expires_records(clock):
+    history = RequestHistory(max_size=10, max_age=60)
+    history.add('1', 'generate', 'success')
+    clock.now += 30
+    history.add('2', 'generate', 'success')
+
+    clock.now += 31
+    assert history.status('1') == {}
+    assert history.status('2') == {'generate': 'success'}
+    assert len(history) == 1
+
+
+def test_stats_count_errors_and_durations(clock):
+    history = RequestHistory(max_size=10)
+    history.add('1', 'generate', 'processing')
+    clock.now += 2
+    history.add('1', 'generate', 'success')
+    history.add('2', 'generate', 'processing')
+    clock.now += 4
+    history.add('2', 'generate', 'error')
+    # Завершение без известного начала учитывается, но без длительности
+    history.add('3', 'generate', 'success')
+
+    stats = history.stats()['generate']
+    assert stats['count'] == 3
+    assert stats['errors'] == 1
+    assert stats['error_rate'] == pytest.approx(1 / 3)
+    assert stats['avg_duration'] == pytest.approx(3.0)
+    assert stats['max_duration'] == pytest.approx(4.0)
+
+
+def test_stats_survive_trimming(clock):
+    history = RequestHistory(max_size=1)
+    for doc_id in ('1', '2', '3'):
+        history.add(doc_id, 'download', 'success')
+
+    assert len(history) == 1
+    assert history.stats()['download']['count'] == 3
+
+
+def test_unfinished_requests_are_forgotten_with_their_records(clock):
+    history = RequestHistory(max_size=2, max_age=60)
+    history.add('1', 'download', 'processing')
+    history.add('2', 'download', 'processing')
+    # Запрос 1 так и не завершился, его запись вытеснена по размеру
+    history.add('3', 'download', 'processing')
+    assert ('1', 'download') not in history._started
+
+    clock.now += 61
+    history.status('3')
+    assert history._started == {}
+
+
+def test_restarted_request_keeps_its_start_time(clock):
+    history = RequestHistory(max_size=2)
+    history.add('1', 'generate', 'processing')
+    clock.now += 5
+    history.add('1', 'generate', 'processing')
+    # Вытесняется первая запись 'processing', начало повторного запроса сохраняется
+    history.add('2', 'generate', 'processing')
+    clock.now += 2
+
+    assert history.add('1', 'generate', 'success').duration == 2
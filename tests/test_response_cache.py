@@ -0,0 +1,98 @@
+import pytest
+
+from src.api import response_cache as response_cache_module
+from src.api.response_cache import ResponseCache, make_cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(response_cache_module, 'time', fake)
+    return fake
+
+
+def test_entry_expires_after_ttl(clock):
+    cache = ResponseCache(ttl=10, max_bytes=1024)
+    cache.set('key', b'value')
+
+    clock.now += 9.9
+    assert cache.get('key') == b'value'
+    clock.now += 0.1
+    assert cache.get('key') is None
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_zero_ttl_disables_cache(clock):
+    cache = ResponseCache(ttl=0, max_bytes=1024)
+    cache.set('key', b'value')
+    assert cache.get('key') is None
+
+
+def test_evicts_least_recently_used_by_bytes(clock):
+    cache = ResponseCache(ttl=60, max_bytes=10)
+    cache.set('a', b'aaaa')
+    cache.set('b', b'bbbb')
+    # Чтение делает 'a' последней использованной, вытесняется 'b'
+    assert cache.get('a') == b'aaaa'
+    cache.set('c', b'cccc')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == b'aaaa'
+    assert cache.get('c') == b'cccc'
+    assert cache.size == 8
+
+
+def test_entry_larger_than_limit_is_not_stored(clock):
+    cache = ResponseCache(ttl=60, max_bytes=4)
+    cache.set('small', b'ab')
+    cache.set('big', b'abcde')
+    assert cache.get('big') is None
+    assert cache.get('small') == b'ab'
+
+
+def test_overwrite_updates_size(clock):
+    cache = ResponseCache(ttl=60, max_bytes=100)
+    cache.set('key', b'12345')
+    cache.set('key', b'12')
+    assert cache.size == 2
+    assert len(cache) == 1
+
+
+def test_invalidate_tag_removes_all_tagged_entries(clock):
+    cache = ResponseCache(ttl=60, max_bytes=1024)
+    cache.set('search', b'[1, 2]', tags=[1, 2])
+    cache.set('details:1', b'{}', tags=[1])
+    cache.set('details:2', b'{}', tags=[2])
+
+    assert cache.invalidate_tag(1) == 2
+    assert cache.get('search') is None
+    assert cache.get('details:1') is None
+    assert cache.get('details:2') == b'{}'
+    # Вытесненная запись больше не числится за тегом 2
+    assert cache.invalidate_tag(2) == 1
+    assert cache.invalidate_tag('missing') == 0
+    assert cache.size == 0
+
+
+def test_hit_and_miss_counters(clock):
+    cache = ResponseCache(ttl=60, max_bytes=1024)
+    cache.get('key')
+    cache.set('key', b'v')
+    cache.get('key')
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_key_ignores_empty_params_and_order():
+    assert make_cache_key('search', {'rn': 'X', 'q': ''}) == make_cache_key('search', {'rn': 'X'})
+    assert make_cache_key('search', {'a': 1, 'b': 2}) == make_cache_key('search', {'b': 2, 'a': 1})
+    assert make_cache_key('search', {'rn': 'X'}, 'token-1') != make_cache_key('search', {'rn': 'X'}, 'token-2')
+    assert 'token-1' not in make_cache_key('search', None, 'token-1')
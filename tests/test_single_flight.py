@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.api.single_flight import AsyncSingleFlight, SingleFlight
+
+
+def wait_for_waiters(flight: SingleFlight, key: str, count: int) -> None:
+    """Дождаться, пока count вызовов встанут в ожидание ведущего вызова"""
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        with flight._lock:
+            call = flight._calls.get(key)
+        if call is not None and len(call.done._cond._waiters) >= count:
+            return
+        time.sleep(0.001)
+    raise AssertionError("followers did not start waiting")
+
+
+def run_concurrently(flight: SingleFlight, key: str, fn, followers: int):
+    """Ведущий вызов блокируется, пока все остальные не встанут в ожидание"""
+    release = threading.Event()
+    outcomes = [None] * (followers + 1)
+
+    def leader_fn():
+        release.wait(5)
+        return fn()
+
+    def call(index: int, target) -> None:
+        try:
+            outcomes[index] = ('ok', flight.do(key, target))
+        except Exception as e:
+            outcomes[index] = ('error', e)
+
+    leader = threading.Thread(target=call, args=(0, leader_fn))
+    leader.start()
+    while flight.in_flight() == 0:
+        time.sleep(0.001)
+
+    threads = [threading.Thread(target=call, args=(i + 1, fn)) for i in range(followers)]
+    for thread in threads:
+        thread.start()
+    wait_for_waiters(flight, key, followers)
+    release.set()
+    for thread in [leader, *threads]:
+        thread.join(5)
+    return outcomes
+
+
+def test_concurrent_calls_are_collapsed():
+    flight = SingleFlight()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        return {'value': 42}
+
+    outcomes = run_concurrently(flight, 'key', fn, followers=5)
+
+    assert len(calls) == 1
+    assert outcomes[0] == ('ok', ({'value': 42}, False))
+    assert all(outcome == ('ok', ({'value': 42}, True)) for outcome in outcomes[1:])
+    assert flight.in_flight() == 0
+
+
+def test_exception_is_propagated_to_all_callers():
+    flight = SingleFlight()
+    error = RuntimeError('backend down')
+
+    def fn():
+        raise error
+
+    outcomes = run_concurrently(flight, 'key', fn, followers=3)
+
+    assert all(outcome == ('error', error) for outcome in outcomes)
+    assert flight.in_flight() == 0
+
+
+def test_key_is_released_after_completion():
+    flight = SingleFlight()
+    assert flight.do('key', lambda: 1) == (1, False)
+    assert flight.do('key', lambda: 2) == (2, False)
+
+    def fail():
+        raise ValueError('bad input')
+
+    with pytest.raises(ValueError):
+        flight.do('key', fail)
+    assert flight.do('key', lambda: 3) == (3, False)
+
+
+def test_different_keys_are_not_collapsed():
+    flight = SingleFlight()
+    assert flight.do('a', lambda: 'a') == ('a', False)
+    assert flight.do('b', lambda: 'b') == ('b', False)
+
+
+def test_async_calls_are_collapsed_and_errors_shared():
+    async def run():
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0)
+            return 'result'
+
+        results = await asyncio.gather(*(flight.do('key', fn) for _ in range(4)))
+        assert len(calls) == 1
+        assert results == [('result', False)] + [('result', True)] * 3
+
+        async def failing():
+            await asyncio.sleep(0)
+            raise RuntimeError('boom')
+
+        errors = await asyncio.gather(*(flight.do('other', failing) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(error, RuntimeError) for error in errors)
+        assert flight.in_flight() == 0
+
+    asyncio.run(run())
+
+
+def test_async_cancelled_waiter_does_not_cancel_others():
+    async def run():
+        flight = AsyncSingleFlight()
+        release = asyncio.Event()
+
+        async def fn():
+            await release.wait()
+            return 'done'
+
+        first = asyncio.ensure_future(flight.do('key', fn))
+        second = asyncio.ensure_future(flight.do('key', fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        assert await second == ('done', True)
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    asyncio.run(run())